@@ -0,0 +1,373 @@
+import glob
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import uuid
+import zlib
+from collections import namedtuple
+
+from PyQt5.QtGui import QColor, QImage, QPainter
+from PyQt5.QtCore import QLockFile, QObject, QRect, QTimer, Qt
+
+from profiler import RollingHistogram
+from scene import Shape
+from tiles import TILE_SIZE, tile_rects
+
+# Crash-safe autosave. Every `interval` ms the tiles of the canvas that
+# changed since the last checkpoint are handed to a writer thread, which
+# appends them to a journal and syncs it. After a crash the journal is read
+# back on the next launch; a clean exit deletes it.
+#
+# Each running instance keeps its own journal and holds a lock file beside
+# it for as long as it runs. A journal nobody holds the lock of is one left
+# by a crash; the next instance to start takes it over and restores it.
+#
+# The journal is a sequence of records, each a header, a payload and a
+# CRC-32 of both:
+#   SIZE  x, y = 0, width, height, payload = image format as ">I"
+#   TILE  x, y, width, height, payload = zlib'd pixels, 4 bytes per pixel
+#   SHPS  payload = the retained shapes as a JSON list of [id, tool, x0, y0,
+#         x1, y1, ARGB colour, size]; only when they changed
+#   DONE  end of a checkpoint
+# Only records up to the last intact DONE are restored, so a checkpoint cut
+# short by the crash is ignored as a whole.
+
+_RECORD = struct.Struct(">4sIIIII")  # tag, x, y, width, height, payload length
+_CRC = struct.Struct(">I")
+_FORMAT = struct.Struct(">I")
+
+# What one checkpoint hands to the writer: copies of the dirty tiles as
+# (x, y, QImage), or a shared copy of the whole canvas plus the tile rects
+# to take from it. `full` starts a new journal. `shapes` is a SHPS payload,
+# or None when the retained shapes did not change.
+_Checkpoint = namedtuple("_Checkpoint",
+                         "width height image_format full tiles canvas rects shapes")
+
+
+def _pack_shapes(shapes):
+    return json.dumps([[shape_id, shape.tool, *shape.start, *shape.end, shape.color.rgba(),
+                        shape.size] for shape_id, shape in shapes]).encode("utf-8")
+
+
+def _unpack_shapes(payload):
+    return [(shape_id, Shape(tool, (x0, y0), (x1, y1), QColor.fromRgba(rgba), size))
+            for shape_id, tool, x0, y0, x1, y1, rgba, size in json.loads(payload)]
+
+
+def _pixels(image):
+    # Raw rows of a tile image without line padding
+    data = image.constBits().asstring(image.sizeInBytes())
+    row = image.width() * 4
+    if image.bytesPerLine() == row:
+        return data
+    return b"".join(data[y * image.bytesPerLine():y * image.bytesPerLine() + row]
+                    for y in range(image.height()))
+
+
+class _JournalWriter(threading.Thread):
+    """Appends checkpoints to the journal, in the order they are queued.
+
+    Tiles whose pixels match what was last written for them (by CRC) are
+    skipped, which keeps checkpoints from the shared-canvas path small.
+    """
+
+    def __init__(self, path):
+        super().__init__(name="autosave", daemon=True)
+        self.path = path
+        self.journal_bytes = 0  # size of the journal file
+        self.written_tiles = 0
+        self.error = None  # last OSError, the app shows it
+        self.needs_full = True  # no journal open; only a full checkpoint helps
+        self._queue = queue.Queue()
+        self._file = None
+        self._crcs = {}
+
+    def submit(self, checkpoint):
+        self._queue.put(checkpoint)
+
+    def stop(self):
+        self._queue.put(None)
+        self.join()
+
+    def run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            if job.canvas is not None:
+                # take the tiles out first; once the shared canvas is let go,
+                # painting on the GUI thread no longer has to detach it
+                job = job._replace(tiles=[(r.x(), r.y(), job.canvas.copy(r)) for r in job.rects],
+                                   canvas=None, rects=None)
+            try:
+                self._write(job)
+            except OSError as e:
+                self.error = e
+                if self._file is not None:
+                    self._file.close()
+                self._file = None
+                self.needs_full = True
+        if self._file is not None:
+            self._file.close()
+
+    def _record(self, out, tag, x=0, y=0, width=0, height=0, payload=b""):
+        header = _RECORD.pack(tag, x, y, width, height, len(payload))
+        out.write(header)
+        out.write(payload)
+        out.write(_CRC.pack(zlib.crc32(payload, zlib.crc32(header))))
+        return _RECORD.size + len(payload) + _CRC.size
+
+    def _write(self, job):
+        if not job.full and self._file is None:
+            return  # a full checkpoint is on its way
+        if job.full:
+            # a fresh journal is written beside the old one and swapped in
+            # whole, so there is always one complete journal on disk
+            if self._file is not None:
+                self._file.close()
+            self._crcs = {}
+            tmp = self.path + ".tmp"
+            out = open(tmp, "wb")
+            written = self._record(out, b"SIZE", 0, 0, job.width, job.height,
+                                   _FORMAT.pack(int(job.image_format)))
+        else:
+            out, tmp = self._file, None
+            written = 0
+        for x, y, tile in job.tiles:
+            data = _pixels(tile)
+            crc = zlib.crc32(data)
+            if self._crcs.get((x, y)) == crc:
+                continue
+            if tmp is not None and data.count(b"\xff") == len(data):
+                # the restored canvas starts white; blank tiles need no record
+                self._crcs[(x, y)] = crc
+                continue
+            self._crcs[(x, y)] = crc
+            written += self._record(out, b"TILE", x, y, tile.width(), tile.height(),
+                                    zlib.compress(data, 1))
+            self.written_tiles += 1
+        if job.shapes is not None:
+            written += self._record(out, b"SHPS", payload=job.shapes)
+        written += self._record(out, b"DONE")
+        out.flush()
+        os.fsync(out.fileno())
+        if tmp is not None:
+            out.close()
+            os.replace(tmp, self.path)
+            self._file = open(self.path, "ab")
+            self.journal_bytes = written
+            self.needs_full = False
+        else:
+            self.journal_bytes += written
+
+
+def read_journal(path):
+    """The canvas of the last complete checkpoint in `path`, or None."""
+    return read_checkpoint(path)[0]
+
+
+def read_checkpoint(path):
+    """(canvas, retained shapes) of the last complete checkpoint in `path`.
+
+    The canvas is None when there is none; the shapes are (shape_id, Shape)
+    pairs as for CanvasModel.restore_shapes.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None, []
+    image = None
+    complete = False
+    pending = []
+    shapes = pending_shapes = []
+    pos = 0
+    while pos + _RECORD.size <= len(data):
+        tag, x, y, width, height, length = _RECORD.unpack_from(data, pos)
+        end = pos + _RECORD.size + length
+        if end + _CRC.size > len(data):
+            break
+        (crc,) = _CRC.unpack_from(data, end)
+        if crc != zlib.crc32(data[pos:end]):
+            break
+        payload = data[pos + _RECORD.size:end]
+        pos = end + _CRC.size
+        if tag == b"SIZE":
+            (image_format,) = _FORMAT.unpack(payload)
+            image = QImage(width, height, QImage.Format(image_format))
+            image.fill(Qt.white)
+            pending = []
+            shapes = pending_shapes = []
+        elif tag == b"TILE":
+            pending.append((x, y, width, height, payload))
+        elif tag == b"SHPS":
+            try:
+                pending_shapes = _unpack_shapes(payload)
+            except (ValueError, TypeError):
+                break
+        elif tag == b"DONE" and image is not None:
+            painter = QPainter(image)
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            for x, y, width, height, payload in pending:
+                pixels = zlib.decompress(payload)
+                painter.drawImage(x, y, QImage(pixels, width, height, width * 4, image.format()))
+            painter.end()
+            pending = []
+            shapes = pending_shapes
+            complete = True
+        else:
+            break
+    return (image, shapes) if complete else (None, [])
+
+
+class Autosave(QObject):
+    """Periodic incremental checkpoints of a CanvasModel to a journal.
+
+    The GUI thread only notes dirty tiles as the model reports them and, at
+    a checkpoint, copies those tiles; compression and file I/O happen on the
+    writer thread. When most of the canvas is dirty (after a resize, clear
+    or fill) no pixels are copied at all: the writer gets a shared copy of
+    the canvas, takes its tiles out at once and skips the ones that did not
+    actually change. Only a paint in that short window pays for a copy, as
+    Qt then detaches the canvas. Retained shapes, which are not in the
+    canvas pixels, are journaled whole whenever they change.
+    """
+
+    def __init__(self, model, path, interval=5000, tile_size=TILE_SIZE, parent=None, lock=None):
+        super().__init__(parent)
+        # `lock` is one open_journal or lock_journal already took for `path`
+        self._lock = lock_journal(path) if lock is None else lock
+        if self._lock is None:
+            raise OSError(f"{path} is in use by another instance")
+        self._model = model
+        self._tile_size = tile_size
+        self._dirty = set()  # (x, y) of dirty tiles
+        self._all_dirty = True
+        self._size = None  # (width, height, format) of the last checkpoint
+        self._shapes = []  # (shape_id, Shape) pairs as last journaled
+        self._writer = _JournalWriter(path)
+        self._writer.start()
+        self.checkpoint_time = RollingHistogram()  # GUI thread seconds per checkpoint
+        model.changed.connect(self._mark)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.checkpoint)
+        self._timer.start(interval)
+
+    @property
+    def path(self):
+        return self._writer.path
+
+    @property
+    def journal_bytes(self):
+        return self._writer.journal_bytes
+
+    @property
+    def error(self):
+        return self._writer.error
+
+    def _mark(self, rect):
+        if rect.isNull():
+            self._all_dirty = True
+            return
+        image = self._model.image
+        if image is None:
+            return
+        for tile in tile_rects(rect, image.rect(), self._tile_size):
+            self._dirty.add((tile.x(), tile.y()))
+
+    def checkpoint(self):
+        image = self._model.image
+        if image is None or image.isNull():
+            return
+        start = time.perf_counter()
+        with self._model.profiler.section("autosave"):
+            size = (image.width(), image.height(), image.format())
+            # rewrite the journal when it outgrows a few compressed canvases
+            full = (size != self._size or self._writer.needs_full
+                    or self._writer.journal_bytes > max(image.sizeInBytes(), 8 * 2**20))
+            scene = self._model.scene
+            shapes = list(scene) if scene is not None else []
+            payload = None
+            if full or shapes != self._shapes:
+                payload = _pack_shapes(shapes)
+                self._shapes = shapes
+            if full or self._all_dirty:
+                rects = tile_rects(image.rect(), image.rect(), self._tile_size)
+            else:
+                t = self._tile_size
+                rects = [QRect(x, y, t, t).intersected(image.rect()) for x, y in self._dirty]
+            if rects or payload is not None:
+                if full or sum(r.width() * r.height() for r in rects) * 4 > image.sizeInBytes() // 4:
+                    job = _Checkpoint(*size, full, None, QImage(image), rects, payload)
+                else:
+                    job = _Checkpoint(*size, False, [(r.x(), r.y(), image.copy(r)) for r in rects],
+                                      None, None, payload)
+                self._writer.submit(job)
+            self._size = size
+            self._dirty.clear()
+            self._all_dirty = False
+        self.checkpoint_time.add(time.perf_counter() - start)
+
+    def close(self, discard=True):
+        """Stop checkpointing; with `discard` the journal is removed, as on a clean exit."""
+        self._timer.stop()
+        self._model.changed.disconnect(self._mark)
+        self._writer.stop()
+        if discard:
+            for path in (self.path, self.path + ".tmp"):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        self._lock.unlock()  # kept journals are up for recovery from here on
+
+
+def lock_journal(path):
+    """A held lock on the journal at `path`, or None while another instance holds it."""
+    lock = QLockFile(path + ".lock")
+    lock.setStaleLockTime(0)  # stale only once the process that held it is gone
+    return lock if lock.tryLock(0) else None
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0
+
+
+def open_journal(location, recover=True):
+    """Claim a journal for this instance, as (path, lock, recovered).
+
+    `location` is a journal file, or a folder in which every instance keeps
+    one of its own. With `recover` the newest journal in the folder left by
+    a crashed session is taken over, and `recovered` says it is there to be
+    restored. The lock is None when a named file is in use elsewhere.
+    """
+    if not os.path.isdir(location):
+        lock = lock_journal(location)
+        return location, lock, lock is not None and recover and os.path.exists(location)
+    if recover:
+        for path in sorted(glob.glob(os.path.join(location, "autosave-*.journal")),
+                           key=_mtime, reverse=True):
+            lock = lock_journal(path)
+            if lock is not None:
+                return path, lock, True
+    path = os.path.join(location, f"autosave-{uuid.uuid4().hex}.journal")
+    return path, lock_journal(path), False
+
+
+def restore(model, path):
+    """Put the journal's canvas and retained shapes into `model`; False when there is none."""
+    image, shapes = read_checkpoint(path)
+    if image is None:
+        return False
+    width = max(image.width(), model.image.width() if model.image is not None else 0)
+    height = max(image.height(), model.image.height() if model.image is not None else 0)
+    model.resize(width, height)
+    model.restore_tile(0, 0, image)
+    model.restore_shapes(shapes)
+    return True
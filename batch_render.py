@@ -0,0 +1,172 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from PyQt5.QtGui import QColor
+from PyQt5.QtCore import QPointF
+
+from canvas_model import CanvasModel
+from tools import PLUGIN_DIR, load_plugins, tool_names
+
+# Stroke scripts are JSON Lines, one operation per line:
+#   {"op": "canvas", "width": 800, "height": 600}
+#   {"op": "stroke", "tool": "pen", "color": "#ff0000", "size": 5, "points": [[10, 10], [40, 25]]}
+#   {"op": "stroke", "tool": "fill", "points": [[100, 100]]}
+#   {"op": "stroke", "tool": "pen", "points": [[10, 10], [40, 25]],
+#    "symmetry": {"mode": "radial", "count": 6, "centre": [400, 300]}}
+#   {"op": "stroke", "tool": "fill", "points": [[100, 100]],
+#    "fill": {"style": "linear", "angle": 90, "color2": "#ffffffff"}}
+#   {"op": "stroke", "tool": "pen", "points": [[10, 10], [40, 25]],
+#    "pressure": [0.2, 0.9], "hardness": 0.5}
+#   {"op": "undo"} / {"op": "redo"} / {"op": "clear"}
+# "tool", "color", "size", "hardness", "symmetry" and "fill" are optional and stick
+# until changed; points are fed through press/move/release exactly like mouse
+# input, or tablet input with "pressure", one value per point.
+
+
+class ScriptError(ValueError):
+    pass
+
+
+def read_script(path):
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ScriptError(f"{path}:{line_no}: {e.msg}") from None
+
+
+def apply_op(model, op):
+    kind = op.get("op")
+    if kind == "canvas":
+        model.resize(int(op["width"]), int(op["height"]))
+    elif kind == "stroke":
+        if "tool" in op:
+            if op["tool"] not in tool_names():
+                raise ScriptError(f"unknown tool {op['tool']!r}")
+            model.current_tool = op["tool"]
+        if "color" in op:
+            model.brush_color = QColor(op["color"])
+        if "size" in op:
+            model.brush_size = int(op["size"])
+        if "hardness" in op:
+            model.brush_hardness = float(op["hardness"])
+        if "symmetry" in op:
+            symmetry = op["symmetry"]
+            centre = symmetry.get("centre")
+            try:
+                model.symmetry_count = int(symmetry.get("count", model.symmetry_count))
+                model.symmetry = symmetry.get("mode", "none")
+            except ValueError as e:
+                raise ScriptError(str(e)) from None
+            model.symmetry_centre = None if centre is None else QPointF(*centre)
+        if "fill" in op:
+            fill = op["fill"]
+            try:
+                model.fill_style = fill.get("style", "solid")
+            except ValueError as e:
+                raise ScriptError(str(e)) from None
+            model.gradient_angle = float(fill.get("angle", 0))
+            if "color2" in fill:
+                model.secondary_color = QColor(fill["color2"])
+        points = [(int(x), int(y)) for x, y in op["points"]]
+        if not points:
+            return
+        pressures = [None] * len(points)
+        if "pressure" in op:
+            pressures = [float(p) for p in op["pressure"]]
+            if len(pressures) != len(points):
+                raise ScriptError("a stroke needs one pressure per point")
+        model.press(*points[0], pressures[0])
+        for point, pressure in zip(points[1:], pressures[1:]):
+            model.move(*point, pressure)
+        model.release(*points[-1], pressures[-1])
+    elif kind == "undo":
+        model.undo()
+    elif kind == "redo":
+        model.redo()
+    elif kind == "clear":
+        model.clear_canvas()
+    else:
+        raise ScriptError(f"unknown op {kind!r}")
+
+
+def render_script(ops, width=800, height=600, model=None):
+    model = CanvasModel(width, height) if model is None else model
+    for op in ops:
+        apply_op(model, op)
+    return model
+
+
+def render_array(ops, width=800, height=600):
+    # Rendered pixels as a (height, width) uint32 NumPy array of 0xAARRGGBB
+    from image_buffer import image_array
+    model = render_script(ops, width, height)
+    image = model.export_image()
+    return image_array(image).copy()
+
+
+def render_file(script_path, output_path, width=800, height=600):
+    start = time.perf_counter()
+    load_plugins(PLUGIN_DIR)  # scripts may use plugin tools
+    model = render_script(read_script(script_path), width, height)
+    from vector_export import VECTOR_FORMATS, export_vector
+    if os.path.splitext(output_path)[1].lower() in VECTOR_FORMATS:
+        export_vector(model, output_path)
+    elif not model.save(output_path):
+        raise OSError(f"could not write {output_path}")
+    return output_path, time.perf_counter() - start
+
+
+def _parse_size(text):
+    try:
+        width, height = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}") from None
+    return width, height
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render stroke scripts to PNG, SVG or PDF without a window")
+    parser.add_argument("scripts", nargs="+", help="JSON Lines stroke scripts")
+    parser.add_argument("-o", "--output-dir", default=".")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--size", type=_parse_size, default=(800, 600),
+                        help="canvas size before any canvas op (default: 800x600)")
+    parser.add_argument("--format", choices=["png", "svg", "pdf"], default="png",
+                        help="output format; svg and pdf hold strokes and shapes only")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    jobs = []
+    for script in args.scripts:
+        stem = os.path.splitext(os.path.basename(script))[0]
+        jobs.append((script, os.path.join(args.output_dir, f"{stem}.{args.format}")))
+
+    failures = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(render_file, script, output, *args.size): script
+                   for script, output in jobs}
+        for future in as_completed(futures):
+            try:
+                output, elapsed = future.result()
+                print(f"{futures[future]} -> {output} ({elapsed * 1e3:.1f} ms)")
+            except Exception as e:
+                failures += 1
+                print(f"{futures[future]}: {e}", file=sys.stderr)
+    print(f"rendered {len(jobs) - failures}/{len(jobs)} scripts in "
+          f"{time.perf_counter() - start:.2f}s")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QRect
+
+from autosave import Autosave, read_journal
+from canvas_model import CanvasModel
+from harness import BenchmarkRunner, compare, qt_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI-thread cost of autosave checkpoints")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2048, 4096])
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    qt_app()
+    runner = BenchmarkRunner(repeat=args.repeat, warmup=2)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            model = CanvasModel(size, size)
+            autosave = Autosave(model, os.path.join(tmp, f"{size}.journal"), interval=10**9)
+            autosave.checkpoint()
+            step = [0]
+
+            def stroke(_=None):
+                # one pen stroke, like between two timer ticks
+                step[0] += 1
+                x = 50 + step[0] * 37 % (size - 300)
+                model.press(x, 100)
+                for i in range(1, 40):
+                    model.move(x + i * 5, 100 + i * 3)
+                model.release(x + 200, 220)
+
+            runner.run("checkpoint_after_stroke", lambda _: autosave.checkpoint(),
+                       setup=stroke, size=size)
+
+            def repaint_all(_=None):
+                model.changed.emit(QRect())
+
+            runner.run("checkpoint_all_dirty", lambda _: autosave.checkpoint(),
+                       setup=repaint_all, size=size)
+
+            def shared_then_stroke(_):
+                # the first paint after a shared checkpoint pays for the copy;
+                # compare with plain "stroke"
+                autosave.checkpoint()
+                stroke()
+
+            runner.run("stroke", lambda _: stroke(), size=size)
+            runner.run("checkpoint_shared_then_stroke", shared_then_stroke,
+                       setup=repaint_all, size=size)
+
+            autosave.checkpoint()
+            start = time.perf_counter()
+            autosave.close(discard=False)
+            flushed = time.perf_counter() - start
+            journal = autosave.path
+            start = time.perf_counter()
+            restored = read_journal(journal)
+            restore_s = time.perf_counter() - start
+            print(f"{'':<28} writer drained in {flushed * 1e3:.1f} ms, journal "
+                  f"{os.path.getsize(journal) / 2**20:.1f} MiB, restore {restore_s * 1e3:.1f} ms, "
+                  f"{'matches' if restored == model.image else 'DIFFERS'}")
+
+    if args.output:
+        runner.save(args.output)
+    if args.compare:
+        compare(args.compare, runner.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import argparse
+import os
+import random
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QPainter, QImage, QColor
+from PyQt5.QtCore import Qt
+
+from canvas_model import CanvasModel
+from renderers import GLCanvas, RasterCanvas, opengl_available
+from harness import BenchmarkRunner, compare, qt_app
+
+
+def scribble(model, strokes, seed=0):
+    rng = random.Random(seed)
+    w, h = model.image.width(), model.image.height()
+    for _ in range(strokes):
+        x, y = rng.randrange(w), rng.randrange(h)
+        model.press(x, y)
+        for _ in range(10):
+            x = min(max(x + rng.randint(-8, 8), 0), w - 1)
+            y = min(max(y + rng.randint(-8, 8), 0), h - 1)
+            model.move(x, y)
+        model.release(x, y)
+
+
+def bench_model(runner, size, repeat):
+    model = CanvasModel(size, size)
+
+    runner.run("save_undo_state", lambda _: model.save_undo_state(),
+               repeat=repeat, size=size)
+    model._undo_stack.clear()
+    runner.run("is_image_blank", lambda _: model.is_image_blank(),
+               repeat=repeat, size=size)
+
+    runner.run("flood_fill", lambda m: m.flood_fill(size // 2, size // 2, QColor(Qt.white),
+                                                     QColor(Qt.red)),
+               setup=lambda: CanvasModel(size, size), repeat=max(1, repeat // 10), size=size)
+
+    image = QImage(size, size, QImage.Format_RGB32)
+    r = size // 2 - 1
+    c = size // 2
+
+    def preview(draw):
+        def fn(_):
+            painter = QPainter(image)
+            draw(painter)
+            painter.end()
+        return fn
+    runner.run("preview_draw_line", preview(
+        lambda p: model.preview_draw_line_midpoint(p, 0, 0, size - 1, size // 3)),
+        repeat=repeat, size=size)
+    runner.run("preview_draw_rectangle", preview(
+        lambda p: model.preview_draw_rectangle(p, 1, 1, size - 2, size - 2)),
+        repeat=repeat, size=size)
+    runner.run("preview_draw_circle", preview(
+        lambda p: model.preview_draw_circle_midpoint(p, c, c, r)),
+        repeat=repeat, size=size)
+    runner.run("preview_draw_ellipse", preview(
+        lambda p: model.preview_draw_ellipse_midpoint(p, c, c, r, r // 2)),
+        repeat=repeat, size=size)
+
+
+def bench_strokes(runner, size, stroke_counts, repeat):
+    for strokes in stroke_counts:
+        runner.run("pen_strokes", lambda m: scribble(m, strokes),
+                   setup=lambda: CanvasModel(size, size), repeat=max(1, repeat // 10),
+                   size=size, strokes=strokes)
+
+
+def bench_views(runner, size, stroke_counts, repeat):
+    for strokes in stroke_counts:
+        model = CanvasModel(size, size)
+        scribble(model, strokes)
+
+        canvas = RasterCanvas(model)
+        canvas.resize(size, size)
+        canvas.show()
+        QApplication.processEvents()
+        runner.run("paintEvent", lambda _: canvas.repaint(), repeat=repeat,
+                   size=size, strokes=strokes)
+        canvas.close()
+
+        if not opengl_available():
+            runner.skip("paintGL", "no OpenGL context", size=size, strokes=strokes)
+            continue
+        canvas = GLCanvas(model)
+        canvas.resize(size, size)
+        canvas.show()
+        QApplication.processEvents()
+
+        def paint_gl(_):
+            canvas.makeCurrent()
+            canvas.paintGL()
+            canvas.context().functions().glFinish()
+            canvas.doneCurrent()
+        runner.run("paintGL", paint_gl, repeat=repeat, size=size, strokes=strokes)
+        canvas.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Canvas hot-path benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 512, 1024])
+    parser.add_argument("--strokes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    qt_app()
+    runner = BenchmarkRunner(repeat=args.repeat)
+    for size in args.sizes:
+        bench_model(runner, size, args.repeat)
+        bench_strokes(runner, size, args.strokes, args.repeat)
+        bench_views(runner, size, args.strokes, args.repeat)
+
+    if args.output:
+        runner.save(args.output)
+    if args.compare:
+        compare(args.compare, runner.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collab import SyncClient, SyncServer
+from harness import BenchmarkRunner, compare, percentile
+
+
+def make_ops(count, canvas, points_per_stroke=60, seed=0):
+    # Pen strokes like a hand would draw them, a few pixels per point
+    rng = random.Random(seed)
+    ops = []
+    for i in range(count):
+        x, y = rng.randrange(canvas), rng.randrange(canvas)
+        points = []
+        for _ in range(points_per_stroke):
+            x = min(max(x + rng.randint(-4, 4), 0), canvas - 1)
+            y = min(max(y + rng.randint(-4, 4), 0), canvas - 1)
+            points.append([x, y])
+        ops.append({"op": "stroke", "tool": "pen", "color": "#ff1428c8",
+                    "size": 3, "points": points})
+    return ops
+
+
+async def session(args, address):
+    server = SyncServer(args.canvas, args.canvas, snapshot_every=args.snapshot_every,
+                        history=args.history)
+    await server.start(address)
+
+    sent_at = {}
+    latencies = []
+
+    def received(seq, author, ops):
+        now = time.perf_counter()
+        latencies.extend(now - sent_at[tuple(op["id"])] for op in ops)
+
+    clients = [SyncClient(on_ops=received, batch_interval=args.batch_ms / 1e3)
+               for _ in range(args.clients)]
+    tasks = []
+    for client in clients:
+        await client.connect(address)
+        tasks.append(asyncio.ensure_future(client.run()))
+
+    ops = make_ops(args.ops, args.canvas)
+    raw_bytes = 0
+    started = time.perf_counter()
+    for i, op in enumerate(ops):
+        n = i % args.clients
+        op["id"] = [n, i]
+        raw_bytes += len(json.dumps(op))
+        sent_at[(n, i)] = time.perf_counter()
+        clients[n].send(op)
+        # strokes arrive at the pace people draw, not all at once
+        await asyncio.sleep(args.interval_ms / 1e3)
+    # every client gets every op back in the server's order, its own included
+    expected = args.ops * args.clients
+    while len(latencies) < expected and time.perf_counter() - started < 60:
+        await asyncio.sleep(0.01)
+    sent = sum(client.bytes_sent for client in clients)
+    while server.snapshot_pending:
+        await asyncio.sleep(0.01)
+
+    # a late joiner: snapshot tiles plus the log suffix
+    synced = asyncio.Event()
+    joiner = SyncClient(on_synced=synced.set)
+    join_started = time.perf_counter()
+    await joiner.connect(address)
+    join_task = asyncio.ensure_future(joiner.run())
+    await synced.wait()
+    join_s = time.perf_counter() - join_started
+
+    for client in clients + [joiner]:
+        await client.close()
+    await server.close()
+    for task in tasks + [join_task]:
+        task.cancel()
+    await asyncio.gather(*tasks, join_task, return_exceptions=True)
+    return {
+        "latencies": sorted(latencies),
+        "delivered": len(latencies),
+        "expected": expected,
+        "sent_bytes": sent,
+        "raw_bytes": raw_bytes,
+        "join_ms": join_s * 1e3,
+        "join_bytes": joiner.bytes_received,
+        "snapshot_bytes": server.snapshot_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collaborative sync latency and bandwidth")
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--canvas", type=int, default=2048)
+    parser.add_argument("--interval-ms", type=float, default=1.0,
+                        help="pause between strokes sent")
+    parser.add_argument("--batch-ms", type=float, default=16.0)
+    parser.add_argument("--snapshot-every", type=int, default=500)
+    parser.add_argument("--history", type=int, default=100)
+    parser.add_argument("--tcp", action="store_true", help="use TCP on localhost, not a Unix socket")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    runner = BenchmarkRunner()
+    with tempfile.TemporaryDirectory() as tmp:
+        address = "127.0.0.1:47311" if args.tcp else "unix:" + os.path.join(tmp, "sync.sock")
+        r = asyncio.run(session(args, address))
+
+    lat = r["latencies"]
+    result = {
+        "name": "collab_sync",
+        "params": {"clients": args.clients, "ops": args.ops, "batch_ms": args.batch_ms,
+                   "transport": "tcp" if args.tcp else "unix"},
+        "runs": r["delivered"],
+        "mean_ms": sum(lat) / len(lat) * 1e3 if lat else 0.0,
+        "p50_ms": percentile(lat, 0.50) * 1e3,
+        "p90_ms": percentile(lat, 0.90) * 1e3,
+        "p99_ms": percentile(lat, 0.99) * 1e3,
+        "bytes_per_op": r["sent_bytes"] / args.ops,
+        "raw_json_bytes_per_op": r["raw_bytes"] / args.ops,
+        "join_ms": r["join_ms"],
+        "join_bytes": r["join_bytes"],
+        "snapshot_bytes": r["snapshot_bytes"],
+    }
+    runner.results.append(result)
+    print(f"delivered {r['delivered']}/{r['expected']} ops, latency "
+          f"p50 {result['p50_ms']:.2f} ms  p90 {result['p90_ms']:.2f} ms  p99 {result['p99_ms']:.2f} ms")
+    print(f"upload {result['bytes_per_op']:.0f} B/op on the wire vs "
+          f"{result['raw_json_bytes_per_op']:.0f} B/op as plain JSON")
+    print(f"late join {result['join_ms']:.1f} ms, {result['join_bytes'] / 1024:.1f} KiB "
+          f"({result['snapshot_bytes'] / 1024:.1f} KiB of snapshot tiles)")
+
+    if args.output:
+        runner.save(args.output)
+    if args.compare:
+        compare(args.compare, runner.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtGui import QImage
+
+from bench_tiled_fill import sparse_canvas
+from canvas_model import FILL_STYLES
+from fill import fill_region, flood_fill_array
+from fill_style import gradient_table, pattern_tile, styled_content
+from harness import BenchmarkRunner, compare
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gradient and pattern fills against a solid fill")
+    parser.add_argument("--size", type=int, default=2048)
+    parser.add_argument("--strokes", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    canvas = sparse_canvas(args.size, args.strokes)
+    image_format = QImage.Format_ARGB32_Premultiplied
+    runner = BenchmarkRunner(repeat=args.repeat, warmup=1)
+    solid = runner.run("solid", lambda p: flood_fill_array(p, 0, 0, 0xff3060c0),
+                       setup=canvas.copy, size=args.size)
+    for style in FILL_STYLES[1:]:
+        def fill(pixels, cold=False):
+            if cold:
+                gradient_table.cache_clear()
+                pattern_tile.cache_clear()
+            content = styled_content(style, (args.size // 2, args.size // 2), 30,
+                                     0xff3060c0, 0x80ffc800, 8, image_format)
+            return fill_region(pixels, 0, 0, content)
+
+        result = runner.run(style, fill, setup=canvas.copy, size=args.size)
+        print(f"{'':<28} {result['p50_ms'] / solid['p50_ms']:.2f}x solid")
+        runner.run(f"{style}_uncached", lambda p: fill(p, cold=True), setup=canvas.copy,
+                   size=args.size)
+
+    if args.output:
+        runner.save(args.output)
+    if args.compare:
+        compare(args.compare, runner.report())
+
+
+if __name__ == "__main__":
+    main()
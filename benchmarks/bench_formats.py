@@ -0,0 +1,95 @@
+import argparse
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QPainter, QImage, QColor
+from PyQt5.QtCore import Qt
+
+from canvas_model import CanvasModel, IMAGE_FORMATS
+from renderers import RasterCanvas
+from harness import BenchmarkRunner, compare, qt_app
+from bench_canvas import scribble
+
+FORMAT_NAMES = {
+    QImage.Format_RGB32: "RGB32",
+    QImage.Format_ARGB32: "ARGB32",
+    QImage.Format_ARGB32_Premultiplied: "ARGB32_Premultiplied",
+}
+
+
+def bench_blit(runner, size, image_format, repeat):
+    # What a raster paintEvent does: copy the canvas into the backing store,
+    # which is premultiplied (or RGB32) on every Qt platform
+    name = FORMAT_NAMES[image_format]
+    source = QImage(size, size, image_format)
+    source.fill(QColor(200, 120, 40))
+    for target_format in (QImage.Format_RGB32, QImage.Format_ARGB32_Premultiplied):
+        target = QImage(size, size, target_format)
+
+        def blit(_):
+            painter = QPainter(target)
+            painter.drawImage(0, 0, source)
+            painter.end()
+        runner.run("blit", blit, repeat=repeat, size=size, format=name,
+                   target=FORMAT_NAMES[target_format])
+
+
+def bench_composite(runner, size, image_format, repeat):
+    # A translucent layer blended over the canvas, both in the same format
+    name = FORMAT_NAMES[image_format]
+    canvas = QImage(size, size, image_format)
+    canvas.fill(Qt.white)
+    layer = QImage(size, size, image_format)
+    layer.fill(QColor(0, 80, 200, 128))
+
+    def composite(_):
+        painter = QPainter(canvas)
+        painter.drawImage(0, 0, layer)
+        painter.end()
+    runner.run("composite", composite, repeat=repeat, size=size, format=name)
+
+
+def bench_canvas(runner, size, image_format, repeat):
+    name = FORMAT_NAMES[image_format]
+    runner.run("pen_strokes", lambda m: scribble(m, 100),
+               setup=lambda: CanvasModel(size, size, image_format),
+               repeat=max(1, repeat // 10), size=size, format=name)
+
+    model = CanvasModel(size, size, image_format)
+    scribble(model, 100)
+    canvas = RasterCanvas(model)
+    canvas.resize(size, size)
+    canvas.show()
+    QApplication.processEvents()
+    runner.run("paintEvent", lambda _: canvas.repaint(), repeat=repeat, size=size, format=name)
+    canvas.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blit and composite throughput per canvas format")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[512, 1024, 2048])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    qt_app()
+    runner = BenchmarkRunner(repeat=args.repeat)
+    for size in args.sizes:
+        for image_format in IMAGE_FORMATS:
+            bench_blit(runner, size, image_format, args.repeat)
+            bench_composite(runner, size, image_format, args.repeat)
+            bench_canvas(runner, size, image_format, args.repeat)
+
+    if args.output:
+        runner.save(args.output)
+    if args.compare:
+        compare(args.compare, runner.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PyQt5.QtGui import QColor
+from PyQt5.QtCore import QRect
+
+from canvas_model import CanvasModel
+from color_histogram import ColorHistogram
+from image_buffer import image_view
+from harness import BenchmarkRunner, compare
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keeping the colours-used palette current")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2048, 4096])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    runner = BenchmarkRunner(repeat=args.repeat, warmup=1)
+    for size in args.sizes:
+        model = CanvasModel(size, size)
+        histogram = ColorHistogram(model)
+        step = [0]
+
+        def stroke(_=None):
+            step[0] += 1
+            model.brush_color = QColor.fromHsv(step[0] * 37 % 360, 200, 200)
+            x = 50 + step[0] * 53 % (size - 300)
+            model.press(x, 100)
+            for i in range(1, 40):
+                model.move(x + i * 5, 100 + i * 3)
+            model.release(x + 200, 220)
+
+        histogram.update()
+        runner.run("update_after_stroke", lambda _: histogram.update(), setup=stroke, size=size)
+        runner.run("full_unique", lambda _: np.unique(image_view(model.image), return_counts=True),
+                   size=size)
+        runner.run("update_all_dirty", lambda _: histogram.update(),
+                   setup=lambda: model.changed.emit(QRect()), size=size)
+        full = np.unique(image_view(model.image))
+        histogram.update()
+        print(f"{'':<28} {len(histogram)} colours, "
+              f"{'matches' if np.array_equal(histogram._values, full) else 'DIFFERS'} a full count")
+
+    if args.output:
+        runner.save(args.output)
+    if args.compare:
+        compare(args.compare, runner.report())
+
+
+if __name__ == "__main__":
+    main()
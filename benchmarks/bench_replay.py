@@ -0,0 +1,98 @@
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtGui import QColor
+
+from canvas_model import CanvasModel
+from recorder import Recorder, apply_event, read_log, render_frames
+from harness import BenchmarkRunner, compare
+
+
+def record_session(path, strokes, size, seed=0):
+    # A synthetic session: pen strokes in varying colours with the odd
+    # shape, fill and undo, recorded through the model like real input
+    rng = random.Random(seed)
+    model = CanvasModel()
+    model.recorder = Recorder(path, model)
+    model.resize(size, size)
+    for i in range(strokes):
+        model.brush_color = QColor.fromHsv(rng.randrange(360), 200, 200)
+        r = rng.random()
+        x, y = rng.randrange(size), rng.randrange(size)
+        if r < 0.8:
+            model.current_tool = "pen"
+            model.press(x, y)
+            for _ in range(rng.randint(10, 60)):
+                x = min(max(x + rng.randint(-6, 6), 0), size - 1)
+                y = min(max(y + rng.randint(-6, 6), 0), size - 1)
+                model.move(x, y)
+            model.release(x, y)
+        elif r < 0.9:
+            model.current_tool = rng.choice(["rectangle", "ellipse", "line"])
+            model.press(x, y)
+            model.move(x + 40, y + 30)
+            model.release(x + 40, y + 30)
+        elif r < 0.95:
+            model.current_tool = "fill"
+            model.press(x, y)
+            model.release(x, y)
+        else:
+            model.undo()
+    model.recorder.close()
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session replay and frame rendering throughput")
+    parser.add_argument("--strokes", type=int, default=300)
+    parser.add_argument("--size", type=int, default=800)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, min(4, os.cpu_count() or 1)}))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    runner = BenchmarkRunner(repeat=args.repeat, warmup=1)
+    with tempfile.TemporaryDirectory() as tmp:
+        log = os.path.join(tmp, "session.rec")
+        recorded = record_session(log, args.strokes, args.size)
+        tools, events = read_log(log)
+        print(f"{len(events)} events, {os.path.getsize(log) / 1024:.1f} KiB recorded")
+
+        def replay(_):
+            model = CanvasModel()
+            for event in events:
+                apply_event(model, event, tools)
+            return model
+
+        result = runner.run("replay", replay, events=len(events))
+        print(f"{'':<28} {len(events) / result['mean_ms'] * 1e3:,.0f} events/s, "
+              f"{'identical' if replay(None).image == recorded.image else 'DIFFERS'}")
+
+        frames_dir = os.path.join(tmp, "frames")
+        for workers in args.workers:
+            def render(_):
+                shutil.rmtree(frames_dir, ignore_errors=True)
+                return render_frames(log, frames_dir, args.fps, args.speed, workers)
+
+            result = runner.run("render_frames", render, workers=workers, fps=args.fps)
+            frames = len(os.listdir(frames_dir))
+            print(f"{'':<28} {frames} frames, {frames / result['mean_ms'] * 1e3:.1f} frames/s")
+
+    if args.output:
+        runner.save(args.output)
+    if args.compare:
+        compare(args.compare, runner.report())
+
+
+if __name__ == "__main__":
+    main()
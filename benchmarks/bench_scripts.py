@@ -0,0 +1,75 @@
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harness import BenchmarkRunner, compare
+from script_runner import BatchExecutor, run_script
+
+# A procedural script: a few thousand dots and some paths per canvas
+SCRIPT = """
+import numpy as np
+
+def draw(api, index=0, dots=20000, **params):
+    rng = np.random.default_rng(index)
+    with api.undo_step():
+        api.fill_rect(0, 0, api.width, api.height, "#102040")
+        api.set_pixels(rng.random((dots, 2)) * (api.width, api.height), "white")
+        for _ in range(50):
+            api.stroke_path(rng.random((8, 2)) * (api.width, api.height), "orange", 3)
+"""
+
+HANG = "def draw(api, **params):\n    while True:\n        pass\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Running drawing scripts on a worker pool")
+    parser.add_argument("--count", type=int, default=16, help="canvases per batch")
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp()
+    script, hang = os.path.join(folder, "dots.py"), os.path.join(folder, "hang.py")
+    with open(script, "w") as f:
+        f.write(SCRIPT)
+    with open(hang, "w") as f:
+        f.write(HANG)
+    tasks = [(script, (args.size, args.size), os.path.join(folder, f"{i}.png"), {"index": i})
+             for i in range(args.count)]
+
+    runner = BenchmarkRunner(repeat=args.repeat, warmup=1)
+    serial = runner.run("in_process", lambda _: [run_script(*task) for task in tasks],
+                        count=args.count, size=args.size)
+    for jobs in sorted({1, args.jobs}):
+        # a fresh pool each batch, so worker start-up is counted
+        def batch(_):
+            with BatchExecutor(jobs, timeout=60) as executor:
+                results = list(executor.run(run_script, tasks))
+            assert all(r.ok for r in results), [r.error for r in results if not r.ok]
+
+        result = runner.run(f"pool_{jobs}", batch, count=args.count, size=args.size, jobs=jobs)
+        print(f"{'':<28} {serial['p50_ms'] / result['p50_ms']:.2f}x in-process")
+
+    # A hanging script costs its timeout and a worker restart, not the batch
+    def with_hang(_):
+        with BatchExecutor(args.jobs, timeout=0.5) as executor:
+            results = list(executor.run(run_script, tasks + [(hang,) + tasks[0][1:]]))
+        assert sum(not r.ok for r in results) == 1
+
+    runner.run("pool_with_timeout", with_hang, count=args.count + 1, size=args.size,
+               jobs=args.jobs)
+
+    if args.output:
+        runner.save(args.output)
+    if args.compare:
+        compare(args.compare, runner.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spatial_index import StrokeIndex, _point_segment_distance, _segment_hits_rect
+
+
+def make_strokes(count, canvas, seed=0):
+    rng = random.Random(seed)
+    strokes = []
+    for _ in range(count):
+        x, y = rng.uniform(0, canvas), rng.uniform(0, canvas)
+        points = [(x, y)]
+        for _ in range(rng.randint(2, 12)):
+            x += rng.uniform(-6, 6)
+            y += rng.uniform(-6, 6)
+            points.append((x, y))
+        strokes.append(points)
+    return strokes
+
+
+def linear_query_rect(strokes, width, left, top, right, bottom):
+    r = width / 2
+    hits = set()
+    for stroke_id, points in enumerate(strokes):
+        prev = points[0]
+        for point in points:
+            if _segment_hits_rect(prev[0], prev[1], point[0], point[1],
+                                  left - r, top - r, right + r, bottom + r):
+                hits.add(stroke_id)
+                break
+            prev = point
+    return hits
+
+
+def linear_nearest(strokes, width, x, y):
+    best_id, best_dist = None, math.inf
+    for stroke_id, points in enumerate(strokes):
+        prev = points[0]
+        for point in points:
+            d = _point_segment_distance(x, y, prev[0], prev[1], point[0], point[1])
+            d = max(0.0, d - width / 2)
+            if d < best_dist:
+                best_id, best_dist = stroke_id, d
+            prev = point
+    return best_id, best_dist
+
+
+def main():
+    parser = argparse.ArgumentParser(description="StrokeIndex vs linear scan")
+    parser.add_argument("--strokes", type=int, default=100000)
+    parser.add_argument("--canvas", type=int, default=8000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--cell-size", type=int, default=64)
+    args = parser.parse_args()
+
+    width = 5
+    strokes = make_strokes(args.strokes, args.canvas)
+    rng = random.Random(1)
+
+    index = StrokeIndex(args.cell_size)
+    start = time.perf_counter()
+    for stroke_id, points in enumerate(strokes):
+        # insert the way mouseMoveEvent does, one point at a time
+        index.add_stroke(stroke_id, points[:1], width)
+        for point in points[1:]:
+            index.append_point(stroke_id, point)
+    build = time.perf_counter() - start
+    print(f"build: {args.strokes} strokes in {build:.2f}s "
+          f"({build / args.strokes * 1e6:.1f} us/stroke)")
+
+    rects = []
+    for _ in range(args.queries):
+        x, y = rng.uniform(0, args.canvas), rng.uniform(0, args.canvas)
+        rects.append((x, y, x + 50, y + 50))
+    start = time.perf_counter()
+    for rect in rects:
+        index.query_rect(*rect)
+    indexed = (time.perf_counter() - start) / len(rects)
+
+    sample = rects[:5]
+    start = time.perf_counter()
+    for rect in sample:
+        expected = linear_query_rect(strokes, width, *rect)
+        assert index.query_rect(*rect) == expected
+    linear = (time.perf_counter() - start) / len(sample)
+    print(f"query_rect: indexed {indexed * 1e3:.3f} ms, linear {linear * 1e3:.1f} ms "
+          f"({linear / indexed:.0f}x)")
+
+    points = [(rng.uniform(0, args.canvas), rng.uniform(0, args.canvas))
+              for _ in range(args.queries)]
+    start = time.perf_counter()
+    for x, y in points:
+        index.nearest(x, y)
+    indexed = (time.perf_counter() - start) / len(points)
+
+    sample = points[:5]
+    start = time.perf_counter()
+    for x, y in sample:
+        _, expected = linear_nearest(strokes, width, x, y)
+        assert abs(index.nearest(x, y)[1] - expected) < 1e-9
+    linear = (time.perf_counter() - start) / len(sample)
+    print(f"nearest: indexed {indexed * 1e3:.3f} ms, linear {linear * 1e3:.1f} ms "
+          f"({linear / indexed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import percentile
+
+# Runs in a fresh interpreter: time from before the first import to the end
+# of the canvas's first paintEvent
+FIRST_PAINT = r"""
+import time
+start = time.perf_counter()
+import sys
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QEvent, QTimer
+import paint_app
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and not hasattr(self, "done"):
+            self.done = True
+            QTimer.singleShot(0, lambda: (print(f"FIRST_PAINT {(time.perf_counter() - start) * 1e3:.2f}"),
+                                          app.quit()))
+        return False
+
+app = QApplication(sys.argv[:1])
+window = paint_app.PythonPaint(sys.argv[1])
+watcher = FirstPaint()
+window.canvas.installEventFilter(watcher)
+window.show()
+app.exec_()
+"""
+
+
+def import_times(env):
+    # Cumulative -X importtime of the app's own modules and their heaviest deps
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import paint_app"],
+                         cwd=ROOT, env=env, capture_output=True, text=True).stderr
+    rows = []
+    for line in out.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)", line)
+        if match:
+            rows.append((int(match.group(2)), len(match.group(3)), match.group(4)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start to first paint")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--backend", default="raster")
+    parser.add_argument("--target-ms", type=float, default=500.0,
+                        help="fail when p90 first-paint time exceeds this")
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    rows = import_times(env)
+    total = next((us for us, _, name in rows if name == "paint_app"), 0)
+    print(f"import paint_app: {total / 1e3:.1f} ms cumulative")
+    for us, depth, name in sorted((r for r in rows if r[1] <= 3), reverse=True)[:10]:
+        print(f"  {us / 1e3:8.1f} ms  {name}")
+    for heavy in ("numpy", "OpenGL"):
+        if any(name == heavy for _, _, name in rows):
+            print(f"  warning: {heavy} is imported at startup")
+
+    samples = []
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, "-c", FIRST_PAINT, args.backend],
+                             cwd=ROOT, env=env, capture_output=True, text=True).stdout
+        match = re.search(r"FIRST_PAINT ([\d.]+)", out)
+        if match is None:
+            sys.exit("first paint was never reached")
+        samples.append(float(match.group(1)))
+    samples.sort()
+    p50, p90 = percentile(samples, 0.5), percentile(samples, 0.9)
+    print(f"first paint over {args.runs} runs: p50 {p50:.1f} ms, p90 {p90:.1f} ms, "
+          f"target {args.target_ms:.0f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"import_ms": total / 1e3, "first_paint_ms": samples,
+                       "p50_ms": p50, "p90_ms": p90, "target_ms": args.target_ms}, f, indent=2)
+    if p90 > args.target_ms:
+        sys.exit(f"p90 first paint {p90:.1f} ms is over the {args.target_ms:.0f} ms target")
+
+
+if __name__ == "__main__":
+    main()
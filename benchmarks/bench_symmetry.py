@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtGui import QPainter
+from PyQt5.QtCore import QPointF
+
+from canvas_model import CanvasModel
+from harness import BenchmarkRunner, compare
+
+
+def stroke(model, moves, size):
+    model.press(size // 3, size // 3)
+    for i in range(1, moves):
+        model.move(size // 3 + i % 200, size // 3 + i * 7 % 150)
+    model.release(size // 3, size // 3)
+
+
+def per_copy_stroke(model, moves, size):
+    # Baseline: each copy of each segment mapped, drawn and added to its
+    # stroke on its own, with its own dirty rect, as a plain loop over the
+    # copies would
+    model.press(size // 3, size // 3)
+    copies = model._copies
+    first = len(model.strokes) - len(copies)
+    last = (size // 3, size // 3)
+    for i in range(1, moves):
+        point = (size // 3 + i % 200, size // 3 + i * 7 % 150)
+        for stroke_id, transform in enumerate(copies.transforms, first):
+            a, b = transform.map(QPointF(*last)), transform.map(QPointF(*point))
+            painter = QPainter(model.image)
+            painter.setPen(model._pen())
+            painter.drawLine(a, b)
+            painter.end()
+            model.strokes[stroke_id].points.append((b.x(), b.y()))
+            model._index.append_point(stroke_id, (b.x(), b.y()))
+            model.changed.emit(model._margin_rect(a.x(), a.y(), b.x(), b.y()))
+        last = point
+    model.release(*last)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of symmetric pen strokes per input event")
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--moves", type=int, default=500)
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    runner = BenchmarkRunner(repeat=args.repeat, warmup=1)
+    for copies in args.copies:
+        model = CanvasModel(args.size, args.size)
+        # repaints are what a view would do with the dirty rects
+        model.changed.connect(lambda rect: None)
+        if copies > 1:
+            model.symmetry_count = copies
+            model.symmetry = "radial"
+        result = runner.run("batched", lambda _: stroke(model, args.moves, args.size),
+                            copies=copies, moves=args.moves)
+        print(f"{'':<28} {result['mean_ms'] * 1e3 / args.moves:.1f} us per event")
+        if copies > 1:
+            result = runner.run("per_copy", lambda _: per_copy_stroke(model, args.moves, args.size),
+                                copies=copies, moves=args.moves)
+            print(f"{'':<28} {result['mean_ms'] * 1e3 / args.moves:.1f} us per event")
+
+    if args.output:
+        runner.save(args.output)
+    if args.compare:
+        compare(args.compare, runner.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from fill import flood_fill_array
+from tiled_fill import tiled_flood_fill
+from harness import BenchmarkRunner, compare
+
+
+def sparse_canvas(size, strokes, seed=0):
+    # White canvas with a few thousand short dark segments, like a sketch
+    rng = np.random.default_rng(seed)
+    pixels = np.full((size, size), 0xffffffff, dtype=np.uint32)
+    for _ in range(strokes):
+        x, y = rng.integers(0, size - 64, 2)
+        length = int(rng.integers(8, 64))
+        if rng.random() < 0.5:
+            pixels[y, x:x + length] = 0xff000000
+        else:
+            pixels[y:y + length, x] = 0xff000000
+    return pixels
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiled flood fill scaling with core count")
+    parser.add_argument("--size", type=int, default=16384)
+    parser.add_argument("--strokes", type=int, default=20000)
+    parser.add_argument("--tile", type=int, default=1024)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[w for w in (1, 2, 4, 8, 16, 32) if w <= (os.cpu_count() or 1)])
+    parser.add_argument("--executor", choices=["process", "spawn", "thread"], default="process")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    canvas = sparse_canvas(args.size, args.strokes)
+    runner = BenchmarkRunner(repeat=args.repeat, warmup=1)
+
+    single = runner.run("flood_fill_array",
+                        lambda p: flood_fill_array(p, 0, 0, 0xffff0000),
+                        setup=canvas.copy, size=args.size)
+    curve = []
+    for workers in args.workers:
+        result = runner.run("tiled_flood_fill",
+                            lambda p: tiled_flood_fill(p, 0, 0, 0xffff0000, tile=args.tile,
+                                                       workers=workers, executor=args.executor),
+                            setup=canvas.copy, size=args.size, workers=workers,
+                            executor=args.executor)
+        curve.append((workers, result["p50_ms"]))
+
+    base = curve[0][1] if curve else single["p50_ms"]
+    print("\nworkers  p50 ms   speedup  vs single-threaded")
+    for workers, p50 in curve:
+        print(f"{workers:>7}  {p50:8.1f}  {base / p50:7.2f}x  {single['p50_ms'] / p50:7.2f}x")
+
+    if args.output:
+        runner.save(args.output)
+    if args.compare:
+        compare(args.compare, runner.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtGui import QColor
+
+from canvas_model import Stroke
+from vector_export import stroke_items, write_pdf, write_svg
+from harness import BenchmarkRunner, compare
+
+
+def make_strokes(points, canvas, points_per_stroke=200, seed=0):
+    rng = random.Random(seed)
+    strokes = []
+    color = QColor(20, 40, 200)
+    for _ in range(points // points_per_stroke):
+        x, y = rng.uniform(0, canvas), rng.uniform(0, canvas)
+        stroke = []
+        for _ in range(points_per_stroke):
+            x = min(max(x + rng.uniform(-4, 4), 0), canvas)
+            y = min(max(y + rng.uniform(-4, 4), 0), canvas)
+            stroke.append((x, y))
+        strokes.append(Stroke("pen", stroke, color, 3))
+    return strokes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming SVG/PDF export throughput")
+    parser.add_argument("--points", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--canvas", type=int, default=2048)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    runner = BenchmarkRunner(repeat=args.repeat, warmup=1)
+    with tempfile.TemporaryDirectory() as tmp:
+        for points in args.points:
+            strokes = make_strokes(points, args.canvas)
+
+            def svg(_):
+                with open(os.path.join(tmp, "out.svg"), "w", encoding="utf-8") as out:
+                    write_svg(out, stroke_items(strokes), args.canvas, args.canvas)
+
+            def pdf(_):
+                with open(os.path.join(tmp, "out.pdf"), "wb") as out:
+                    write_pdf(out, stroke_items(strokes), args.canvas, args.canvas)
+
+            for name, fn, ext in (("export_svg", svg, "svg"), ("export_pdf", pdf, "pdf")):
+                result = runner.run(name, fn, points=points)
+                size = os.path.getsize(os.path.join(tmp, "out." + ext))
+                print(f"{'':<28} {result['mean_ms'] / points * 1e5:10.1f} ms per 100k points, "
+                      f"{size / 2**20:.1f} MiB written")
+
+    if args.output:
+        runner.save(args.output)
+    if args.compare:
+        compare(args.compare, runner.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import json
+import os
+import platform
+import resource
+import subprocess
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def max_rss_kib():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if platform.system() == "Darwin" else rss
+
+
+_qt_app = None
+
+
+def qt_app():
+    # The QApplication widget benchmarks need, created once and kept
+    # referenced here; PyQt destroys one nobody refers to
+    global _qt_app
+    from PyQt5.QtWidgets import QApplication
+    if _qt_app is None:
+        _qt_app = QApplication.instance() or QApplication(["bench"])
+    return _qt_app
+
+
+class BenchmarkRunner:
+    """Times callables and collects results for one JSON report.
+
+    Timing runs without tracemalloc; one extra traced call measures the peak
+    Python-side allocation. QImage pixels live in C++, so the process max RSS
+    is recorded as well.
+    """
+
+    def __init__(self, repeat=20, warmup=2, min_time=0.0):
+        self.repeat = repeat
+        self.warmup = warmup
+        self.min_time = min_time
+        self.results = []
+
+    def run(self, name, fn, setup=None, repeat=None, **params):
+        repeat = self.repeat if repeat is None else repeat
+        for _ in range(self.warmup):
+            fn(setup() if setup else None)
+
+        samples = []
+        started = time.perf_counter()
+        while len(samples) < repeat or time.perf_counter() - started < self.min_time:
+            arg = setup() if setup else None
+            start = time.perf_counter()
+            fn(arg)
+            samples.append(time.perf_counter() - start)
+
+        arg = setup() if setup else None
+        tracemalloc.start()
+        fn(arg)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        samples.sort()
+        total = sum(samples)
+        result = {
+            "name": name,
+            "params": params,
+            "runs": len(samples),
+            "ops_per_s": len(samples) / total if total else float("inf"),
+            "mean_ms": total / len(samples) * 1e3,
+            "p50_ms": percentile(samples, 0.50) * 1e3,
+            "p90_ms": percentile(samples, 0.90) * 1e3,
+            "p99_ms": percentile(samples, 0.99) * 1e3,
+            "peak_py_kib": peak / 1024,
+            "max_rss_kib": max_rss_kib(),
+        }
+        self.results.append(result)
+        label = " ".join(f"{k}={v}" for k, v in params.items())
+        print(f"{name:<28} {label:<24} {result['ops_per_s']:>10.1f} ops/s  "
+              f"p50 {result['p50_ms']:8.3f} ms  p99 {result['p99_ms']:8.3f} ms  "
+              f"peak {result['peak_py_kib']:8.1f} KiB")
+        return result
+
+    def skip(self, name, reason, **params):
+        self.results.append({"name": name, "params": params, "skipped": reason})
+        print(f"{name:<28} skipped: {reason}")
+
+    def report(self):
+        try:
+            commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip()
+        except OSError:
+            commit = ""
+        return {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": self.results,
+        }
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+def _key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(baseline_path, current):
+    # Prints p50 ratios against an earlier report; >1 means slower now
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {_key(r): r for r in json.load(f)["results"] if "skipped" not in r}
+    for result in current["results"]:
+        old = baseline.get(_key(result))
+        if old is None or "skipped" in result:
+            continue
+        ratio = result["p50_ms"] / old["p50_ms"] if old["p50_ms"] else float("inf")
+        label = " ".join(f"{k}={v}" for k, v in result["params"].items())
+        print(f"{result['name']:<28} {label:<24} {old['p50_ms']:9.3f} -> "
+              f"{result['p50_ms']:9.3f} ms  x{ratio:.2f}")
@@ -0,0 +1,121 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtGui import QColor
+
+from canvas_model import CanvasModel, FILL_STYLES
+from color_histogram import ColorHistogram
+from harness import max_rss_kib
+
+# Soak test: thousands of synthetic strokes of every kind on one model, with
+# the model's memory accounting checked against a bound along the way, and
+# the process's resident memory against its level after a warm-up, which
+# catches what the accounting does not see. Exits non-zero on a breach.
+
+
+def rss_bytes():
+    # Current resident set; the peak where /proc is not available
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return max_rss_kib() * 1024
+
+
+def stroke(model, rng, size):
+    r = rng.random()
+    x, y = rng.randrange(size), rng.randrange(size)
+    model.brush_color = QColor.fromHsv(rng.randrange(360), 200, 200, rng.choice([255, 128]))
+    model.brush_size = rng.randint(1, 40)
+    if r < 0.7:
+        model.current_tool = "pen"
+        pressure = rng.random() < 0.3  # tablet strokes go through the brush engine
+        model.press(x, y, 0.5 if pressure else None)
+        for _ in range(rng.randint(10, 80)):
+            x = min(max(x + rng.randint(-8, 8), 0), size - 1)
+            y = min(max(y + rng.randint(-8, 8), 0), size - 1)
+            model.move(x, y, rng.random() if pressure else None)
+        model.release(x, y, 0.5 if pressure else None)
+    elif r < 0.85:
+        model.current_tool = rng.choice(["rectangle", "ellipse", "line", "circle"])
+        model.press(x, y)
+        model.move(x + rng.randint(-200, 200), y + rng.randint(-200, 200))
+        model.release(x + rng.randint(-200, 200), y + rng.randint(-200, 200))
+    elif r < 0.9:
+        model.current_tool = "fill"
+        model.fill_style = rng.choice(FILL_STYLES)
+        model.gradient_angle = rng.randrange(360)
+        model.press(x, y)
+        model.release(x, y)
+    elif r < 0.97:
+        model.undo()
+    else:
+        model.redo()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory stays bounded over a long session")
+    parser.add_argument("--strokes", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--history-limit", type=float, default=64, help="MiB")
+    parser.add_argument("--cache-bound", type=float, default=64,
+                        help="MiB the caches may hold (default: 64)")
+    parser.add_argument("--rss-slack", type=float, default=128,
+                        help="MiB the process may grow by after the warm-up (default: 128)")
+    parser.add_argument("--clear-every", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    model = CanvasModel(args.size, args.size)
+    model.history_limit = int(args.history_limit * 2**20)
+    histogram = ColorHistogram(model)  # the palette's counts, kept current as in the app
+    frame = model.image.sizeInBytes()
+    # the canvas, and the shape layer if there were one; history is allowed
+    # its limit plus the latest step, at most a whole frame
+    bounds = {"images": 2 * frame, "history": model.history_limit + frame,
+              "caches": int(args.cache_bound * 2**20), "gl": 0}
+
+    warmup = max(1, args.strokes // 10)
+    baseline = None
+    failures = []
+    start = time.perf_counter()
+    checkpoints = sorted({warmup, *range(0, args.strokes + 1, max(1, args.strokes // 10))} - {0})
+    print(f"{'strokes':>8} " + " ".join(f"{c:>9}" for c in bounds) + f" {'rss':>9}  (MiB)")
+    for i in range(1, args.strokes + 1):
+        stroke(model, rng, args.size)
+        if i % args.clear_every == 0:
+            model.clear_canvas()
+        if i % 50 == 0:
+            histogram.update()
+        if i not in checkpoints:
+            continue
+        usage = model.memory_usage()
+        rss = rss_bytes()
+        if i == warmup:
+            baseline = rss
+        print(f"{i:>8} " + " ".join(f"{usage[c] / 2**20:>9.1f}" for c in bounds)
+              + f" {rss / 2**20:>9.1f}")
+        for category, bound in bounds.items():
+            if usage[category] > bound:
+                failures.append(f"{category} at {usage[category] / 2**20:.1f} MiB after {i} "
+                                f"strokes, bound {bound / 2**20:.1f} MiB")
+        if baseline is not None and rss - baseline > args.rss_slack * 2**20:
+            failures.append(f"resident memory grew {(rss - baseline) / 2**20:.1f} MiB after "
+                            f"the warm-up, by {i} strokes")
+
+    print(f"{args.strokes} strokes in {time.perf_counter() - start:.1f}s, "
+          f"{len(model.strokes)} strokes and {len(model._undo_stack)} undo steps kept, "
+          f"peak RSS {max_rss_kib() / 1024:.1f} MiB")
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
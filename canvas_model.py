@@ -0,0 +1,1622 @@
+import math
+import time
+from collections import deque, namedtuple
+from itertools import groupby
+
+from PyQt5.QtGui import QPainter, QPen, QImage, QColor, QPolygonF, QRegion, QTransform, qPremultiply
+from PyQt5.QtCore import Qt, QObject, QPoint, QPointF, QRect, QThreadPool, pyqtSignal
+
+from spatial_index import StrokeIndex, shape_outline
+from stroke_filter import StrokeSimplifier
+from profiler import NULL_PROFILER
+from memory import MemoryTracker, cache_bytes
+from selection import SELECTION_TOOLS, Selection
+from scene import Scene, Shape, shape_bounds
+from tools import plugin_tool
+
+# fill, fill_worker, fill_style, image_buffer, brush, transform, symmetry and
+# drawing_api pull in NumPy; they are imported on first use so startup only
+# pays for Qt, as is image_io
+
+# Built-in tools; plugin tools (tools.py) come on top of these
+TOOLS = ["pen", "rectangle", "ellipse", "line", "fill", "circle", "select", "lasso", "transform",
+         "picker"]
+SYMMETRY_MODES = ("none", "horizontal", "vertical", "quad", "radial", "kaleidoscope")
+FILL_STYLES = ("solid", "linear", "radial", "checker", "stripes", "dots")
+
+# Canvas storage. Premultiplied ARGB is what QPainter's raster engine blends
+# in natively, so drawing into it and blitting it needs no per-pixel
+# conversion, and it carries alpha for transparency. Other formats are only
+# converted to at import and export.
+CANVAS_FORMAT = QImage.Format_ARGB32_Premultiplied
+IMAGE_FORMATS = (QImage.Format_RGB32, QImage.Format_ARGB32, QImage.Format_ARGB32_Premultiplied)
+
+# A committed stroke or shape, kept alongside the pixels for hit-testing
+Stroke = namedtuple("Stroke", "tool points color size")
+
+# Pixels before an edit as (rect, image) patches, one per touched area, plus
+# how to restore the stroke list: truncate it to `stroke_count` and append
+# `strokes`, and retained shapes as (shape_id, Shape or None) pairs.
+_HistoryEntry = namedtuple("_HistoryEntry", "patches stroke_count strokes shapes",
+                           defaults=((),))
+
+# Bytes of undo and redo pixels kept besides the latest step; the oldest
+# steps are dropped beyond it
+HISTORY_LIMIT = 256 * 2**20
+
+
+def _box_rect(box):
+    # QRect of an inclusive (left, top, right, bottom) box, null for None
+    if box is None:
+        return QRect()
+    left, top, right, bottom = box
+    return QRect(left, top, right - left + 1, bottom - top + 1)
+
+
+def _split_points(points, path):
+    # Runs of consecutive points as (inside `path`, points)
+    for inside, run in groupby(points, key=lambda p: path.contains(QPointF(*p))):
+        yield inside, list(run)
+
+
+def _entry_bytes(entry):
+    return sum(pixels.sizeInBytes() for _, pixels in entry.patches)
+
+
+class _HistoryStack(list):
+    # Undo or redo entries, with a running total of their patch bytes so
+    # the history limit can be checked on every step
+
+    def __init__(self):
+        super().__init__()
+        self.nbytes = 0
+
+    def append(self, entry):
+        super().append(entry)
+        self.nbytes += _entry_bytes(entry)
+
+    def pop(self, index=-1):
+        entry = super().pop(index)
+        self.nbytes -= _entry_bytes(entry)
+        return entry
+
+    def clear(self):
+        super().clear()
+        self.nbytes = 0
+
+    def __setitem__(self, index, entry):
+        self.nbytes += _entry_bytes(entry) - _entry_bytes(self[index])
+        super().__setitem__(index, entry)
+
+
+class CanvasModel(QObject):
+    """The drawing shared by every renderer backend.
+
+    Tools, history and the stroke index all live here and work on a QImage,
+    so the same model can be shown by a QPainter widget, uploaded to an
+    OpenGL texture, or driven without any window at all.
+    """
+
+    changed = pyqtSignal(QRect)  # dirty area in image coordinates, null for all
+    stroke_simplified = pyqtSignal(int, int)  # input points, kept points
+    import_failed = pyqtSignal(str)  # reader error of an image import
+    color_picked = pyqtSignal(QColor)  # the picker tool set the brush colour
+    # A finished edit as a batch_render script op ("stroke", "undo", "redo",
+    # "clear"), for mirroring the drawing elsewhere; see collab.py
+    operation = pyqtSignal(object)
+
+    def __init__(self, width=0, height=0, image_format=CANVAS_FORMAT):
+        super().__init__()
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"unsupported canvas format {image_format!r}")
+        self._format = image_format
+        self._image = None
+        self._brush_color = QColor(Qt.black)
+        self._secondary_color = QColor(Qt.white)  # gradient end, pattern background
+        self._brush_size = 5
+        self._current_tool = "pen"
+        self._drawing = False
+        self._start_point = QPoint()
+        self._last_point = QPoint()
+        self._undo_stack = _HistoryStack()
+        self._redo_stack = _HistoryStack()
+        self._history_limit = HISTORY_LIMIT
+        self._strokes = []
+        self._index = StrokeIndex()
+        self._simplify_tolerance = 0.0
+        self._smoothing = False
+        self._simplifier = None
+        self._tail_rect = QRect()
+        self._profiler = NULL_PROFILER
+        self._recorder = None  # session Recorder, gets every input
+        self._draining = False
+        self._brush_hardness = 0.8
+        self._brush = None  # BrushEngine while a pressure stroke is drawn
+        self._pressures = []  # pressure at each point of that stroke, for its op
+        self._async_fill = False
+        self._fill_style = "solid"
+        self._gradient_angle = 0.0
+        self._fill_worker = None
+        self._queued_input = deque()  # input that arrived while a fill was running
+        self._loaders = set()  # image imports still decoding
+        self._selection = None
+        self._moving_selection = False
+        self._lasso = []  # points of the lasso being drawn
+        self._transform_start = None  # transform and grab vector at press
+        self._async_transform = False
+        self._resample_job = None
+        self._scene = None  # retained shapes, created when first enabled
+        self._retain_shapes = False
+        self._shape_edit = None  # (shape_id, "start" | "end", shape before the drag)
+        self._symmetry = "none"
+        self._symmetry_count = 6
+        self._symmetry_centre = None  # QPointF, None for the middle of the canvas
+        self._copies = None  # Symmetry of the stroke or shape being drawn
+        self._mirror_brushes = []  # BrushEngines of the symmetry copies
+        self._api = None  # DrawingAPI, created on first use
+        self._edit_depth = 0
+        self._edit_area = None  # QRect drawn by the open group of edits
+        self._memory = MemoryTracker()
+        self._memory.add_source("images", "canvas", lambda: self._image_bytes(self._image))
+        self._memory.add_source("images", "shape layer", lambda: self._image_bytes(
+            None if self._scene is None else self._scene.layer))
+        self._memory.add_source("history", "undo", lambda: self._undo_stack.nbytes)
+        self._memory.add_source("history", "redo", lambda: self._redo_stack.nbytes)
+        self._memory.add_source("caches", "brush and fill tables", cache_bytes)
+        if width > 0 and height > 0:
+            self.resize(width, height)
+
+    @property
+    def image(self):
+        return self._image
+
+    @property
+    def image_format(self):
+        return self._format
+
+    @property
+    def strokes(self):
+        return self._strokes
+
+    @property
+    def selection(self):
+        return self._selection
+
+    @property
+    def scene(self):
+        return self._scene
+
+    @property
+    def retained_shapes(self):
+        return self._retain_shapes
+
+    @retained_shapes.setter
+    def retained_shapes(self, enabled):
+        # New shapes go to the scene while enabled; shapes already there stay
+        # editable either way until flatten_shapes
+        self._retain_shapes = enabled
+        self._record("retained", enabled)
+        if enabled:
+            self._create_scene()
+
+    def _create_scene(self):
+        if self._scene is None:
+            self._scene = Scene(self._paint_retained)
+            if self._image is not None:
+                self._scene.resize(self._image.width(), self._image.height())
+
+    @property
+    def drawing(self):
+        return self._drawing
+
+    @property
+    def idle(self):
+        # No stroke in progress and no input waiting behind a worker
+        return not self._drawing and not self._busy() and not self._queued_input
+
+    @property
+    def fill_pending(self):
+        return self._fill_worker is not None
+
+    @property
+    def async_fill(self):
+        return self._async_fill
+
+    @async_fill.setter
+    def async_fill(self, enabled):
+        self._async_fill = enabled
+
+    @property
+    def async_transform(self):
+        return self._async_transform
+
+    @async_transform.setter
+    def async_transform(self, enabled):
+        self._async_transform = enabled
+
+    def _busy(self):
+        return self._fill_worker is not None or self._resample_job is not None
+
+    def _defer(self, method, *args):
+        # Keep input in order behind a running fill or resample; True when
+        # it was queued
+        if not self._busy():
+            return False
+        self._queued_input.append((method, args))
+        return True
+
+    def _drain_queue(self):
+        self._draining = True
+        try:
+            while self._queued_input and not self._busy():
+                method, args = self._queued_input.popleft()
+                method(*args)
+        finally:
+            self._draining = False
+
+    @property
+    def profiler(self):
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler):
+        self._profiler = NULL_PROFILER if profiler is None else profiler
+
+    @property
+    def recorder(self):
+        return self._recorder
+
+    @recorder.setter
+    def recorder(self, recorder):
+        self._recorder = recorder
+
+    def _record(self, kind, *args):
+        # Input as it arrives; calls replayed from the input queue were
+        # recorded when they first came in
+        if self._recorder is not None and not self._draining:
+            self._recorder.record(kind, *args)
+
+    def _create_blank_image(self, width, height):
+        image = QImage(width, height, self._format)
+        image.fill(Qt.white)
+        return image
+
+    def _pixel_value(self, color):
+        # The uint32 a colour is stored as, as returned by QImage.pixel
+        rgba = QColor(color).rgba()
+        if self._format == QImage.Format_ARGB32_Premultiplied:
+            return qPremultiply(rgba)
+        if self._format == QImage.Format_RGB32:
+            return rgba | 0xff000000
+        return rgba
+
+    def _pen(self):
+        return QPen(self._brush_color, self._brush_size,
+                    Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+
+    def _margin_rect(self, x0, y0, x1, y1):
+        # Area touched by a pen stroke between two points, clipped to the image
+        m = self._brush_size // 2 + 2
+        rect = QRect(QPoint(int(min(x0, x1)) - m, int(min(y0, y1)) - m),
+                     QPoint(int(max(x0, x1)) + m, int(max(y0, y1)) + m))
+        return rect.intersected(self._image.rect())
+
+    def resize(self, width, height):
+        self._record("resize", width, height)
+        if self._defer(self.resize, width, height):
+            return
+        if self._image is not None and self._image.width() == width \
+                and self._image.height() == height:
+            return
+        if width <= 0 or height <= 0:
+            return
+        new_image = self._create_blank_image(width, height)
+        if self._image is not None:
+            painter = QPainter(new_image)
+            painter.drawImage(0, 0, self._image)
+            painter.end()
+        self._image = new_image
+        if self._scene is not None:
+            self._scene.resize(width, height)
+        self.changed.emit(QRect())
+
+    def clear_canvas(self):
+        self._record("clear")
+        if self._image is None or self._defer(self.clear_canvas):
+            return
+        self._emit_operation("clear")
+        shapes = list(self._scene) if self._scene is not None else []
+        self._undo_stack.append(_HistoryEntry([(self._image.rect(), self._image)],
+                                              0, self._strokes, shapes))
+        self._redo_stack.clear()
+        self._limit_history()
+        if self._scene is not None:
+            self._scene.clear()
+        self._image = self._create_blank_image(self._image.width(), self._image.height())
+        self._strokes = []
+        self._index.clear()
+        self._selection = None
+        self.changed.emit(QRect())
+
+    def is_image_blank(self):
+        # Compared a band of rows at a time, not against a full-size white image
+        if self._image is None or self._image.isNull():
+            return True
+        from image_buffer import image_view
+        pixels = image_view(self._image)
+        white = self._pixel_value(Qt.white)
+        return all((pixels[y:y + 64] == white).all() for y in range(0, len(pixels), 64))
+
+    # History
+
+    def save_undo_state(self, area=None):
+        # `area` is a QRect or, for edits touching separate places, a QRegion
+        if self._image is None or self._image.isNull():
+            return
+        if area is None:
+            rects = [self._image.rect()]
+        elif isinstance(area, QRegion):
+            rects = [r.intersected(self._image.rect()) for r in area.rects()]
+        else:
+            rects = [area.intersected(self._image.rect())]
+        with self._profiler.section("save_undo_state"):
+            patches = [(rect, self._image.copy(rect)) for rect in rects if not rect.isEmpty()]
+            self._undo_stack.append(_HistoryEntry(patches, len(self._strokes), []))
+            self._redo_stack.clear()
+            self._limit_history()
+
+    def _trim_undo_patch(self, points):
+        # A pen stroke saves the whole canvas at press, before its extent is
+        # known; keep only the part the finished stroke can have touched
+        xs, ys = [p[0] for p in points], [p[1] for p in points]
+        self._crop_undo_patch(self._margin_rect(min(xs), min(ys), max(xs), max(ys))
+                              .adjusted(-1, -1, 1, 1))
+
+    def _crop_undo_patch(self, area):
+        # Shrink a whole-canvas undo patch to `area`
+        entry = self._undo_stack[-1]
+        if len(entry.patches) != 1 or entry.patches[0][0] != self._image.rect():
+            return
+        area = area.intersected(self._image.rect())
+        patches = [] if area.isEmpty() else [(area, entry.patches[0][1].copy(area))]
+        self._undo_stack[-1] = entry._replace(patches=patches)
+
+    def history_bytes(self):
+        return self._undo_stack.nbytes + self._redo_stack.nbytes
+
+    @property
+    def history_limit(self):
+        return self._history_limit
+
+    @history_limit.setter
+    def history_limit(self, limit):
+        # Bytes, or None to keep every step
+        self._history_limit = limit
+        self._limit_history()
+
+    def _limit_history(self):
+        # Drop the oldest undo steps while the history, not counting the
+        # latest step, holds more than the limit
+        if self._history_limit is None:
+            return
+        latest = _entry_bytes(self._undo_stack[-1]) if self._undo_stack else 0
+        while len(self._undo_stack) > 1 and \
+                self.history_bytes() - latest > self._history_limit:
+            self._undo_stack.pop(0)
+
+    def _restore(self, entry):
+        inverse = _HistoryEntry([(rect, self._image.copy(rect)) for rect, _ in entry.patches],
+                                entry.stroke_count, self._strokes[entry.stroke_count:],
+                                [(shape_id, self._scene.get(shape_id))
+                                 for shape_id, _ in entry.shapes])
+        painter = QPainter(self._image)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        for rect, pixels in entry.patches:
+            painter.drawImage(rect.topLeft(), pixels)
+        painter.end()
+
+        for stroke_id in range(entry.stroke_count, len(self._strokes)):
+            self._index.remove_stroke(stroke_id)
+        del self._strokes[entry.stroke_count:]
+        for stroke in entry.strokes:
+            self._strokes.append(stroke)
+            self._index.add_stroke(len(self._strokes) - 1, stroke.points, stroke.size)
+        for rect, _ in entry.patches:
+            self.changed.emit(rect)
+        for shape_id, shape in entry.shapes:
+            self.changed.emit(self._scene.set(shape_id, shape))
+        return inverse
+
+    def undo(self):
+        self._record("undo")
+        if self._fill_worker is not None and not self._queued_input:
+            # undoing the running fill: stop it, its entry is on the stack
+            self._cancel_fill()
+        if self._defer(self.undo):
+            return
+        if not self._undo_stack or self._image is None:
+            return
+        self._redo_stack.append(self._restore(self._undo_stack.pop()))
+        self._emit_operation("undo")
+
+    def redo(self):
+        self._record("redo")
+        if self._defer(self.redo):
+            return
+        if not self._redo_stack or self._image is None:
+            return
+        self._undo_stack.append(self._restore(self._redo_stack.pop()))
+        self._emit_operation("redo")
+
+    def _emit_operation(self, kind, tool=None, points=(), pressures=None):
+        # Only built when something listens, plain drawing pays nothing
+        if not self.receivers(self.operation):
+            return
+        op = {"op": kind}
+        if tool is not None:
+            op.update(tool=tool, color=self._brush_color.name(QColor.HexArgb),
+                      size=self._brush_size,
+                      points=[[round(x), round(y)] for x, y in points])
+        if pressures is not None:
+            op.update(hardness=self._brush_hardness,
+                      pressure=[round(p, 3) for p in pressures])
+        if tool == "fill" and self._fill_style != "solid":
+            op["fill"] = {"style": self._fill_style, "angle": self._gradient_angle,
+                          "color2": self._secondary_color.name(QColor.HexArgb)}
+        if self._copies is not None and tool != "fill":
+            # the copies are redrawn from the original, not sent
+            op["symmetry"] = {"mode": self._copies.mode, "count": self._copies.count,
+                              "centre": list(self._copies.centre)}
+        self.operation.emit(op)
+
+    def restore_tile(self, x, y, pixels):
+        # Put pixels from elsewhere (a peer, a journal) onto the canvas as
+        # they are, without an undo step
+        painter = QPainter(self._image)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.drawImage(x, y, pixels)
+        painter.end()
+        self.changed.emit(QRect(x, y, pixels.width(), pixels.height()))
+
+    def restore_shapes(self, shapes):
+        # Put retained shapes from elsewhere (a journal), (shape_id, Shape)
+        # pairs, into the scene as they are, without an undo step
+        if not shapes:
+            return
+        self._create_scene()
+        for shape_id, shape in shapes:
+            self.changed.emit(self._scene.set(shape_id, shape))
+
+    def restore_selection(self, selection):
+        # Put back a selection that edits from elsewhere (a peer's ops)
+        # dropped, as it was, without recording it
+        self._selection = selection
+        if selection is not None:
+            self.changed.emit(selection.preview_rect())
+
+    # Memory
+
+    @property
+    def memory(self):
+        """The MemoryTracker (memory.py) of this model.
+
+        It counts the canvas and shape layer under "images", undo and redo
+        pixels under "history" and cached pixel tables under "caches";
+        renderers and tools that hold memory of their own add sources to it,
+        like the OpenGL canvas's texture under "gl".
+        """
+        return self._memory
+
+    def memory_usage(self):
+        """Bytes held per category, {category: bytes}."""
+        return self._memory.usage()
+
+    @staticmethod
+    def _image_bytes(image):
+        return 0 if image is None else image.sizeInBytes()
+
+    # Edits from code: the drawing API and plugin tools
+
+    @property
+    def api(self):
+        """The DrawingAPI (drawing_api.py) for drawing on this model from code."""
+        if self._api is None:
+            from drawing_api import DrawingAPI
+            self._api = DrawingAPI(self)
+        return self._api
+
+    def edit(self, area, paint, strokes=()):
+        """Run `paint(painter)` on the canvas, clipped to `area`, as an undo step.
+
+        `strokes` are (tool, points, color, size) to keep for hit-testing.
+        Inside begin_edits/end_edits the edit joins the group's undo step.
+        """
+        if self._image is None or self._defer(self.edit, area, paint, strokes):
+            return
+        area = area.intersected(self._image.rect())
+        if area.isEmpty():
+            return
+        if self._edit_area is None:
+            self.save_undo_state(area)
+        else:
+            self._edit_area = self._edit_area.united(area)
+        painter = QPainter(self._image)
+        painter.setClipRect(area)
+        paint(painter)
+        painter.end()
+        for tool, points, color, size in strokes:
+            self._add_stroke(tool, points, color, size)
+        self.changed.emit(area)
+
+    def begin_edits(self):
+        # Group the edits until the matching end_edits into one undo step:
+        # the canvas is saved whole now and cropped to what they touched
+        if self._defer(self.begin_edits) or self._image is None:
+            return
+        self._edit_depth += 1
+        if self._edit_depth == 1:
+            self.save_undo_state()
+            self._edit_area = QRect()
+
+    def end_edits(self):
+        if self._defer(self.end_edits) or self._edit_depth == 0:
+            return
+        self._edit_depth -= 1
+        if self._edit_depth:
+            return
+        area, self._edit_area = self._edit_area, None
+        if area.isEmpty():
+            self._undo_stack.pop()  # nothing was drawn
+        else:
+            self._crop_undo_patch(area)
+
+    # Strokes
+
+    def _add_stroke(self, tool, points, color=None, size=None):
+        color = QColor(self._brush_color if color is None else color)
+        size = self._brush_size if size is None else size
+        self._strokes.append(Stroke(tool, points, color, size))
+        self._index.add_stroke(len(self._strokes) - 1, points, size)
+
+    def _add_pen_strokes(self, x, y):
+        # One stroke per symmetry copy, the original last; returns their starts
+        starts = [(x, y)]
+        if self._copies is not None:
+            starts = [tuple(p) for p in self._copies.points(starts)[:-1, 0].tolist()] + starts
+        for start in starts:
+            self._add_stroke("pen", [start])
+        return starts
+
+    def _extend_strokes(self, copies):
+        # Append to the last len(copies) strokes, one list of points each
+        first = len(self._strokes) - len(copies)
+        for i, points in enumerate(copies, first):
+            self._strokes[i].points.extend(points)
+            for point in points:
+                self._index.append_point(i, point)
+
+    def strokes_in_rect(self, x0, y0, x1, y1):
+        return sorted(self._index.query_rect(x0, y0, x1, y1))
+
+    def stroke_at(self, x, y, max_distance=None):
+        hit = self._index.nearest(x, y, max_distance)
+        return hit[0] if hit else None
+
+    # Tool input, in image coordinates
+
+    def _input_point(self, x, y):
+        # Tablets report sub-pixel positions. The pen and plugin tools draw
+        # with them; every other tool works on whole pixels.
+        if self._current_tool == "pen" or plugin_tool(self._current_tool) is not None:
+            return x, y
+        return round(x), round(y)
+
+    def press(self, x, y, pressure=None):
+        # pressure comes from tablets; None means a mouse
+        self._record("press", x, y, pressure)
+        if self._image is None or self._defer(self.press, x, y, pressure):
+            return
+        x, y = self._input_point(x, y)
+        self._drawing = True
+        self._start_point = QPoint(round(x), round(y))
+        self._last_point = QPoint(self._start_point)
+
+        tool = plugin_tool(self._current_tool)
+        if tool is not None:
+            # one undo step for all the tool draws until release
+            self.select_none()
+            self.begin_edits()
+            try:
+                tool.press(self.api, x, y, pressure)
+            except BaseException:
+                # the stroke never started; close its undo group
+                self._drawing = False
+                self.end_edits()
+                raise
+            return
+        if self._current_tool == "transform":
+            if self._selection is None:
+                self._selection = Selection.from_rect(QPoint(), self._image.rect().bottomRight(),
+                                                      self._image.rect())
+            pivot = self._selection.centre + QPointF(self._selection.offset)
+            self._transform_start = (QTransform(self._selection.transform),
+                                     x - pivot.x(), y - pivot.y())
+            self._moving_selection = True
+            return
+        if self._current_tool in SELECTION_TOOLS:
+            if self._selection is not None and self._selection.contains(x, y):
+                # drag the selection; nothing is copied until release
+                self._moving_selection = True
+                self._start_point -= self._selection.offset
+                return
+            self.select_none()
+            self._lasso = [(x, y)]
+            return
+        if self._current_tool == "picker":
+            self._pick(x, y)
+            return
+        self.select_none()
+
+        if self._scene is not None and self._current_tool in Scene.TOOLS:
+            handle = self._scene.handle_at(x, y)
+            if handle is not None:
+                # drag an end point of a retained shape
+                shape_id, which = handle
+                self._shape_edit = (shape_id, which, self._scene.get(shape_id))
+                return
+
+        self._copies = None
+        if self._current_tool == "pen" or (self._current_tool in Scene.TOOLS
+                                           and not self._retain_shapes):
+            self._copies = self._stroke_copies()
+        if self._current_tool == "pen" and pressure is not None:
+            from brush import BrushEngine
+            self.save_undo_state()
+            starts = self._add_pen_strokes(x, y)
+            self._simplifier = None
+            self._brush = BrushEngine(self._brush_size, self._brush_hardness, self._brush_color)
+            rect = self._brush.begin(self._image, x, y, pressure)
+            self._pressures = [pressure]
+            self._mirror_brushes = []
+            for px, py in starts[:-1]:
+                brush = BrushEngine(self._brush_size, self._brush_hardness, self._brush_color)
+                rect = rect.united(brush.begin(self._image, px, py, pressure))
+                self._mirror_brushes.append(brush)
+            self.changed.emit(rect)
+        elif self._current_tool == "pen":
+            self._brush = None
+            self.save_undo_state()
+            starts = self._add_pen_strokes(x, y)
+            painter = QPainter(self._image)
+            painter.setPen(self._pen())
+            painter.drawPoint(self._last_point)
+            if len(starts) > 1:
+                painter.drawPoints(QPolygonF([QPointF(*p) for p in starts[:-1]]))
+            painter.end()
+            if self._simplify_tolerance > 0 or self._smoothing:
+                self._simplifier = StrokeSimplifier(self._simplify_tolerance,
+                                                    smooth=self._smoothing)
+                self._simplifier.start((x, y))
+            else:
+                self._simplifier = None
+            xs, ys = [p[0] for p in starts], [p[1] for p in starts]
+            self.changed.emit(self._margin_rect(min(xs), min(ys), max(xs), max(ys)))
+
+        if self._current_tool == "fill":
+            if not self._image.rect().contains(x, y):
+                return
+            target_color = self._image.pixelColor(x, y)
+            content = self._fill_content(x, y)
+            if content is None and self._image.pixel(x, y) == self._pixel_value(self._brush_color):
+                return
+            self.save_undo_state()
+            self._emit_operation("stroke", "fill", [(x, y)])
+            if self._async_fill:
+                self._start_fill(x, y, content)
+                self._drawing = False
+                return
+            with self._profiler.section("flood_fill"):
+                if content is None:
+                    box = self.flood_fill(x, y, target_color, self._brush_color)
+                else:
+                    from fill import fill_region
+                    from image_buffer import image_array
+                    box = fill_region(image_array(self._image), x, y, content)
+            # the region is only known now; keep just its pixels for undo
+            rect = _box_rect(box)
+            self._crop_undo_patch(rect)
+            if not rect.isEmpty():
+                self.changed.emit(rect)
+
+    def _fill_content(self, x, y):
+        # Pixel generator of a gradient or pattern fill from (x, y), None
+        # for a solid fill; the pattern scale follows the brush size
+        if self._fill_style == "solid":
+            return None
+        from fill_style import styled_content
+        return styled_content(self._fill_style, (x, y), self._gradient_angle,
+                              self._brush_color.rgba(), self._secondary_color.rgba(),
+                              max(2, self._brush_size), self._format)
+
+    def color_at(self, x, y):
+        """Colour of the canvas pixel at (x, y), or None off the canvas."""
+        x, y = round(x), round(y)
+        if self._image is None or not self._image.rect().contains(x, y):
+            return None
+        return self._image.pixelColor(x, y)
+
+    def _pick(self, x, y):
+        # Eyedropper: the brush takes the colour under the pointer while dragging
+        color = self.color_at(x, y)
+        if color is not None and color != self._brush_color:
+            self.brush_color = color
+            self.color_picked.emit(color)
+
+    def _start_fill(self, x, y, content=None):
+        from fill_worker import FillWorker
+        worker = FillWorker(self._image, x, y, self._pixel_value(self._brush_color), self,
+                            content)
+        worker.band_ready.connect(lambda rect, w=worker: self._on_fill_band(w, rect),
+                                  Qt.QueuedConnection)
+        worker.fill_done.connect(lambda rect, w=worker: self._on_fill_done(w, rect),
+                                 Qt.QueuedConnection)
+        self._fill_worker = worker
+        self._fill_started = time.perf_counter()
+        worker.start()
+
+    def _copy_from_fill(self, worker, rect):
+        painter = QPainter(self._image)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.drawImage(rect, worker.result, rect)
+        painter.end()
+        self.changed.emit(rect)
+
+    def _on_fill_band(self, worker, rect):
+        if worker is self._fill_worker and not worker.is_cancelled():
+            self._copy_from_fill(worker, rect)
+
+    def _on_fill_done(self, worker, rect):
+        worker.wait()
+        worker.deleteLater()
+        if worker is not self._fill_worker:
+            return
+        if not rect.isNull():
+            self._copy_from_fill(worker, rect)
+        self._crop_undo_patch(rect)  # the fill's entry is still on top, input waited
+        self._profiler.histogram("flood_fill").add(time.perf_counter() - self._fill_started)
+        self._fill_worker = None
+        self._drain_queue()
+
+    def _cancel_fill(self):
+        worker = self._fill_worker
+        worker.cancel()
+        worker.wait()
+        self._fill_worker = None
+
+    def move(self, x, y, pressure=None):
+        if not (self._drawing or self._queued_input):
+            return
+        self._record("move", x, y, pressure)
+        if self._defer(self.move, x, y, pressure):
+            return
+        x, y = self._input_point(x, y)
+        if self._current_tool in SELECTION_TOOLS:
+            self._move_selection(x, y)
+        elif self._shape_edit is not None:
+            self._edit_shape_point(x, y)
+        elif self._current_tool == "picker":
+            self._pick(x, y)
+        elif plugin_tool(self._current_tool) is not None:
+            plugin_tool(self._current_tool).move(self.api, x, y, pressure)
+        elif self._current_tool == "pen" and self._brush is not None:
+            # only the dabs between the last and the new point are rasterized
+            pressure = 1.0 if pressure is None else pressure
+            rect = self._brush.stroke_to(self._image, x, y, pressure)
+            self._pressures.append(pressure)
+            points = [(x, y)]
+            if self._mirror_brushes:
+                points = [tuple(p) for p in self._copies.points(points)[:-1, 0].tolist()] + points
+                for brush, (px, py) in zip(self._mirror_brushes, points):
+                    rect = rect.united(brush.stroke_to(self._image, px, py, pressure))
+            self.changed.emit(rect)
+            self._extend_strokes([[point] for point in points])
+            self._last_point = QPoint(round(x), round(y))
+        elif self._current_tool == "pen":
+            if self._simplifier is not None:
+                self._draw_pen_points(self._simplifier.add((x, y)))
+                # the pending tail is only a preview, repaint where it was and is
+                tail = self._margin_rect(*self._strokes[-1].points[-1], x, y)
+                if self._copies is not None:
+                    tail = self._copies.map_rect(tail).intersected(self._image.rect())
+                self.changed.emit(tail.united(self._tail_rect))
+                self._tail_rect = tail
+            else:
+                self._draw_pen_points([(x, y)])
+        else:
+            previous = self._preview_rect()
+            self._last_point = QPoint(x, y)
+            if self._current_tool in Scene.TOOLS:
+                # only the preview moved; the canvas pixels are unchanged
+                self.changed.emit(previous.united(self._preview_rect()))
+
+    def release(self, x, y, pressure=None):
+        if not (self._drawing or self._queued_input):
+            return
+        self._record("release", x, y, pressure)
+        if self._defer(self.release, x, y, pressure):
+            return
+        x, y = self._input_point(x, y)
+        end = QPoint(round(x), round(y))
+        if self._current_tool in SELECTION_TOOLS:
+            self._move_selection(x, y)
+            self._release_selection()
+            self._drawing = False
+            return
+        if self._current_tool == "picker":
+            self._drawing = False
+            return
+        tool = plugin_tool(self._current_tool)
+        if tool is not None:
+            try:
+                tool.release(self.api, x, y, pressure)
+            finally:
+                self._drawing = False
+                self.end_edits()
+            return
+        if self._shape_edit is not None:
+            self._edit_shape_point(x, y)
+            shape_id, _, original = self._shape_edit
+            self._undo_stack.append(_HistoryEntry([], len(self._strokes), [],
+                                                  [(shape_id, original)]))
+            self._redo_stack.clear()
+            self._shape_edit = None
+            self._drawing = False
+            return
+        if self._current_tool == "pen":
+            pressures = None
+            if self._brush is not None:
+                pressures, self._pressures = self._pressures, []
+                self._brush.end()
+                for brush in self._mirror_brushes:
+                    brush.end()
+                self._brush = None
+                self._mirror_brushes = []
+            if self._simplifier is not None:
+                self._draw_pen_points(self._simplifier.finish())
+                self.stroke_simplified.emit(self._simplifier.input_count,
+                                            self._simplifier.output_count)
+                self._simplifier = None
+                self.changed.emit(self._tail_rect)
+                self._tail_rect = QRect()
+            self._drawing = False
+            copies = 1 if self._copies is None else len(self._copies)
+            self._trim_undo_patch([p for stroke in self._strokes[-copies:] for p in stroke.points])
+            # sent whole once committed, with the pressures a tablet gave
+            self._emit_operation("stroke", "pen", self._strokes[-1].points, pressures)
+            self._copies = None
+            return
+        self._drawing = False
+        if self._current_tool != "fill":
+            self._emit_operation("stroke", self._current_tool,
+                                 [(self._start_point.x(), self._start_point.y()), (end.x(), end.y())])
+            self.draw_shape(self._current_tool, self._start_point, end)
+            self.changed.emit(self._preview_rect())
+        self._copies = None
+
+    def _draw_pen_points(self, points):
+        if not points:
+            return
+        if self._copies is not None:
+            self._draw_pen_copies(points)
+            return
+        painter = QPainter(self._image)
+        painter.setPen(self._pen())
+        stroke = self._strokes[-1]
+        last = first = stroke.points[-1]
+        for point in points:
+            painter.drawLine(QPointF(*last), QPointF(*point))
+            stroke.points.append(point)
+            self._index.append_point(len(self._strokes) - 1, point)
+            last = point
+        painter.end()
+        self._last_point = QPoint(round(last[0]), round(last[1]))
+        xs = [first[0]] + [p[0] for p in points]
+        ys = [first[1]] + [p[1] for p in points]
+        self.changed.emit(self._margin_rect(min(xs), min(ys), max(xs), max(ys)))
+
+    def _draw_pen_copies(self, points):
+        # All symmetry copies of the new segments are mapped in one NumPy
+        # step and painted by one drawLines call, under one dirty rect
+        copies, lines = self._copies.lines([self._strokes[-1].points[-1]] + points)
+        painter = QPainter(self._image)
+        painter.setPen(self._pen())
+        painter.drawLines(lines)
+        painter.end()
+        mirrored = [[tuple(p) for p in copy[1:]] for copy in copies[:-1].tolist()]
+        self._extend_strokes(mirrored + [list(points)])
+        last = points[-1]
+        self._last_point = QPoint(round(last[0]), round(last[1]))
+        (x0, y0), (x1, y1) = copies.min(axis=(0, 1)).tolist(), copies.max(axis=(0, 1)).tolist()
+        self.changed.emit(self._margin_rect(x0, y0, x1, y1))
+
+    def _preview_rect(self):
+        # Area of the shape preview between the press and the last point
+        if self._current_tool not in Scene.TOOLS:
+            return QRect()
+        rect = shape_bounds(self._current_tool,
+                            (self._start_point.x(), self._start_point.y()),
+                            (self._last_point.x(), self._last_point.y()),
+                            self._brush_size)
+        if self._copies is not None:
+            rect = self._copies.map_rect(rect)
+        return rect.intersected(self._image.rect())
+
+    def draw_shape(self, tool, start, end):
+        if self._retain_shapes:
+            self.add_shape(tool, start, end)
+            return
+        copies = self._copies
+        rect = shape_bounds(tool, (start.x(), start.y()), (end.x(), end.y()), self._brush_size)
+        if copies is not None:
+            rect = copies.map_rect(rect)
+        rect = rect.intersected(self._image.rect())
+        self.save_undo_state(rect)
+
+        painter = QPainter(self._image)
+        painter.setPen(self._pen())
+        if copies is None:
+            self._paint_shape(painter, tool, start, end)
+        else:
+            for transform in copies.transforms:
+                painter.setTransform(transform)
+                self._paint_shape(painter, tool, start, end)
+        painter.end()
+
+        outline = shape_outline(tool, (start.x(), start.y()), (end.x(), end.y()))
+        if copies is not None:
+            for copy in copies.points(outline)[:-1].tolist():
+                self._add_stroke(tool, [tuple(p) for p in copy])
+        self._add_stroke(tool, outline)
+        self.changed.emit(rect)
+
+    def _paint_shape(self, painter, tool, start, end):
+        if tool == "rectangle":
+            painter.drawRect(QRect(start, end))
+        elif tool == "ellipse":
+            painter.drawEllipse(QRect(start, end))
+        elif tool == "line":
+            painter.drawLine(start, end)
+        elif tool == "circle":
+            r = int(((end.x() - start.x())**2 + (end.y() - start.y())**2) ** 0.5) // 2
+            xc = (start.x() + end.x()) // 2
+            yc = (start.y() + end.y()) // 2
+            self.preview_draw_circle_midpoint(painter, xc, yc, r)
+
+    # Retained shapes
+
+    def _paint_retained(self, painter, shape):
+        self._paint_shape(painter, shape.tool, QPoint(*shape.start), QPoint(*shape.end))
+
+    def add_shape(self, tool, start, end):
+        shape = Shape(tool, (start.x(), start.y()), (end.x(), end.y()),
+                      QColor(self._brush_color), self._brush_size)
+        shape_id = self._scene.add(shape)
+        self._undo_stack.append(_HistoryEntry([], len(self._strokes), [], [(shape_id, None)]))
+        self._redo_stack.clear()
+        self.changed.emit(shape.bounds)
+        return shape_id
+
+    def edit_shape(self, shape_id, start=None, end=None):
+        """Move the end points of a retained shape, as one undo step.
+
+        Only the old and new bounds of the shape are re-rasterized.
+        """
+        self._record("edit_shape", shape_id, start, end)
+        original = None if self._scene is None else self._scene.get(shape_id)
+        if original is None or self._defer(self.edit_shape, shape_id, start, end):
+            return
+        shape = original._replace(start=original.start if start is None else start,
+                                  end=original.end if end is None else end)
+        self._undo_stack.append(_HistoryEntry([], len(self._strokes), [], [(shape_id, original)]))
+        self._redo_stack.clear()
+        self.changed.emit(self._scene.set(shape_id, shape))
+
+    def _edit_shape_point(self, x, y):
+        shape_id, which, _ = self._shape_edit
+        shape = self._scene.get(shape_id)._replace(**{which: (round(x), round(y))})
+        self.changed.emit(self._scene.set(shape_id, shape))
+
+    def flatten_shapes(self):
+        # Burn the retained shapes into the pixels, as one undo step
+        self._record("flatten")
+        if self._scene is None or not len(self._scene) or self._defer(self.flatten_shapes):
+            return
+        area = QRect()
+        for _, shape in self._scene:
+            area = area.united(shape.bounds)
+        area = area.intersected(self._image.rect())
+        self._undo_stack.append(_HistoryEntry([(area, self._image.copy(area))], len(self._strokes),
+                                              [], list(self._scene)))
+        self._redo_stack.clear()
+        self._limit_history()
+        painter = QPainter(self._image)
+        painter.drawImage(area.topLeft(), self._scene.layer, area)
+        painter.end()
+        self._scene.clear()
+        self.changed.emit(area)
+
+    def draw_scene(self, painter, rect):
+        # Retained shapes over the canvas, for the part of it being painted
+        if self._scene is not None and len(self._scene):
+            painter.drawImage(rect, self._scene.layer, rect)
+
+    # Previews of the shape being dragged, drawn over the image by the views
+
+    def draw_preview(self, painter):
+        if self._selection is not None:
+            self._selection.draw(painter, self._image)
+        if not self._drawing or self._shape_edit is not None:
+            return
+        painter.setPen(self._pen())
+        if self._current_tool in SELECTION_TOOLS and not self._moving_selection:
+            painter.setPen(QPen(Qt.black, 1, Qt.DashLine))
+            if self._current_tool == "select":
+                painter.drawRect(QRect(self._start_point, self._last_point).normalized())
+            else:
+                painter.drawPolyline(QPolygonF([QPointF(*p) for p in self._lasso]))
+        elif self._copies is not None:
+            for transform in self._copies.transforms:
+                painter.save()
+                painter.setTransform(transform, True)
+                self._draw_tool_preview(painter)
+                painter.restore()
+        else:
+            self._draw_tool_preview(painter)
+
+    def _draw_tool_preview(self, painter):
+        tool = plugin_tool(self._current_tool)
+        if tool is not None:
+            tool.draw_preview(self.api, painter)
+        elif self._current_tool == "pen":
+            if self._simplifier is not None:
+                # input still held back by the simplifier, drawn but not committed
+                painter.drawLine(QPointF(*self._strokes[-1].points[-1]),
+                                 QPointF(*self._simplifier.last_point))
+        elif self._current_tool == "rectangle":
+            self.preview_draw_rectangle(painter,
+                                        self._start_point.x(), self._start_point.y(),
+                                        self._last_point.x(), self._last_point.y())
+        elif self._current_tool == "ellipse":
+            xc = (self._start_point.x() + self._last_point.x()) // 2
+            yc = (self._start_point.y() + self._last_point.y()) // 2
+            rx = abs(self._last_point.x() - self._start_point.x()) // 2
+            ry = abs(self._last_point.y() - self._start_point.y()) // 2
+            self.preview_draw_ellipse_midpoint(painter, xc, yc, rx, ry)
+        elif self._current_tool == "line":
+            self.preview_draw_line_midpoint(painter,
+                                            self._start_point.x(), self._start_point.y(),
+                                            self._last_point.x(), self._last_point.y())
+        elif self._current_tool == "circle":
+            xc = (self._start_point.x() + self._last_point.x()) // 2
+            yc = (self._start_point.y() + self._last_point.y()) // 2
+            r = int((abs(self._last_point.x() - self._start_point.x())**2 +
+                    abs(self._last_point.y() - self._start_point.y())**2) ** 0.5) // 2
+            self.preview_draw_circle_midpoint(painter, xc, yc, r)
+
+    def preview_draw_line_midpoint(self, painter, x0, y0, x1, y1):
+        dx = abs(x1 - x0)
+        dy = abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx - dy
+        while True:
+            painter.drawPoint(x0, y0)
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 > -dy:
+                err -= dy
+                x0 += sx
+            if e2 < dx:
+                err += dx
+                y0 += sy
+
+    def preview_draw_circle_midpoint(self, painter, xc, yc, r):
+        if r <= 0:
+            return
+
+        x = 0
+        y = r
+        d = 1 - r
+
+        self._draw_circle_points(painter, xc, yc, x, y)
+
+        while x < y:
+            x += 1
+            if d < 0:
+                d += 2 * x + 1
+            else:
+                y -= 1
+                d += 2 * (x - y) + 1
+            self._draw_circle_points(painter, xc, yc, x, y)
+
+    def _draw_circle_points(self, painter, xc, yc, x, y):
+        painter.drawPoint(xc + x, yc + y)
+        painter.drawPoint(xc - x, yc + y)
+        painter.drawPoint(xc + x, yc - y)
+        painter.drawPoint(xc - x, yc - y)
+        painter.drawPoint(xc + y, yc + x)
+        painter.drawPoint(xc - y, yc + x)
+        painter.drawPoint(xc + y, yc - x)
+        painter.drawPoint(xc - y, yc - x)
+
+    def preview_draw_ellipse_midpoint(self, painter, xc, yc, rx, ry):
+        if rx <= 0 or ry <= 0:
+            return
+
+        x, y = 0, ry
+        rx2, ry2 = rx * rx, ry * ry
+        two_rx2 = 2 * rx2
+        two_ry2 = 2 * ry2
+
+        # Region 1
+        p = (ry2 - (rx2 * ry) + (rx2 // 4))  # Scaled by 4 to avoid floats
+        while (two_ry2 * x) <= (two_rx2 * y):
+            painter.drawPoint(xc + x, yc + y)
+            painter.drawPoint(xc - x, yc + y)
+            painter.drawPoint(xc + x, yc - y)
+            painter.drawPoint(xc - x, yc - y)
+            x += 1
+            if p < 0:
+                p += two_ry2 * x + ry2
+            else:
+                y -= 1
+                p += two_ry2 * x - two_rx2 * y + ry2
+
+        # Region 2
+        p = (ry2 * (x + 0.5)**2 + rx2 * (y - 1)**2 - rx2 * ry2)
+        while y >= 0:
+            painter.drawPoint(xc + x, yc + y)
+            painter.drawPoint(xc - x, yc + y)
+            painter.drawPoint(xc + x, yc - y)
+            painter.drawPoint(xc - x, yc - y)
+            y -= 1
+            if p > 0:
+                p -= two_rx2 * y + rx2
+            else:
+                x += 1
+                p += two_ry2 * x - two_rx2 * y + rx2
+
+    def preview_draw_rectangle(self, painter, x0, y0, x1, y1):
+        x_min, x_max = min(x0, x1), max(x0, x1)
+        y_min, y_max = min(y0, y1), max(y0, y1)
+        # Draw the top and bottom borders
+        for x in range(x_min, x_max + 1):
+            painter.drawPoint(x, y_min)
+            painter.drawPoint(x, y_max)
+        # Draw the left and right borders
+        for y in range(y_min, y_max + 1):
+            painter.drawPoint(x_min, y)
+            painter.drawPoint(x_max, y)
+
+    def flood_fill(self, x, y, target_color, replacement_color):
+        # Returns the filled box like fill.flood_fill_array, or None
+        if target_color == replacement_color:
+            return None
+
+        # quick escape if clicked pixel doesn’t match target
+        if self._image.pixel(x, y) != self._pixel_value(target_color):
+            return None
+
+        from fill import flood_fill_array
+        from image_buffer import image_array
+        pixels = image_array(self._image)
+        return flood_fill_array(pixels, x, y, self._pixel_value(replacement_color))
+
+    # Selection
+
+    def _selection_drag_rect(self):
+        if self._current_tool == "select":
+            rect = QRect(self._start_point, self._last_point).normalized()
+        else:
+            xs = [p[0] for p in self._lasso]
+            ys = [p[1] for p in self._lasso]
+            rect = QRect(QPoint(int(min(xs)), int(min(ys))), QPoint(int(max(xs)), int(max(ys))))
+        return rect.adjusted(-2, -2, 2, 2)
+
+    def _move_selection(self, x, y):
+        point = QPoint(round(x), round(y))
+        if self._current_tool == "transform":
+            # rotate and scale by how the grab point turned around the centre
+            base, dx0, dy0 = self._transform_start
+            pivot = self._selection.centre + QPointF(self._selection.offset)
+            dx, dy = x - pivot.x(), y - pivot.y()
+            before = self._selection.preview_rect()
+            extra = QTransform()
+            if math.hypot(dx0, dy0) >= 4:
+                extra.rotate(math.degrees(math.atan2(dy, dx) - math.atan2(dy0, dx0)))
+                scale = max(math.hypot(dx, dy), 1) / math.hypot(dx0, dy0)
+                extra.scale(scale, scale)
+            self._selection.transform = base * extra
+            self.changed.emit(before.united(self._selection.preview_rect()))
+            return
+        if self._moving_selection:
+            before = self._selection.preview_rect()
+            self._selection.offset = point - self._start_point
+            self.changed.emit(before.united(self._selection.preview_rect()))
+            return
+        before = self._selection_drag_rect()
+        self._last_point = point
+        if self._current_tool == "lasso":
+            self._lasso.append((x, y))
+        self.changed.emit(before.united(self._selection_drag_rect()))
+
+    def _release_selection(self):
+        if self._moving_selection:
+            self._moving_selection = False
+            if self._selection.is_moved():
+                self.commit_selection_move()
+            return
+        self.changed.emit(self._selection_drag_rect())
+        if self._current_tool == "select":
+            selection = Selection.from_rect(self._start_point, self._last_point, self._image.rect())
+        else:
+            selection = Selection.from_points(self._lasso, self._image.rect())
+        self._lasso = []
+        if not selection.is_empty():
+            self._selection = selection
+            self.changed.emit(selection.preview_rect())
+
+    def commit_selection_move(self):
+        """Write a dragged selection to where it was dropped, as one undo step.
+
+        Only the source and destination rectangles are saved for undo and
+        repainted, however far apart they are. A rotated or scaled selection
+        is resampled at full quality first, on the thread pool when
+        async_transform is set; the preview stays up until it is done.
+        """
+        selection = self._selection
+        lifted = selection.lift(self._image)  # the canvas changes under the view now
+        if selection.transform.isIdentity():
+            self._place_selection(selection, lifted)
+            return
+        from transform import ResampleJob, resample
+        if not self._async_transform:
+            self._place_selection(selection, resample(lifted, selection.transform))
+            return
+        job = ResampleJob(lifted, selection.transform)
+        job.setAutoDelete(False)
+        job.signals.done.connect(lambda image, j=job: self._on_resampled(j, selection, image),
+                                 Qt.QueuedConnection)
+        self._resample_job = job
+        QThreadPool.globalInstance().start(job)
+
+    def _on_resampled(self, job, selection, image):
+        if job is not self._resample_job:
+            return
+        self._resample_job = None
+        self._place_selection(selection, image)
+        self._drain_queue()
+
+    def _place_selection(self, selection, pixels):
+        target = selection.target_rect.intersected(self._image.rect())
+        self.save_undo_state(QRegion(selection.rect).united(QRegion(target)))
+        self._carry_strokes(selection, selection.matrix())
+        painter = QPainter(self._image)
+        painter.fillPath(selection.path, Qt.white)
+        if selection.transform.isIdentity():
+            painter.setClipPath(selection.target_path)
+        painter.drawImage(selection.target_rect.topLeft(), pixels)
+        painter.end()
+        if self._selection is selection:
+            self._selection = selection.moved(self._image.rect())
+        self.changed.emit(selection.preview_rect())
+
+    def flip_selection(self, horizontal=True):
+        self._record("flip", horizontal)
+        from transform import flipped
+        self._rearrange(lambda pixels: flipped(pixels, horizontal),
+                        QTransform.fromScale(-1, 1) if horizontal else QTransform.fromScale(1, -1))
+
+    def rotate_selection(self, turns=1):
+        # quarter turns clockwise, of the selection or the whole canvas
+        self._record("rotate", turns)
+        from transform import rotated90
+        self._rearrange(lambda pixels: rotated90(pixels, turns), QTransform().rotate(90 * turns))
+
+    def _rearrange(self, view, transform):
+        # Flips and quarter turns need no resampling. A rectangle that maps
+        # onto itself is rewritten in place from a NumPy view of itself.
+        if self._image is None or self._defer(self._rearrange, view, transform):
+            return
+        from image_buffer import image_array
+        from transform import array_image
+        selection = self._selection
+        if selection is None:
+            selection = Selection.from_rect(QPoint(), self._image.rect().bottomRight(),
+                                            self._image.rect())
+        selection.transform = transform
+        rect = selection.rect
+        if selection.is_rect and (rect.width() == rect.height() or transform.m12() == 0):
+            self.save_undo_state(rect)
+            self._carry_strokes(selection, selection.matrix())
+            region = image_array(self._image)[rect.top():rect.bottom() + 1,
+                                              rect.left():rect.right() + 1]
+            region[...] = view(region)  # NumPy buffers the overlapping copy
+            self.changed.emit(rect)
+        else:
+            lifted = selection.lift(self._image)
+            self._place_selection(selection, array_image(view(image_array(lifted)),
+                                                         lifted.format()))
+        if self._selection is selection:
+            self._selection = selection.moved(self._image.rect())
+
+    def _carry_strokes(self, selection, matrix=None):
+        # Keep the stroke list, which hit-testing and vector export use, in
+        # step with pixels moved or deleted through a selection. The parts
+        # of strokes inside it are mapped through `matrix` and go on top,
+        # or are dropped without one; parts of other strokes under where
+        # they land are dropped, as the moved pixels cover them. Strokes
+        # are cut at their last point on either side of the outline. The
+        # undo entry just saved gets the old strokes back.
+        source = selection.path
+        target = None if matrix is None else matrix.map(source)
+        area = source.boundingRect() if target is None \
+            else source.boundingRect().united(target.boundingRect())
+        hits = self._index.query_rect(area.left(), area.top(), area.right(), area.bottom())
+        if not hits:
+            return
+        first = min(hits)
+        old = self._strokes[first:]
+        kept, moved = [], []
+        for stroke_id, stroke in enumerate(old, first):
+            if stroke_id not in hits:
+                kept.append(stroke)
+                continue
+            for inside, points in _split_points(stroke.points, source):
+                if not inside:
+                    if target is None:
+                        kept.append(stroke._replace(points=points))
+                    else:
+                        kept.extend(stroke._replace(points=part)
+                                    for covered, part in _split_points(points, target)
+                                    if not covered)
+                elif matrix is not None:
+                    mapped = [matrix.map(QPointF(x, y)) for x, y in points]
+                    moved.append(stroke._replace(points=[(p.x(), p.y()) for p in mapped]))
+        for stroke_id in range(first, len(self._strokes)):
+            self._index.remove_stroke(stroke_id)
+        del self._strokes[first:]
+        for stroke in kept + moved:
+            self._add_stroke(stroke.tool, stroke.points, stroke.color, stroke.size)
+        self._undo_stack[-1] = self._undo_stack[-1]._replace(stroke_count=first, strokes=old)
+
+    def select_none(self):
+        if self._selection is None:
+            return
+        self._record("select_none")
+        self.changed.emit(self._selection.preview_rect())
+        self._selection = None
+
+    def copy_selection(self):
+        # Selected pixels, transparent outside a lasso, or a null image
+        if self._selection is None:
+            return QImage()
+        return self._selection.lift(self._image)
+
+    def delete_selection(self):
+        self._record("delete")
+        if self._selection is None or self._defer(self.delete_selection):
+            return
+        self.save_undo_state(self._selection.rect)
+        self._carry_strokes(self._selection)
+        painter = QPainter(self._image)
+        painter.fillPath(self._selection.path, Qt.white)
+        painter.end()
+        self.changed.emit(self._selection.preview_rect())
+
+    # Image import
+
+    def import_image(self, source, mode="fit"):
+        """Decode a file path, encoded bytes or a QImage and paste it.
+
+        Decoding and scaling to the canvas size happen on the global thread
+        pool; the image is pasted, centred and undoable, once it is ready.
+        `mode` "cover" crops the source to the canvas aspect ratio instead of
+        fitting it whole.
+        """
+        if self._image is None:
+            return
+        from image_io import ImageLoader
+        loader = ImageLoader(source, self._image.size(), self._image.format(), mode)
+        loader.setAutoDelete(False)
+        self._loaders.add(loader)
+        loader.signals.loaded.connect(lambda image, l=loader: self._on_image_loaded(l, image),
+                                      Qt.QueuedConnection)
+        loader.signals.failed.connect(lambda error, l=loader: self._on_image_failed(l, error),
+                                      Qt.QueuedConnection)
+        QThreadPool.globalInstance().start(loader)
+
+    def _on_image_loaded(self, loader, image):
+        self._loaders.discard(loader)
+        self.paste_image(image)
+
+    def _on_image_failed(self, loader, error):
+        self._loaders.discard(loader)
+        self.import_failed.emit(error)
+
+    def paste_image(self, image):
+        if self._image is None:
+            return
+        if image.format() != self._image.format():
+            image = image.convertToFormat(self._image.format())
+        # recorded decoded, as a replay can not count on the source or on
+        # when decoding finishes
+        self._record("paste", image)
+        if self._defer(self.paste_image, image):
+            return
+        rect = QRect(QPoint((self._image.width() - image.width()) // 2,
+                            (self._image.height() - image.height()) // 2), image.size())
+        rect = rect.intersected(self._image.rect())
+        if rect.isEmpty():
+            return
+        self.save_undo_state(rect)
+        painter = QPainter(self._image)
+        painter.drawImage(rect.topLeft(), image)
+        painter.end()
+        # select what was pasted so it can be moved straight away
+        self.select_none()
+        self._selection = Selection.from_rect(rect.topLeft(), rect.bottomRight(),
+                                              self._image.rect())
+        self.changed.emit(self._selection.preview_rect())
+
+    def export_image(self, image_format=QImage.Format_ARGB32):
+        # Copy in a straight (non-premultiplied) format for files and other
+        # programs; the only conversion on the way out
+        if self._image is None:
+            return QImage()
+        if self._scene is not None and len(self._scene):
+            image = self._image.copy()
+            painter = QPainter(image)
+            self.draw_scene(painter, image.rect())
+            painter.end()
+            return image.convertToFormat(image_format)
+        return self._image.convertToFormat(image_format)
+
+    def save(self, path, fmt="PNG"):
+        if self._image is None or self._image.isNull():
+            return False
+        return self.export_image().save(path, fmt)
+
+    @property
+    def brush_color(self):
+        return self._brush_color
+
+    @brush_color.setter
+    def brush_color(self, color):
+        self._brush_color = QColor(color)
+        self._record("color", self._brush_color)
+
+    @property
+    def brush_size(self):
+        return self._brush_size
+
+    @brush_size.setter
+    def brush_size(self, size):
+        self._brush_size = size
+        self._record("size", size)
+
+    @property
+    def current_tool(self):
+        return self._current_tool
+
+    @current_tool.setter
+    def current_tool(self, tool):
+        self._record("tool", tool)
+        if tool not in SELECTION_TOOLS:
+            self.select_none()
+        self._current_tool = tool
+
+    @property
+    def brush_hardness(self):
+        return self._brush_hardness
+
+    @brush_hardness.setter
+    def brush_hardness(self, hardness):
+        self._brush_hardness = hardness
+        self._record("hardness", hardness)
+
+    @property
+    def simplify_tolerance(self):
+        return self._simplify_tolerance
+
+    @simplify_tolerance.setter
+    def simplify_tolerance(self, tolerance):
+        self._simplify_tolerance = tolerance
+        self._record("simplify", tolerance)
+
+    @property
+    def smoothing(self):
+        return self._smoothing
+
+    @smoothing.setter
+    def smoothing(self, enabled):
+        self._smoothing = enabled
+        self._record("smoothing", enabled)
+
+    @property
+    def secondary_color(self):
+        return self._secondary_color
+
+    @secondary_color.setter
+    def secondary_color(self, color):
+        self._secondary_color = QColor(color)
+        self._record("secondary_color", self._secondary_color)
+
+    @property
+    def fill_style(self):
+        # "solid" floods with the brush colour; gradients blend from it to the
+        # secondary colour, patterns draw it on the secondary colour
+        return self._fill_style
+
+    @fill_style.setter
+    def fill_style(self, style):
+        if style not in FILL_STYLES:
+            raise ValueError(f"unknown fill style {style!r}")
+        self._fill_style = style
+        self._record("fill_style", style, self._gradient_angle)
+
+    @property
+    def gradient_angle(self):
+        # direction of linear gradients, degrees clockwise from left to right
+        return self._gradient_angle
+
+    @gradient_angle.setter
+    def gradient_angle(self, angle):
+        self._gradient_angle = float(angle)
+        self._record("fill_style", self._fill_style, self._gradient_angle)
+
+    # Symmetry: pen strokes and burnt-in shapes are drawn with mirrored or
+    # rotated copies about the centre; see symmetry.py
+
+    @property
+    def symmetry(self):
+        return self._symmetry
+
+    @symmetry.setter
+    def symmetry(self, mode):
+        if mode not in SYMMETRY_MODES:
+            raise ValueError(f"unknown symmetry mode {mode!r}")
+        self._symmetry = mode
+        self._record("symmetry", mode, self._symmetry_count)
+
+    @property
+    def symmetry_count(self):
+        # copies of the radial and kaleidoscope modes
+        return self._symmetry_count
+
+    @symmetry_count.setter
+    def symmetry_count(self, count):
+        if count < 2:
+            raise ValueError(f"symmetry count must be at least 2, got {count}")
+        self._symmetry_count = count
+        self._record("symmetry", self._symmetry, count)
+
+    @property
+    def symmetry_centre(self):
+        return self._symmetry_centre
+
+    @symmetry_centre.setter
+    def symmetry_centre(self, centre):
+        self._symmetry_centre = None if centre is None else QPointF(centre)
+        self._record("symmetry_centre", self._symmetry_centre)
+
+    def _stroke_copies(self):
+        # The copies a stroke starting now is drawn with, fixed until release
+        if self._symmetry == "none":
+            return None
+        from symmetry import Symmetry
+        centre = self._symmetry_centre
+        if centre is None:
+            centre = QPointF(self._image.width() / 2, self._image.height() / 2)
+        return Symmetry(self._symmetry, self._symmetry_count, (centre.x(), centre.y()))
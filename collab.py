@@ -0,0 +1,721 @@
+import argparse
+import asyncio
+import json
+import struct
+import threading
+import zlib
+
+from PyQt5.QtGui import QImage
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QObject, QRect, QTimer, Qt, pyqtSignal
+
+from batch_render import apply_op
+from canvas_model import CanvasModel
+
+# Collaborative drawing. Clients send the edits they make as batch_render
+# script ops, never pixels. A SyncServer numbers every op as it arrives,
+# logs it and sends it to every client, the one that drew it included, so
+# all of them apply the same ops in the same order. Undo and redo act on
+# the ops of their author only: the server resolves each to the sequence
+# number of the op it takes back or puts back, at most `history` ops back.
+# Every `snapshot_every` ops the server folds the older part of the log
+# into its model and encodes that as PNG tiles, so a late joiner gets the
+# tiles plus the log suffix instead of the whole history.
+#
+# Wire format: frames of a ">IBB" header (payload length, kind, flags) and
+# a payload. OPS payloads are JSON lists of ops whose points are delta
+# encoded, zlib compressed once they are big enough to gain from it.
+#   HELLO   JSON {"width", "height", "seq", "author", "history"}, first
+#           frame from the server
+#   OPS     ops, in both directions; from the server prefixed by ">II",
+#           the sequence number of the first op and the author's number,
+#           with undo and redo ops given a "target" sequence number
+#   TILE    ">IIII" x, y, width, height then PNG data, server to client
+#   SYNCED  empty, the snapshot and log suffix are complete
+#
+# Addresses are "host:port" for TCP or "unix:/path/to/socket".
+
+HELLO, OPS, TILE, SYNCED = 1, 2, 3, 4
+FLAG_ZLIB = 1
+COMPRESS_MIN = 256  # bytes; smaller payloads go out as they are
+MAX_FRAME = 64 * 2**20
+
+_HEADER = struct.Struct(">IBB")
+_TILE = struct.Struct(">IIII")
+_SEQUENCED = struct.Struct(">II")  # first sequence number, author
+
+# Ops that only move other ops between done and undone
+_HISTORY_OPS = ("undo", "redo")
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+def parse_address(address):
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"expected host:port or unix:PATH, got {address!r}")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+async def open_connection(address):
+    family, where = parse_address(address)
+    if family == "unix":
+        return await asyncio.open_unix_connection(where)
+    return await asyncio.open_connection(*where)
+
+
+async def start_server(handler, address):
+    family, where = parse_address(address)
+    if family == "unix":
+        return await asyncio.start_unix_server(handler, where)
+    return await asyncio.start_server(handler, *where)
+
+
+# Frames
+
+def _encode_points(points):
+    # [[x0, y0], [x1, y1], ...] -> [x0, y0, dx1, dy1, ...]; pen strokes move
+    # a few pixels per point, so the deltas are short and repeat a lot
+    flat = []
+    px = py = 0
+    for x, y in points:
+        flat += (x - px, y - py)
+        px, py = x, y
+    return flat
+
+
+def _decode_points(flat):
+    points = []
+    x = y = 0
+    for i in range(0, len(flat) - 1, 2):
+        x += flat[i]
+        y += flat[i + 1]
+        points.append([x, y])
+    return points
+
+
+def pack_ops(ops):
+    """Payload and flags of an OPS frame carrying `ops`."""
+    packed = []
+    for op in ops:
+        if "points" in op:
+            op = dict(op)
+            op["d"] = _encode_points(op.pop("points"))
+        packed.append(op)
+    payload = json.dumps(packed, separators=(",", ":")).encode("utf-8")
+    if len(payload) >= COMPRESS_MIN:
+        return zlib.compress(payload, 6), FLAG_ZLIB
+    return payload, 0
+
+
+def unpack_ops(payload, flags):
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    ops = json.loads(payload)
+    for op in ops:
+        if "d" in op:
+            op["points"] = _decode_points(op.pop("d"))
+    return ops
+
+
+def frame(kind, payload=b"", flags=0):
+    return _HEADER.pack(len(payload), kind, flags) + payload
+
+
+async def read_frame(reader):
+    """(kind, flags, payload) of the next frame, None at end of stream."""
+    try:
+        header = await reader.readexactly(_HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    length, kind, flags = _HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ProtocolError(f"frame of {length} bytes exceeds the limit")
+    return kind, flags, await reader.readexactly(length)
+
+
+def encode_tiles(image, tile_size=256, blank=0xffffffff):
+    """TILE payloads of every tile of `image` that is not all `blank`."""
+    from image_buffer import image_array
+    pixels = image_array(image)
+    tiles = []
+    for y in range(0, image.height(), tile_size):
+        for x in range(0, image.width(), tile_size):
+            block = pixels[y:y + tile_size, x:x + tile_size]
+            if (block == blank).all():
+                continue
+            h, w = block.shape
+            data = QByteArray()
+            buffer = QBuffer(data)
+            buffer.open(QIODevice.WriteOnly)
+            image.copy(x, y, w, h).save(buffer, "PNG")
+            tiles.append(_TILE.pack(x, y, w, h) + bytes(data))
+    return tiles
+
+
+def decode_tile(payload):
+    x, y, _, _ = _TILE.unpack_from(payload)
+    return x, y, QImage.fromData(payload[_TILE.size:], "PNG")
+
+
+# Server
+
+def _apply_remote(model, op):
+    # Symmetry and fill styles are only in the ops drawn with them
+    model.symmetry = "none"
+    model.fill_style = "solid"
+    apply_op(model, op)
+
+
+def _apply_sequenced(model, ops):
+    # (seq, op) pairs onto a headless model; a malformed op is skipped the
+    # same way everywhere
+    for _, op in ops:
+        try:
+            _apply_remote(model, op)
+        except (ValueError, KeyError):
+            pass
+
+
+def _shared_model(width, height, image=None):
+    # Headless model for the shared canvas: no undo history of its own,
+    # undo works on the op log instead
+    model = CanvasModel(width, height)
+    model.history_limit = 0
+    if image is not None:
+        model.restore_tile(0, 0, image)
+    return model
+
+
+def _sequenced_ops(data):
+    # (seq, author, ops) of an OPS frame as the server sends it
+    seq, author = _SEQUENCED.unpack_from(data, _HEADER.size)
+    return seq, author, unpack_ops(data[_HEADER.size + _SEQUENCED.size:], data[5])
+
+
+class SyncServer:
+    """Stand-in sync service: one shared canvas, any number of clients.
+
+    Every op a client sends gets the next sequence number and goes to all
+    clients, its sender included, in that order; this order is the one
+    every canvas is drawn in. An undo or redo is resolved here, to the
+    latest op of its author that it can take back or put back within the
+    last `history` ops, so clients only follow the target. The server draws
+    nothing while forwarding. A snapshot applies the ops that are more than
+    `history` ops old to the server's model, leaving out the ones undone,
+    and encodes it; no later undo can reach those, and the newer ones stay
+    in the log for joiners to replay.
+    """
+
+    def __init__(self, width=800, height=600, snapshot_every=500, history=100,
+                 tile_size=256):
+        self.model = _shared_model(width, height)  # the canvas as of the snapshot
+        self.snapshot_every = snapshot_every
+        self.history = history
+        self.tile_size = tile_size
+        self.seq = 0  # ops received so far, the next sequence number
+        self._log = []  # (OPS frame as sent, op count) since the snapshot
+        self._logged_ops = 0
+        self._done = {}  # author -> sequence numbers undo can take back
+        self._redoable = {}  # author -> sequence numbers redo can put back, latest last
+        self._undone = set()  # sequence numbers of logged ops taken back
+        self._authors = 0
+        self._tiles = []  # TILE payloads of the snapshot
+        self._snapshotting = False
+        self._clients = set()
+        self._handlers = set()
+        self._server = None
+
+    @property
+    def snapshot_pending(self):
+        return self._snapshotting
+
+    @property
+    def snapshot_bytes(self):
+        return sum(len(tile) for tile in self._tiles)
+
+    async def start(self, address):
+        self._server = await start_server(self._handle, address)
+        return self._server
+
+    async def close(self):
+        # closing the connections lets every handler finish on end of stream
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        author = self._authors
+        self._authors += 1
+        hello = {"width": self.model.image.width(), "height": self.model.image.height(),
+                 "seq": self.seq, "author": author, "history": self.history}
+        writer.write(frame(HELLO, json.dumps(hello).encode("utf-8")))
+        for tile in self._tiles:
+            writer.write(frame(TILE, tile))
+        for data, _ in self._log:
+            writer.write(data)
+        writer.write(frame(SYNCED))
+        self._clients.add(writer)
+        self._handlers.add(asyncio.current_task())
+        try:
+            await writer.drain()
+            while True:
+                message = await read_frame(reader)
+                if message is None:
+                    break
+                kind, flags, payload = message
+                if kind != OPS:
+                    raise ProtocolError(f"unexpected frame kind {kind} from a client")
+                self._forward(author, payload, flags)
+        except (ConnectionError, ValueError, KeyError, asyncio.IncompleteReadError):
+            # a broken or misbehaving client only loses its own connection
+            pass
+        finally:
+            self._clients.discard(writer)
+            self._handlers.discard(asyncio.current_task())
+            self._done.pop(author, None)
+            self._redoable.pop(author, None)
+            writer.close()
+
+    def _forward(self, author, payload, flags):
+        ops = unpack_ops(payload, flags)
+        targets = False
+        for seq, op in enumerate(ops, self.seq):
+            if op.get("op") in _HISTORY_OPS:
+                op["target"] = self._resolve(author, op["op"], seq)
+                targets = True
+            else:
+                done = self._done.setdefault(author, [])
+                done.append(seq)
+                while done and done[0] <= seq - self.history:
+                    done.pop(0)
+                self._redoable[author] = []
+        if targets:
+            payload, flags = pack_ops(ops)
+        data = frame(OPS, _SEQUENCED.pack(self.seq, author) + payload, flags)
+        self.seq += len(ops)
+        self._log.append((data, len(ops)))
+        self._logged_ops += len(ops)
+        for writer in self._clients:
+            writer.write(data)
+        if self._logged_ops >= self.snapshot_every + self.history and not self._snapshotting:
+            asyncio.ensure_future(self._snapshot())
+
+    def _resolve(self, author, kind, seq):
+        # Sequence number an undo or redo at `seq` acts on, None for none.
+        # Ops more than `history` back are out of reach: they may already
+        # be folded into a snapshot.
+        source, dest = self._done, self._redoable
+        if kind == "redo":
+            source, dest = dest, source
+        reachable = [t for t in source.get(author, ()) if t > seq - self.history]
+        if not reachable:
+            source[author] = []
+            return None
+        target = reachable.pop()
+        source[author] = reachable
+        dest.setdefault(author, []).append(target)
+        if kind == "undo":
+            self._undone.add(target)
+        else:
+            self._undone.discard(target)
+        return target
+
+    async def _snapshot(self):
+        # Folding and PNG encoding run on an executor thread; the model is
+        # only ever used there, one snapshot at a time. The log is only cut
+        # once the tiles are ready, so joiners in between still get the
+        # previous snapshot with the full log after it.
+        self._snapshotting = True
+        cut, remaining = 0, self._logged_ops
+        while cut < len(self._log) and remaining - self._log[cut][1] >= self.history:
+            remaining -= self._log[cut][1]
+            cut += 1
+        frames = [data for data, _ in self._log[:cut]]
+        # ops this old can no longer be undone or redone; take what is
+        # undone of them now, before more ops come in
+        undone = set(self._undone)
+        try:
+            self._tiles = await asyncio.get_running_loop().run_in_executor(
+                None, self._fold, frames, undone)
+            del self._log[:cut]
+            self._logged_ops = sum(count for _, count in self._log)
+            if self._log:
+                first, _, _ = _sequenced_ops(self._log[0][0])
+                self._undone = {t for t in self._undone if t >= first}
+        finally:
+            self._snapshotting = False
+
+    def _fold(self, frames, undone):
+        for data in frames:
+            seq, _, ops = _sequenced_ops(data)
+            _apply_sequenced(self.model, [
+                (s, op) for s, op in enumerate(ops, seq)
+                if op.get("op") not in _HISTORY_OPS and s not in undone])
+        return encode_tiles(self.model.image, self.tile_size)
+
+
+# Client
+
+class SyncClient:
+    """asyncio end of a connection to a SyncServer.
+
+    `send` batches ops: they go out together every `batch_interval` seconds,
+    or as soon as `batch_size` are waiting. Received frames are passed to
+    the callbacks on the event loop thread; `on_ops` gets the sequence
+    number of the first op, the author's number and the ops, this client's
+    own among them once the server has put them in order.
+    """
+
+    def __init__(self, on_hello=None, on_ops=None, on_tile=None, on_synced=None,
+                 batch_interval=0.016, batch_size=64):
+        self.on_hello = on_hello
+        self.on_ops = on_ops
+        self.on_tile = on_tile
+        self.on_synced = on_synced
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.author = None  # this client's number, from the server's HELLO
+        self._pending = []
+        self._flush_handle = None
+        self._reader = self._writer = None
+
+    async def connect(self, address):
+        self._reader, self._writer = await open_connection(address)
+
+    def send(self, op):
+        # Event loop thread only; from elsewhere use loop.call_soon_threadsafe
+        self._pending.append(op)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.batch_interval, self.flush)
+
+    def flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending or self._writer is None:
+            return
+        data = frame(OPS, *pack_ops(self._pending))
+        self._pending = []
+        self._writer.write(data)
+        self.bytes_sent += len(data)
+
+    async def run(self):
+        """Dispatch incoming frames until the server goes away."""
+        while True:
+            message = await read_frame(self._reader)
+            if message is None:
+                return
+            kind, flags, payload = message
+            self.bytes_received += _HEADER.size + len(payload)
+            if kind == OPS:
+                if self.on_ops:
+                    seq, author = _SEQUENCED.unpack_from(payload)
+                    self.on_ops(seq, author, unpack_ops(payload[_SEQUENCED.size:], flags))
+            elif kind == TILE:
+                if self.on_tile:
+                    self.on_tile(*decode_tile(payload))
+            elif kind == HELLO:
+                hello = json.loads(payload)
+                self.author = hello["author"]
+                if self.on_hello:
+                    self.on_hello(hello)
+            elif kind == SYNCED:
+                if self.on_synced:
+                    self.on_synced()
+            else:
+                raise ProtocolError(f"unknown frame kind {kind}")
+
+    async def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+
+
+# GUI side
+
+# Model settings that applying a remote op changes and that are put back after
+_LOCAL_SETTINGS = ("current_tool", "brush_color", "brush_size", "brush_hardness",
+                   "simplify_tolerance", "smoothing", "symmetry", "symmetry_count",
+                   "symmetry_centre", "fill_style", "gradient_angle", "secondary_color",
+                   "async_fill")
+
+# Tools whose edits are sent as ops (the picker edits nothing). Selection
+# edits, imports, plugin tools and scripts change pixels no op describes,
+# so the app turns them off while connected.
+SHARED_TOOLS = ("pen", "rectangle", "ellipse", "line", "fill", "circle", "picker")
+
+CLOSE_TIMEOUT = 5.0  # seconds close() waits for batched ops to go out
+
+
+class CollabSession(QObject):
+    """Connects a CanvasModel in the app to a sync server.
+
+    The connection runs on an asyncio loop in its own thread. Local edits
+    arrive through `model.operation`, are drawn at once and handed to the
+    loop; what comes back is queued to the GUI thread and applied between
+    strokes, never in the middle of one, with the local tool settings put
+    back afterwards.
+
+    The shared canvas is kept in two headless models: the base, with the
+    ops too old to undo folded in, and the confirmed canvas, with every op
+    the server has put in order so far on top. The app's model shows the
+    confirmed canvas plus the local ops not back from the server yet.
+    Wherever either changes, the confirmed pixels are copied over and those
+    local ops drawn again on top, so ops of others ordered before them end
+    up underneath, as everywhere else. An undo or redo redraws the
+    confirmed canvas from the base, with or without the op it targets.
+    Local edits that are not sent as ops would not survive such a copy;
+    only SHARED_TOOLS should be used while connected, and retained shapes,
+    which are no pixels of the shared canvas, are kept off.
+    """
+
+    received = pyqtSignal(object)  # ("hello" | "tile" | "ops" | "closed", data)
+    status = pyqtSignal(str)
+
+    def __init__(self, model, address, parent=None):
+        super().__init__(parent)
+        self._model = model
+        self._address = address
+        self._incoming = []
+        self._applying = False
+        self._author = None
+        self._history = 0
+        self._base = self._confirmed = None  # headless models, made on HELLO
+        self._log = []  # (seq, op) of the edits put in order since the base
+        self._undone = set()  # sequence numbers of logged edits taken back
+        self._unconfirmed = []  # local ops sent, until they come back in order
+        self._shared_dirty = QRect()  # changed on the confirmed canvas since the last copy
+        self._local_dirty = QRect()  # changed on the app's model since then
+        self._apply_timer = QTimer(self)
+        self._apply_timer.setSingleShot(True)
+        self._apply_timer.timeout.connect(self._apply_incoming)
+        self._loop = asyncio.new_event_loop()
+        self._task = None
+        self._client = SyncClient(
+            on_hello=lambda hello: self.received.emit(("hello", hello)),
+            on_ops=lambda seq, author, ops: self.received.emit(("ops", (seq, author, ops))),
+            on_tile=lambda x, y, tile: self.received.emit(("tile", (x, y, tile))),
+            on_synced=lambda: self.received.emit(("synced", None)))
+        self.received.connect(self._on_received, Qt.QueuedConnection)
+        model.retained_shapes = False
+        model.operation.connect(self._on_operation)
+        model.changed.connect(self._mark_local)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._task = self._loop.create_task(self._session())
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            self.received.emit(("closed", "disconnected"))
+        except (OSError, ProtocolError) as e:
+            self.received.emit(("closed", str(e)))
+        else:
+            self.received.emit(("closed", "connection closed"))
+
+    async def _session(self):
+        await self._client.connect(self._address)
+        await self._client.run()
+
+    async def _shutdown(self):
+        try:
+            await self._client.close()
+        except OSError:
+            pass  # the connection is gone already
+        finally:
+            self._task.cancel()
+
+    def close(self):
+        """Send the ops still batched, disconnect and wait for the loop thread."""
+        self._model.operation.disconnect(self._on_operation)
+        self._model.changed.disconnect(self._mark_local)
+        self._apply_timer.stop()
+        if self._thread.is_alive():
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+            self._thread.join(CLOSE_TIMEOUT)
+        if not self._thread.is_alive():
+            self._loop.close()
+
+    def undo(self):
+        # Takes back this user's latest edit, on every canvas, once the
+        # server has put the undo in order
+        self._send({"op": "undo"})
+
+    def redo(self):
+        self._send({"op": "redo"})
+
+    def _send(self, op):
+        self._unconfirmed.append(op)
+        self._loop.call_soon_threadsafe(self._client.send, op)
+
+    def _on_operation(self, op):
+        if not self._applying:
+            self._send(op)
+
+    def _mark_local(self, rect):
+        self._local_dirty = self._local_dirty.united(
+            self._model.image.rect() if rect.isNull() else rect)
+
+    def _mark_shared(self, rect):
+        self._shared_dirty = self._shared_dirty.united(
+            self._confirmed.image.rect() if rect.isNull() else rect)
+
+    def _set_confirmed(self, model):
+        self._confirmed = model
+        model.changed.connect(self._mark_shared)
+
+    def _on_received(self, message):
+        kind, data = message
+        if kind == "hello":
+            self._author, self._history = data["author"], data["history"]
+            self._base = _shared_model(data["width"], data["height"])
+            self._set_confirmed(_shared_model(data["width"], data["height"]))
+            # the shared canvas may be larger than this window's
+            width = max(self._model.image.width(), data["width"])
+            height = max(self._model.image.height(), data["height"])
+            self._model.resize(width, height)
+            self.status.emit(f"Connected to {self._address}")
+        elif kind == "closed":
+            self.status.emit(f"Collaboration ended: {data}")
+        elif kind != "synced":
+            self._incoming.append(message)
+            if not self._apply_timer.isActive():
+                self._apply_timer.start(0)  # after the messages already queued
+
+    def _apply_incoming(self):
+        # Everything received so far in one pass, and one copy to the app
+        if not self._model.idle:
+            self._apply_timer.start(20)
+            return
+        incoming, self._incoming = self._incoming, []
+        rebuild = False
+        for kind, data in incoming:
+            if kind == "tile":
+                self._base.restore_tile(*data)
+                self._confirmed.restore_tile(*data)
+                continue
+            first, author, ops = data
+            for seq, op in enumerate(ops, first):
+                if author == self._author and self._unconfirmed:
+                    self._unconfirmed.pop(0)  # back in order, drawn below
+                if op.get("op") in _HISTORY_OPS:
+                    rebuild = self._retarget(op) or rebuild
+                    continue
+                self._log.append((seq, op))
+                if not rebuild:
+                    _apply_sequenced(self._confirmed, [(seq, op)])
+        if rebuild:
+            self._rebuild()
+        self._fold()
+        self._show_confirmed()
+
+    def _retarget(self, op):
+        # Mark the target of an undo or redo; False when it has none here,
+        # like one folded into the base (a snapshot has it as it is now)
+        target = op.get("target")
+        if target is None or not self._log or target < self._log[0][0]:
+            return False
+        if op["op"] == "undo":
+            self._undone.add(target)
+        else:
+            self._undone.discard(target)
+        return True
+
+    def _rebuild(self):
+        # The confirmed canvas again, from the base and the edits not undone
+        image = self._base.image
+        model = _shared_model(image.width(), image.height(), image)
+        _apply_sequenced(model, [(seq, op) for seq, op in self._log if seq not in self._undone])
+        self._set_confirmed(model)
+        self._shared_dirty = image.rect()
+
+    def _fold(self):
+        # Edits more than `history` ops back are out of undo's reach; they
+        # go into the base a log's worth at a time
+        if not self._log or self._log[-1][0] - self._log[0][0] < 2 * self._history:
+            return
+        limit = self._log[-1][0] - self._history
+        cut = next((i for i, (seq, _) in enumerate(self._log) if seq > limit), len(self._log))
+        folded, self._log = self._log[:cut], self._log[cut:]
+        _apply_sequenced(self._base, [(seq, op) for seq, op in folded if seq not in self._undone])
+        self._undone.difference_update(seq for seq, _ in folded)
+        # fresh models let go of the strokes the old ones kept
+        image = self._base.image
+        self._base = _shared_model(image.width(), image.height(), image)
+        self._set_confirmed(_shared_model(image.width(), image.height(), self._confirmed.image))
+
+    def _show_confirmed(self):
+        area = self._shared_dirty.united(self._local_dirty).intersected(
+            self._confirmed.image.rect())
+        self._shared_dirty = QRect()
+        if area.isEmpty():
+            return
+        model = self._model
+        # what is applied here is not this user's input; a recording of the
+        # session keeps only that
+        recorder, model.recorder = model.recorder, None
+        # the ops drop any selection as they are drawn; this user's stays
+        selection = model.selection
+        settings = [getattr(model, name) for name in _LOCAL_SETTINGS]
+        # remote points were already simplified where they were drawn; a
+        # fill finishing later would be sent as an op of this user
+        model.simplify_tolerance, model.smoothing, model.async_fill = 0.0, False, False
+        self._applying = True
+        try:
+            model.restore_tile(area.x(), area.y(), self._confirmed.image.copy(area))
+            self._local_dirty = QRect()
+            for op in self._unconfirmed:
+                if op.get("op") not in _HISTORY_OPS:
+                    try:
+                        _apply_remote(model, op)
+                    except (ValueError, KeyError):
+                        pass  # the server's copy is skipped the same way
+        finally:
+            self._applying = False
+            for name, value in zip(_LOCAL_SETTINGS, settings):
+                setattr(model, name, value)
+            model.restore_selection(selection)
+            model.recorder = recorder
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PythonPaint collaboration server")
+    parser.add_argument("address", help="host:port or unix:PATH to listen on")
+    parser.add_argument("--size", default="1920x1080", help="shared canvas size, WxH")
+    parser.add_argument("--snapshot-every", type=int, default=500,
+                        help="ops between canvas snapshots for late joiners")
+    parser.add_argument("--history", type=int, default=100,
+                        help="ops always replayed by late joiners, for undo")
+    args = parser.parse_args(argv)
+    width, height = (int(v) for v in args.size.lower().split("x"))
+
+    async def serve():
+        server = SyncServer(width, height, args.snapshot_every, args.history)
+        await server.start(args.address)
+        print(f"serving a {width}x{height} canvas on {args.address}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import numpy as np
+from PyQt5.QtGui import QColor, QImage, qUnpremultiply
+from PyQt5.QtCore import QRect
+
+from image_buffer import image_view
+from tiles import TILE_SIZE, tile_rects
+
+# Colour counts behind the "colours used" palette. A ColorHistogram keeps
+# per-tile pixel counts of the canvas (np.unique over each tile) and their
+# sum over the canvas as sorted (values, counts) arrays. When the model reports changes only the
+# touched tiles are marked; at the next update those are recounted and the
+# totals adjusted by their old and new counts with one unique/bincount,
+# so a stroke costs a few tiles however large the canvas is.
+
+
+class ColorHistogram:
+    """Pixel counts per colour of a CanvasModel's canvas, kept per tile."""
+
+    def __init__(self, model, tile_size=TILE_SIZE):
+        self._model = model
+        self._tile_size = tile_size
+        self._tiles = {}  # (x, y) -> (values, counts) of the tile
+        self._values = np.zeros(0, dtype=np.uint32)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._dirty = set()
+        self._all_dirty = True
+        self._size = None  # (width, height, format) counted
+        self.recounted_tiles = 0
+        model.changed.connect(self._mark)
+        model.memory.add_source("caches", "palette counts", lambda: self.nbytes)
+
+    @property
+    def dirty(self):
+        return self._all_dirty or bool(self._dirty)
+
+    def _mark(self, rect):
+        if rect.isNull():
+            self._all_dirty = True
+            return
+        image = self._model.image
+        if image is None:
+            return
+        for tile in tile_rects(rect, image.rect(), self._tile_size):
+            self._dirty.add((tile.x(), tile.y()))
+
+    def update(self):
+        """Recount the tiles changed since the last update; returns how many."""
+        image = self._model.image
+        if image is None or image.isNull():
+            self._tiles.clear()
+            self._values, self._counts = self._values[:0], self._counts[:0]
+            self._dirty.clear()
+            return 0
+        size = (image.width(), image.height(), image.format())
+        if self._all_dirty or size != self._size:
+            self._tiles.clear()
+            self._values, self._counts = self._values[:0], self._counts[:0]
+            rects = tile_rects(image.rect(), image.rect(), self._tile_size)
+        else:
+            t = self._tile_size
+            rects = [QRect(x, y, t, t).intersected(image.rect()) for x, y in self._dirty]
+        self._size = size
+        self._dirty.clear()
+        self._all_dirty = False
+        if not rects:
+            return 0
+        pixels = image_view(image)
+        values, counts = [self._values], [self._counts]
+        for rect in rects:
+            old = self._tiles.get((rect.x(), rect.y()))
+            if old is not None:
+                values.append(old[0])
+                counts.append(-old[1])
+            tile = pixels[rect.top():rect.bottom() + 1, rect.left():rect.right() + 1]
+            new = np.unique(tile, return_counts=True)
+            self._tiles[(rect.x(), rect.y())] = new
+            values.append(new[0])
+            counts.append(new[1])
+        self._values, inverse = np.unique(np.concatenate(values), return_inverse=True)
+        self._counts = np.bincount(inverse, weights=np.concatenate(counts)).astype(np.int64)
+        used = self._counts > 0
+        self._values, self._counts = self._values[used], self._counts[used]
+        self.recounted_tiles += len(rects)
+        return len(rects)
+
+    def __len__(self):
+        return len(self._values)
+
+    @property
+    def nbytes(self):
+        return self._values.nbytes + self._counts.nbytes + sum(
+            values.nbytes + counts.nbytes for values, counts in self._tiles.values())
+
+    def _color(self, value):
+        image_format = self._size[2]
+        if image_format == QImage.Format_ARGB32_Premultiplied:
+            return QColor.fromRgba(qUnpremultiply(value))
+        if image_format == QImage.Format_RGB32:
+            return QColor.fromRgb(value)
+        return QColor.fromRgba(value)
+
+    def colors(self, limit=None):
+        """(QColor, pixel count) pairs, most used first, as of the last update."""
+        order = np.argsort(-self._counts, kind="stable")[:limit]
+        return [(self._color(int(self._values[i])), int(self._counts[i])) for i in order]
+
+    def close(self):
+        self._model.changed.disconnect(self._mark)
+        self._model.memory.remove_source("caches", "palette counts")
@@ -0,0 +1,193 @@
+from contextlib import contextmanager
+
+import numpy as np
+from PyQt5.QtGui import QColor, QImage, QPainter, QPainterPath, QPen, QPolygonF
+from PyQt5.QtCore import QPoint, QPointF, QRect, QRectF, Qt
+
+from scene import shape_bounds
+from spatial_index import shape_outline
+
+# The drawing API: what plugin tools and scripts draw with. It wraps a
+# CanvasModel and goes through CanvasModel.edit, so every call repaints only
+# what it touched, is undoable, and waits its turn behind a running fill
+# like mouse input does. Bulk pixel calls move whole NumPy arrays through
+# one QImage, never a pixel at a time.
+
+
+def _pixel(value):
+    return int(round(value))
+
+
+class DrawingAPI:
+    """Drawing on a CanvasModel from code.
+
+    Coordinates are image pixels, ints or floats. Paths and points use
+    them as they are; pixel blocks, rects and shapes round them to whole
+    pixels. Colours are anything QColor takes; None
+    means the model's brush colour, and a size of None its brush size. Each
+    call is its own undo step, except inside `undo_step()` or a stroke of
+    a plugin tool, which are one step as a whole. Pixel arrays are
+    (height, width, 4) uint8 RGBA, not premultiplied, whatever format the
+    canvas is stored in.
+
+    Get one with `model.api`.
+    """
+
+    def __init__(self, model):
+        self._model = model
+
+    @property
+    def model(self):
+        return self._model
+
+    @property
+    def width(self):
+        image = self._model.image
+        return 0 if image is None else image.width()
+
+    @property
+    def height(self):
+        image = self._model.image
+        return 0 if image is None else image.height()
+
+    def _color(self, color):
+        return QColor(self._model.brush_color if color is None else color)
+
+    def _size(self, size):
+        return self._model.brush_size if size is None else size
+
+    @contextmanager
+    def undo_step(self):
+        """Make everything drawn in the with-block one undo step."""
+        self._model.begin_edits()
+        try:
+            yield self
+        finally:
+            self._model.end_edits()
+
+    # Bulk pixels
+
+    def read_pixels(self, x=0, y=0, width=None, height=None):
+        """A copy of the pixels of a rect, clipped to the canvas, as RGBA."""
+        image = self._model.image
+        x, y = _pixel(x), _pixel(y)
+        width = self.width - x if width is None else _pixel(width)
+        height = self.height - y if height is None else _pixel(height)
+        rect = QRect(x, y, width, height).intersected(image.rect())
+        if rect.isEmpty():
+            return np.zeros((0, 0, 4), dtype=np.uint8)
+        rgba = image.copy(rect).convertToFormat(QImage.Format_RGBA8888)
+        bits = rgba.constBits()
+        bits.setsize(rgba.sizeInBytes())
+        rows = np.frombuffer(bits, dtype=np.uint8).reshape(rgba.height(), rgba.bytesPerLine())
+        return rows[:, :rgba.width() * 4].reshape(rgba.height(), rgba.width(), 4).copy()
+
+    def write_pixels(self, x, y, rgba, blend=False):
+        """Put an RGBA array on the canvas with its top left at (x, y).
+
+        The pixels replace what is there, or with `blend` are composited
+        over it by their alpha.
+        """
+        rgba = np.ascontiguousarray(rgba, dtype=np.uint8)
+        if rgba.ndim != 3 or rgba.shape[2] != 4:
+            raise ValueError(f"expected a (height, width, 4) array, got shape {rgba.shape}")
+        height, width = rgba.shape[:2]
+        image = QImage(rgba.data, width, height, width * 4, QImage.Format_RGBA8888)
+        self.draw_image(x, y, image, blend)
+
+    def draw_image(self, x, y, image, blend=True):
+        """Draw a QImage with its top left at (x, y); see write_pixels."""
+        x, y = _pixel(x), _pixel(y)
+        def paint(painter):
+            if not blend:
+                painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.drawImage(x, y, image)
+        self._model.edit(QRect(x, y, image.width(), image.height()), paint)
+
+    def fill_rect(self, x, y, width, height, color=None):
+        color = self._color(color)
+        rect = QRect(_pixel(x), _pixel(y), _pixel(width), _pixel(height))
+        self._model.edit(rect, lambda painter: painter.fillRect(rect, color))
+
+    def set_pixels(self, points, color=None):
+        """Set single pixels, an (n, 2) array or list of (x, y), to one colour."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if not len(points):
+            return
+        color = self._color(color)
+        (x0, y0), (x1, y1) = np.floor(points.min(axis=0)), np.ceil(points.max(axis=0))
+        polygon = QPolygonF([QPointF(x, y) for x, y in points.tolist()])
+
+        def paint(painter):
+            painter.setPen(QPen(color, 1))
+            painter.drawPoints(polygon)
+        self._model.edit(QRect(QPoint(int(x0), int(y0)), QPoint(int(x1), int(y1))), paint)
+
+    # Paths
+
+    def _path_rect(self, points, size):
+        xs, ys = [p[0] for p in points], [p[1] for p in points]
+        m = int(size // 2) + 2
+        return QRect(QPoint(int(min(xs)) - m, int(min(ys)) - m),
+                     QPoint(int(max(xs)) + m, int(max(ys)) + m))
+
+    def stroke_path(self, points, color=None, size=None, closed=False):
+        """Draw a polyline through `points` with round caps and joins.
+
+        It is kept as a stroke, so it can be hit-tested and exported like
+        pen strokes.
+        """
+        points = [(float(x), float(y)) for x, y in points]
+        if not points:
+            return
+        color, size = self._color(color), self._size(size)
+        path = QPainterPath(QPointF(*points[0]))
+        for point in points[1:]:
+            path.lineTo(*point)
+        if closed:
+            path.closeSubpath()
+            points.append(points[0])
+
+        def paint(painter):
+            painter.setPen(QPen(color, size, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+            if len(points) == 1:
+                painter.drawPoint(QPointF(*points[0]))
+            else:
+                painter.drawPath(path)
+        self._model.edit(self._path_rect(points, size), paint, [("path", points, color, size)])
+
+    def fill_path(self, points, color=None):
+        """Fill the polygon through `points` (odd-even rule)."""
+        points = [(float(x), float(y)) for x, y in points]
+        if len(points) < 3:
+            return
+        color = self._color(color)
+        polygon = QPolygonF([QPointF(x, y) for x, y in points])
+
+        def paint(painter):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(color)
+            painter.drawPolygon(polygon)
+        self._model.edit(self._path_rect(points, 0), paint)
+
+    def draw_shape(self, tool, start, end, color=None, size=None):
+        """A rectangle, ellipse, line or circle between two corners, as the tools draw it."""
+        if tool not in ("rectangle", "ellipse", "line", "circle"):
+            raise ValueError(f"unknown shape {tool!r}")
+        color, size = self._color(color), self._size(size)
+        start, end = (_pixel(start[0]), _pixel(start[1])), (_pixel(end[0]), _pixel(end[1]))
+        (x0, y0), (x1, y1) = start, end
+
+        def paint(painter):
+            painter.setPen(QPen(color, size, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+            if tool == "rectangle":
+                painter.drawRect(QRect(QPoint(x0, y0), QPoint(x1, y1)))
+            elif tool == "ellipse":
+                painter.drawEllipse(QRect(QPoint(x0, y0), QPoint(x1, y1)))
+            elif tool == "line":
+                painter.drawLine(x0, y0, x1, y1)
+            else:
+                r = int(((x1 - x0)**2 + (y1 - y0)**2) ** 0.5) // 2
+                painter.drawEllipse(QRectF((x0 + x1) // 2 - r, (y0 + y1) // 2 - r, 2 * r, 2 * r))
+        self._model.edit(shape_bounds(tool, start, end, size), paint,
+                         [(tool, shape_outline(tool, start, end), color, size)])
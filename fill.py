@@ -0,0 +1,129 @@
+import time
+
+import numpy as np
+
+
+def _row_runs(match):
+    # Horizontal runs of True in every row: row index, start and end (exclusive),
+    # in row-major order, plus offsets so runs of row y are offsets[y]:offsets[y+1]
+    height, width = match.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = match
+    edges = np.diff(padded, axis=1)
+    run_y, run_x0 = np.nonzero(edges == 1)
+    _, run_x1 = np.nonzero(edges == -1)
+    offsets = np.searchsorted(run_y, np.arange(height + 1))
+    return run_y, run_x0, run_x1, offsets
+
+
+def fill_runs(pixels, x, y, cancel=None):
+    """Runs of the 4-connected region of pixels equal to pixels[y, x].
+
+    Yields (row, start, end) with `end` exclusive. The region is found on runs
+    rather than pixels: each row is split into runs of the target value once
+    with NumPy, then a depth-first walk (a stack of runs) links runs that
+    overlap in adjacent rows. `cancel` is polled between runs and stops the
+    walk when it returns True.
+    """
+    height, width = pixels.shape
+    if not (0 <= x < width and 0 <= y < height):
+        return
+    run_y, run_x0, run_x1, offsets = _row_runs(pixels == pixels[y, x])
+    row_runs = slice(offsets[y], offsets[y + 1])
+    seed = offsets[y] + np.searchsorted(run_x1[row_runs], x, side="right")
+
+    visited = np.zeros(len(run_y), dtype=bool)
+    visited[seed] = True
+    queue = [seed]
+    while queue:
+        if cancel is not None and cancel():
+            return
+        run = queue.pop()
+        ry, x0, x1 = int(run_y[run]), int(run_x0[run]), int(run_x1[run])
+        yield ry, x0, x1
+        for ny in (ry - 1, ry + 1):
+            if not 0 <= ny < height:
+                continue
+            first, last = offsets[ny], offsets[ny + 1]
+            # runs of the neighbouring row that overlap [x0, x1)
+            lo = first + np.searchsorted(run_x1[first:last], x0, side="right")
+            hi = first + np.searchsorted(run_x0[first:last], x1, side="left")
+            for neighbour in range(lo, hi):
+                if not visited[neighbour]:
+                    visited[neighbour] = True
+                    queue.append(neighbour)
+
+
+def flood_fill_array(pixels, x, y, replacement, cancel=None, progress=None,
+                     progress_interval=0.03):
+    """Fill the region under (x, y) of a uint32 array in place.
+
+    Returns the filled bounding box (left, top, right, bottom), inclusive, or
+    None when nothing changed or the fill was cancelled. `progress`, if given,
+    is called about every `progress_interval` seconds with the bounding box
+    of the runs written since the previous call.
+    """
+    height, width = pixels.shape
+    if not (0 <= x < width and 0 <= y < height) or pixels[y, x] == replacement:
+        return None
+    bbox = None
+    band = None
+    last_report = time.perf_counter()
+    for ry, x0, x1 in fill_runs(pixels, x, y, cancel):
+        pixels[ry, x0:x1] = replacement
+        run_box = (x0, ry, x1 - 1, ry)
+        bbox = run_box if bbox is None else _union(bbox, run_box)
+        if progress is not None:
+            band = run_box if band is None else _union(band, run_box)
+            now = time.perf_counter()
+            if now - last_report >= progress_interval:
+                progress(band)
+                band = None
+                last_report = now
+    if cancel is not None and cancel():
+        return None
+    if progress is not None and band is not None:
+        progress(band)
+    return bbox
+
+
+def region_mask(pixels, x, y, cancel=None):
+    """Bounding box and mask of the region fill_runs finds under (x, y).
+
+    Returns ((left, top, right, bottom), mask), the box inclusive and the
+    mask a boolean array over it, or None when (x, y) is off the canvas or
+    the walk was cancelled. The runs are rasterized in one step: +1 at each
+    run start and -1 at its end, summed along the rows.
+    """
+    runs = np.array(list(fill_runs(pixels, x, y, cancel)), dtype=np.int64).reshape(-1, 3)
+    if not len(runs) or (cancel is not None and cancel()):
+        return None
+    run_y, run_x0, run_x1 = runs.T
+    left, top = int(run_x0.min()), int(run_y.min())
+    right, bottom = int(run_x1.max()) - 1, int(run_y.max())
+    # runs never overlap, so the sums are 0 or 1 and fit a byte
+    edges = np.zeros((bottom - top + 1, right - left + 2), dtype=np.int8)
+    np.add.at(edges, (run_y - top, run_x0 - left), 1)
+    np.add.at(edges, (run_y - top, run_x1 - left), -1)
+    mask = np.cumsum(edges, axis=1, dtype=np.int8)[:, :-1] > 0
+    return (left, top, right, bottom), mask
+
+
+def fill_region(pixels, x, y, content, cancel=None):
+    """Fill the region under (x, y) of a uint32 array with generated pixels.
+
+    `content(box)` returns the pixels for the region's bounding box as a
+    (height, width) uint32 array; they are written with one masked copy.
+    Returns the box like flood_fill_array, or None.
+    """
+    found = region_mask(pixels, x, y, cancel)
+    if found is None:
+        return None
+    (left, top, right, bottom), mask = found
+    np.copyto(pixels[top:bottom + 1, left:right + 1], content((left, top, right, bottom)),
+              where=mask)
+    return left, top, right, bottom
+
+
+def _union(a, b):
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
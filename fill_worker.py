@@ -0,0 +1,62 @@
+from PyQt5.QtCore import QThread, QRect, pyqtSignal
+
+from fill import fill_region, flood_fill_array
+from image_buffer import image_array
+from tiled_fill import TILED_FILL_THRESHOLD, tiled_flood_fill
+
+
+def _rect(box):
+    left, top, right, bottom = box
+    return QRect(left, top, right - left + 1, bottom - top + 1)
+
+
+class FillWorker(QThread):
+    """Flood fill on a private copy of the canvas, off the GUI thread.
+
+    `band_ready` reports areas of `result` that already hold filled pixels so
+    the canvas can show the fill growing; `fill_done` carries the final
+    bounding box, or a null rect when nothing changed or it was cancelled.
+    `replacement` is the pixel value as stored in `image`'s format; with
+    `content`, a fill_region generator, the region gets generated pixels
+    instead, in one go with no bands.
+    """
+
+    band_ready = pyqtSignal(QRect)
+    fill_done = pyqtSignal(QRect)
+
+    def __init__(self, image, x, y, replacement, parent=None, content=None):
+        super().__init__(parent)
+        self._content = content
+        self._result = image.copy()
+        self._x = x
+        self._y = y
+        self._replacement = replacement
+        self._cancelled = False
+
+    @property
+    def result(self):
+        return self._result
+
+    def cancel(self):
+        self._cancelled = True
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def run(self):
+        pixels = image_array(self._result)
+        if self._content is not None:
+            bbox = fill_region(pixels, self._x, self._y, self._content, cancel=self.is_cancelled)
+            self.fill_done.emit(QRect() if bbox is None else _rect(bbox))
+            return
+        if pixels.size >= TILED_FILL_THRESHOLD:
+            # very large canvases: spread the fill over every core, no bands;
+            # spawned, as forking the threaded GUI process is not safe
+            bbox = tiled_flood_fill(pixels, self._x, self._y, self._replacement,
+                                    executor="spawn", cancel=self.is_cancelled)
+            self.fill_done.emit(QRect() if bbox is None else _rect(bbox))
+            return
+        bbox = flood_fill_array(pixels, self._x, self._y, self._replacement,
+                                cancel=self.is_cancelled,
+                                progress=lambda band: self.band_ready.emit(_rect(band)))
+        self.fill_done.emit(QRect() if bbox is None else _rect(bbox))
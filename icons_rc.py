@@ -0,0 +1,408 @@
+# -*- coding: utf-8 -*-
+
+# Resource object code
+#
+# Created by: The Resource Compiler for PyQt5 (Qt v5.15.14)
+#
+# WARNING! All changes made in this file will be lost!
+
+from PyQt5 import QtCore
+
+qt_resource_data = b"\
+\x00\x00\x03\x2d\
+\x3c\
+\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
+\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
+\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
+\x30\x20\x30\x20\x35\x37\x36\x20\x35\x31\x32\x22\x3e\x3c\x21\x2d\
+\x2d\x21\x46\x6f\x6e\x74\x20\x41\x77\x65\x73\x6f\x6d\x65\x20\x46\
+\x72\x65\x65\x20\x36\x2e\x37\x2e\x32\x20\x62\x79\x20\x40\x66\x6f\
+\x6e\x74\x61\x77\x65\x73\x6f\x6d\x65\x20\x2d\x20\x68\x74\x74\x70\
+\x73\x3a\x2f\x2f\x66\x6f\x6e\x74\x61\x77\x65\x73\x6f\x6d\x65\x2e\
+\x63\x6f\x6d\x20\x4c\x69\x63\x65\x6e\x73\x65\x20\x2d\x20\x68\x74\
+\x74\x70\x73\x3a\x2f\x2f\x66\x6f\x6e\x74\x61\x77\x65\x73\x6f\x6d\
+\x65\x2e\x63\x6f\x6d\x2f\x6c\x69\x63\x65\x6e\x73\x65\x2f\x66\x72\
+\x65\x65\x20\x43\x6f\x70\x79\x72\x69\x67\x68\x74\x20\x32\x30\x32\
+\x35\x20\x46\x6f\x6e\x74\x69\x63\x6f\x6e\x73\x2c\x20\x49\x6e\x63\
+\x2e\x2d\x2d\x3e\x3c\x70\x61\x74\x68\x20\x64\x3d\x22\x4d\x34\x31\
+\x2e\x34\x20\x39\x2e\x34\x43\x35\x33\x2e\x39\x2d\x33\x2e\x31\x20\
+\x37\x34\x2e\x31\x2d\x33\x2e\x31\x20\x38\x36\x2e\x36\x20\x39\x2e\
+\x34\x4c\x31\x36\x38\x20\x39\x30\x2e\x37\x6c\x35\x33\x2e\x31\x2d\
+\x35\x33\x2e\x31\x63\x32\x38\x2e\x31\x2d\x32\x38\x2e\x31\x20\x37\
+\x33\x2e\x37\x2d\x32\x38\x2e\x31\x20\x31\x30\x31\x2e\x38\x20\x30\
+\x4c\x34\x37\x34\x2e\x33\x20\x31\x38\x39\x2e\x31\x63\x32\x38\x2e\
+\x31\x20\x32\x38\x2e\x31\x20\x32\x38\x2e\x31\x20\x37\x33\x2e\x37\
+\x20\x30\x20\x31\x30\x31\x2e\x38\x4c\x32\x38\x33\x2e\x39\x20\x34\
+\x38\x31\x2e\x34\x63\x2d\x33\x37\x2e\x35\x20\x33\x37\x2e\x35\x2d\
+\x39\x38\x2e\x33\x20\x33\x37\x2e\x35\x2d\x31\x33\x35\x2e\x38\x20\
+\x30\x4c\x33\x30\x2e\x36\x20\x33\x36\x33\x2e\x39\x63\x2d\x33\x37\
+\x2e\x35\x2d\x33\x37\x2e\x35\x2d\x33\x37\x2e\x35\x2d\x39\x38\x2e\
+\x33\x20\x30\x2d\x31\x33\x35\x2e\x38\x4c\x31\x32\x32\x2e\x37\x20\
+\x31\x33\x36\x20\x34\x31\x2e\x34\x20\x35\x34\x2e\x36\x63\x2d\x31\
+\x32\x2e\x35\x2d\x31\x32\x2e\x35\x2d\x31\x32\x2e\x35\x2d\x33\x32\
+\x2e\x38\x20\x30\x2d\x34\x35\x2e\x33\x7a\x6d\x31\x37\x36\x20\x32\
+\x32\x31\x2e\x33\x4c\x31\x36\x38\x20\x31\x38\x31\x2e\x33\x20\x37\
+\x35\x2e\x39\x20\x32\x37\x33\x2e\x34\x63\x2d\x34\x2e\x32\x20\x34\
+\x2e\x32\x2d\x37\x20\x39\x2e\x33\x2d\x38\x2e\x34\x20\x31\x34\x2e\
+\x36\x6c\x33\x31\x39\x2e\x32\x20\x30\x20\x34\x32\x2e\x33\x2d\x34\
+\x32\x2e\x33\x63\x33\x2e\x31\x2d\x33\x2e\x31\x20\x33\x2e\x31\x2d\
+\x38\x2e\x32\x20\x30\x2d\x31\x31\x2e\x33\x4c\x32\x37\x37\x2e\x37\
+\x20\x38\x32\x2e\x39\x63\x2d\x33\x2e\x31\x2d\x33\x2e\x31\x2d\x38\
+\x2e\x32\x2d\x33\x2e\x31\x2d\x31\x31\x2e\x33\x20\x30\x4c\x32\x31\
+\x33\x2e\x33\x20\x31\x33\x36\x6c\x34\x39\x2e\x34\x20\x34\x39\x2e\
+\x34\x63\x31\x32\x2e\x35\x20\x31\x32\x2e\x35\x20\x31\x32\x2e\x35\
+\x20\x33\x32\x2e\x38\x20\x30\x20\x34\x35\x2e\x33\x73\x2d\x33\x32\
+\x2e\x38\x20\x31\x32\x2e\x35\x2d\x34\x35\x2e\x33\x20\x30\x7a\x4d\
+\x35\x31\x32\x20\x35\x31\x32\x63\x2d\x33\x35\x2e\x33\x20\x30\x2d\
+\x36\x34\x2d\x32\x38\x2e\x37\x2d\x36\x34\x2d\x36\x34\x63\x30\x2d\
+\x32\x35\x2e\x32\x20\x33\x32\x2e\x36\x2d\x37\x39\x2e\x36\x20\x35\
+\x31\x2e\x32\x2d\x31\x30\x38\x2e\x37\x63\x36\x2d\x39\x2e\x34\x20\
+\x31\x39\x2e\x35\x2d\x39\x2e\x34\x20\x32\x35\x2e\x35\x20\x30\x43\
+\x35\x34\x33\x2e\x34\x20\x33\x36\x38\x2e\x34\x20\x35\x37\x36\x20\
+\x34\x32\x32\x2e\x38\x20\x35\x37\x36\x20\x34\x34\x38\x63\x30\x20\
+\x33\x35\x2e\x33\x2d\x32\x38\x2e\x37\x20\x36\x34\x2d\x36\x34\x20\
+\x36\x34\x7a\x22\x2f\x3e\x3c\x2f\x73\x76\x67\x3e\
+\x00\x00\x00\x9f\
+\x89\
+\x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
+\x00\x02\x00\x00\x00\x02\x00\x01\x03\x00\x00\x00\xce\xb6\x46\xb9\
+\x00\x00\x00\x06\x50\x4c\x54\x45\xff\xff\xff\x00\x00\x00\x55\xc2\
+\xd3\x7e\x00\x00\x00\x01\x74\x52\x4e\x53\x00\x40\xe6\xd8\x66\x00\
+\x00\x00\x47\x49\x44\x41\x54\x78\xda\xed\xd6\x31\x0d\x00\x00\x0c\
+\xc3\xb0\xf1\x27\xbd\x71\xd8\x53\xa9\xb2\x01\xe4\xce\x00\x00\x00\
+\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x24\xed\x93\x80\
+\x80\x80\x80\x80\x80\x40\x5d\xc0\x18\x01\x00\x00\x00\x00\x00\x00\
+\x00\x00\x00\x00\x00\x00\x00\x00\x49\x07\x11\xec\xf9\x5b\x23\x88\
+\xe5\xce\x00\x00\x00\x00\x49\x45\x4e\x44\xae\x42\x60\x82\
+\x00\x00\x01\x61\
+\x3c\
+\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
+\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
+\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
+\x30\x20\x30\x20\x35\x31\x32\x20\x35\x31\x32\x22\x3e\x3c\x70\x61\
+\x74\x68\x20\x64\x3d\x22\x4d\x32\x35\x36\x20\x33\x32\x63\x2d\x39\
+\x32\x2e\x36\x20\x30\x2d\x31\x37\x32\x2e\x32\x20\x35\x36\x2e\x32\
+\x2d\x32\x30\x36\x2e\x34\x20\x31\x33\x36\x2e\x32\x4c\x31\x36\x20\
+\x31\x35\x32\x76\x31\x32\x38\x68\x31\x32\x38\x6c\x2d\x34\x36\x2e\
+\x33\x2d\x33\x32\x2e\x36\x43\x31\x32\x31\x2e\x34\x20\x31\x37\x38\
+\x20\x31\x38\x33\x2e\x36\x20\x31\x32\x38\x20\x32\x35\x36\x20\x31\
+\x32\x38\x63\x38\x38\x2e\x34\x20\x30\x20\x31\x36\x30\x20\x37\x31\
+\x2e\x36\x20\x31\x36\x30\x20\x31\x36\x30\x73\x2d\x37\x31\x2e\x36\
+\x20\x31\x36\x30\x2d\x31\x36\x30\x20\x31\x36\x30\x63\x2d\x34\x34\
+\x2e\x32\x20\x30\x2d\x38\x34\x2e\x32\x2d\x31\x37\x2e\x39\x2d\x31\
+\x31\x33\x2e\x31\x2d\x34\x36\x2e\x39\x6c\x2d\x36\x37\x2e\x39\x20\
+\x36\x37\x2e\x39\x43\x31\x32\x31\x2e\x33\x20\x35\x31\x35\x2e\x33\
+\x20\x31\x38\x35\x2e\x33\x20\x35\x34\x34\x20\x32\x35\x36\x20\x35\
+\x34\x34\x63\x31\x34\x31\x2e\x34\x20\x30\x20\x32\x35\x36\x2d\x31\
+\x31\x34\x2e\x36\x20\x32\x35\x36\x2d\x32\x35\x36\x53\x33\x39\x37\
+\x2e\x34\x20\x33\x32\x20\x32\x35\x36\x20\x33\x32\x7a\x22\x20\x74\
+\x72\x61\x6e\x73\x66\x6f\x72\x6d\x3d\x22\x73\x63\x61\x6c\x65\x28\
+\x31\x20\x30\x2e\x39\x29\x22\x2f\x3e\x3c\x2f\x73\x76\x67\x3e\x0a\
+\
+\x00\x00\x01\x1e\
+\x3c\
+\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
+\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
+\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
+\x30\x20\x30\x20\x35\x31\x32\x20\x35\x31\x32\x22\x3e\x3c\x70\x61\
+\x74\x68\x20\x64\x3d\x22\x4d\x34\x37\x30\x20\x34\x32\x63\x2d\x32\
+\x38\x2d\x32\x38\x2d\x37\x33\x2d\x32\x38\x2d\x31\x30\x31\x20\x30\
+\x6c\x2d\x36\x33\x20\x36\x33\x2d\x33\x31\x2d\x33\x31\x2d\x34\x35\
+\x20\x34\x35\x20\x33\x32\x20\x33\x32\x4c\x36\x34\x20\x33\x34\x39\
+\x63\x2d\x39\x20\x39\x2d\x31\x35\x20\x32\x31\x2d\x31\x36\x20\x33\
+\x34\x6c\x2d\x34\x20\x34\x33\x2d\x32\x38\x20\x32\x38\x20\x34\x35\
+\x20\x34\x35\x20\x32\x38\x2d\x32\x38\x20\x34\x33\x2d\x34\x63\x31\
+\x33\x2d\x31\x20\x32\x35\x2d\x37\x20\x33\x34\x2d\x31\x36\x6c\x31\
+\x39\x38\x2d\x31\x39\x38\x20\x33\x32\x20\x33\x32\x20\x34\x35\x2d\
+\x34\x35\x2d\x33\x31\x2d\x33\x31\x20\x36\x33\x2d\x36\x33\x63\x32\
+\x38\x2d\x32\x38\x20\x32\x38\x2d\x37\x33\x20\x30\x2d\x31\x30\x31\
+\x7a\x4d\x31\x35\x33\x20\x34\x31\x36\x6c\x2d\x34\x31\x20\x34\x20\
+\x34\x2d\x34\x31\x20\x31\x39\x30\x2d\x31\x39\x30\x20\x33\x37\x20\
+\x33\x37\x7a\x22\x2f\x3e\x3c\x2f\x73\x76\x67\x3e\x0a\
+\x00\x00\x01\xeb\
+\x3c\
+\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
+\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
+\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
+\x30\x20\x30\x20\x35\x31\x32\x20\x35\x31\x32\x22\x3e\x3c\x21\x2d\
+\x2d\x21\x46\x6f\x6e\x74\x20\x41\x77\x65\x73\x6f\x6d\x65\x20\x46\
+\x72\x65\x65\x20\x36\x2e\x37\x2e\x32\x20\x62\x79\x20\x40\x66\x6f\
+\x6e\x74\x61\x77\x65\x73\x6f\x6d\x65\x20\x2d\x20\x68\x74\x74\x70\
+\x73\x3a\x2f\x2f\x66\x6f\x6e\x74\x61\x77\x65\x73\x6f\x6d\x65\x2e\
+\x63\x6f\x6d\x20\x4c\x69\x63\x65\x6e\x73\x65\x20\x2d\x20\x68\x74\
+\x74\x70\x73\x3a\x2f\x2f\x66\x6f\x6e\x74\x61\x77\x65\x73\x6f\x6d\
+\x65\x2e\x63\x6f\x6d\x2f\x6c\x69\x63\x65\x6e\x73\x65\x2f\x66\x72\
+\x65\x65\x20\x43\x6f\x70\x79\x72\x69\x67\x68\x74\x20\x32\x30\x32\
+\x35\x20\x46\x6f\x6e\x74\x69\x63\x6f\x6e\x73\x2c\x20\x49\x6e\x63\
+\x2e\x2d\x2d\x3e\x3c\x70\x61\x74\x68\x20\x64\x3d\x22\x4d\x33\x36\
+\x32\x2e\x37\x20\x31\x39\x2e\x33\x4c\x33\x31\x34\x2e\x33\x20\x36\
+\x37\x2e\x37\x20\x34\x34\x34\x2e\x33\x20\x31\x39\x37\x2e\x37\x6c\
+\x34\x38\x2e\x34\x2d\x34\x38\x2e\x34\x63\x32\x35\x2d\x32\x35\x20\
+\x32\x35\x2d\x36\x35\x2e\x35\x20\x30\x2d\x39\x30\x2e\x35\x4c\x34\
+\x35\x33\x2e\x33\x20\x31\x39\x2e\x33\x63\x2d\x32\x35\x2d\x32\x35\
+\x2d\x36\x35\x2e\x35\x2d\x32\x35\x2d\x39\x30\x2e\x35\x20\x30\x7a\
+\x6d\x2d\x37\x31\x20\x37\x31\x4c\x35\x38\x2e\x36\x20\x33\x32\x33\
+\x2e\x35\x63\x2d\x31\x30\x2e\x34\x20\x31\x30\x2e\x34\x2d\x31\x38\
+\x20\x32\x33\x2e\x33\x2d\x32\x32\x2e\x32\x20\x33\x37\x2e\x34\x4c\
+\x31\x20\x34\x38\x31\x2e\x32\x43\x2d\x31\x2e\x35\x20\x34\x38\x39\
+\x2e\x37\x20\x2e\x38\x20\x34\x39\x38\x2e\x38\x20\x37\x20\x35\x30\
+\x35\x73\x31\x35\x2e\x33\x20\x38\x2e\x35\x20\x32\x33\x2e\x37\x20\
+\x36\x2e\x31\x6c\x31\x32\x30\x2e\x33\x2d\x33\x35\x2e\x34\x63\x31\
+\x34\x2e\x31\x2d\x34\x2e\x32\x20\x32\x37\x2d\x31\x31\x2e\x38\x20\
+\x33\x37\x2e\x34\x2d\x32\x32\x2e\x32\x4c\x34\x32\x31\x2e\x37\x20\
+\x32\x32\x30\x2e\x33\x20\x32\x39\x31\x2e\x37\x20\x39\x30\x2e\x33\
+\x7a\x22\x2f\x3e\x3c\x2f\x73\x76\x67\x3e\
+\x00\x00\x02\xea\
+\x89\
+\x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
+\x00\x00\x30\x00\x00\x00\x30\x08\x06\x00\x00\x00\x57\x02\xf9\x87\
+\x00\x00\x00\x09\x70\x48\x59\x73\x00\x00\x0b\x13\x00\x00\x0b\x13\
+\x01\x00\x9a\x9c\x18\x00\x00\x02\x9c\x49\x44\x41\x54\x78\x9c\xed\
+\x98\xcb\x6f\x4f\x41\x14\xc7\x3f\x09\x12\xbf\xa6\x89\x7a\x15\x69\
+\x37\xea\x51\x15\x6a\xe1\x51\x21\x1e\xdd\x08\x16\x12\xba\x17\x3b\
+\x62\x45\x58\xd1\x7a\xfc\x07\x1e\x11\x34\x91\x14\x3b\xb1\x44\xfd\
+\x7e\x25\x8a\x20\xa2\x4a\x42\xc4\x2b\x91\x88\x67\xd0\x9d\xda\xf8\
+\xf5\xca\x24\x67\x31\xa6\x33\xf7\xf7\xb8\xbd\x0f\x32\x9f\x64\x92\
+\x5f\xee\x39\x67\xce\x37\xf7\x37\x77\x66\xce\x01\x8f\xc7\xe3\xf1\
+\xa4\xcc\x74\x60\x2b\x70\x14\xb8\x0c\x3c\x04\x3e\x01\x43\x40\x20\
+\x43\xfd\xfe\x28\x36\xe5\x73\x44\x62\xa6\xa5\x25\x7a\x1e\xd0\x05\
+\x0c\x02\x45\x4d\x68\xa5\xa3\x08\x3c\x06\x3a\x81\xb9\x49\x08\xdf\
+\x0c\xf4\x01\x23\x11\x44\xbb\xc6\x08\x90\x07\x36\xc5\x21\x7c\x25\
+\x70\x2f\x06\xd1\x81\x63\xdc\x05\xda\xc6\x42\x78\x0d\x70\xbc\x8c\
+\x65\xf2\x12\xe8\x01\x76\x02\xeb\x80\xc5\x40\x03\x90\x93\xd1\x20\
+\xcf\x94\x6d\x17\x70\x1e\x78\x55\xc6\xf2\x3a\x26\xf1\x55\x31\x07\
+\x78\x1a\x92\xe0\x19\xb0\x07\xa8\x8f\xf0\x82\x66\x00\x7b\x81\xe7\
+\x21\x79\x9e\x00\x4d\x95\x4e\xbc\x04\xf8\xea\x98\xb0\x30\x56\x7f\
+\xaf\x65\x99\xf6\x39\x72\x7e\x01\x5a\x29\x93\x05\xc0\x0f\xcb\x24\
+\xef\x64\xeb\x8b\x9b\x6d\x92\xcb\xcc\xff\x1d\x68\x2e\x15\x3c\x19\
+\x78\x6b\x09\xbe\x02\xd4\x92\x1c\xb5\x92\xd3\xd4\xf1\x1a\xa8\x0b\
+\x0b\xbc\x68\x09\x3a\x0b\x8c\x27\x79\xc6\x01\x27\x2c\x7a\xd4\x66\
+\x61\x65\xbd\xc5\xf9\x14\xe9\x73\xc6\xa2\x4b\xed\x66\xa3\xb8\x63\
+\x38\x3d\x4a\xe9\xcd\x9b\x4c\x90\xd3\x5a\xd7\xd6\x6f\x3a\x2d\xb4\
+\x9c\x8a\x4b\xc9\x0e\xcb\x2c\xa7\x7f\x8b\xee\x70\xd8\x30\x5e\x23\
+\x7b\xe4\x0d\x8d\x87\x74\x63\xc1\x30\x6e\x27\x7b\xec\x30\x34\x5e\
+\xd7\x8d\x1f\x0c\x63\x22\x37\xc3\x0a\x99\x6f\x68\x7c\xaf\x1b\x7f\
+\x19\xc6\x89\x64\x8f\x9c\xa1\x71\x58\x37\x0e\x1b\xc6\xaa\x2f\x50\
+\x31\x52\x63\x68\xfc\xf9\x5f\x2d\xa1\xfc\x3f\xf8\x11\xf7\x86\x6d\
+\xa3\x7f\x19\x33\x42\x21\x6c\x1b\x6d\xb1\x1c\x64\xea\xf0\xc8\x0a\
+\xcb\x2d\x07\xd9\xa8\x9b\x69\xbf\xe1\x30\x90\xa1\xab\xc4\xa0\xa1\
+\xed\x96\xcd\x71\xad\xe5\xd2\x74\x9a\xf4\xe9\xb6\xe8\x5a\xe3\x72\
+\xee\xb1\x38\x77\xa7\x78\x9d\x3e\x69\xd1\x73\x2e\x2c\xa8\x4e\x8a\
+\x86\x2c\x14\x34\x57\x1d\xcd\x83\x49\xa5\x82\x9b\xa5\x7c\xb3\x95\
+\x94\x1d\x09\x88\xef\x70\x94\x94\xdf\xa4\xa1\x56\x16\xad\x52\x48\
+\x07\x96\x71\x03\x58\x15\x83\xf0\xd5\xc0\x4d\x47\xce\xcf\xc0\xa2\
+\x4a\x27\x6c\x92\x96\x46\xe0\x18\x2f\x80\x7d\xc0\xcc\x08\xa2\x67\
+\x01\xfb\x65\x2e\x57\x1e\xa5\x61\x76\xb5\x09\x72\xd2\x5c\x2a\xd5\
+\xd8\x52\xdf\xcd\x05\x60\x37\xd0\x2e\xff\x60\xa3\xd6\xd8\x6a\x94\
+\x67\xed\xe2\xa3\x7c\xdf\x94\x98\xf3\x77\xd4\xc6\x96\x4e\x9b\xb4\
+\xfb\x82\x84\xc6\x6d\x60\x05\x31\xb0\x51\x0a\x89\xb8\x9a\xbb\xbd\
+\xc0\x06\x12\x40\x7d\x1f\x07\xa5\xd8\x8e\xda\x5e\x1f\x00\x0e\x44\
+\x59\xe7\x51\x99\x0a\x6c\x91\xcb\xd5\x25\xe0\x81\x5c\xcf\x87\x44\
+\x60\x51\x7e\xab\x67\xf7\xc5\xa7\x4b\x62\xa6\xa4\x25\xda\xe3\xf1\
+\x78\x3c\x28\xfe\x00\x13\xae\xc7\x75\x61\x3a\xc9\xd7\x00\x00\x00\
+\x00\x49\x45\x4e\x44\xae\x42\x60\x82\
+\x00\x00\x01\x48\
+\x3c\
+\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
+\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
+\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
+\x30\x20\x30\x20\x35\x31\x32\x20\x35\x31\x32\x22\x3e\x3c\x21\x2d\
+\x2d\x21\x46\x6f\x6e\x74\x20\x41\x77\x65\x73\x6f\x6d\x65\x20\x46\
+\x72\x65\x65\x20\x36\x2e\x37\x2e\x32\x20\x62\x79\x20\x40\x66\x6f\
+\x6e\x74\x61\x77\x65\x73\x6f\x6d\x65\x20\x2d\x20\x68\x74\x74\x70\
+\x73\x3a\x2f\x2f\x66\x6f\x6e\x74\x61\x77\x65\x73\x6f\x6d\x65\x2e\
+\x63\x6f\x6d\x20\x4c\x69\x63\x65\x6e\x73\x65\x20\x2d\x20\x68\x74\
+\x74\x70\x73\x3a\x2f\x2f\x66\x6f\x6e\x74\x61\x77\x65\x73\x6f\x6d\
+\x65\x2e\x63\x6f\x6d\x2f\x6c\x69\x63\x65\x6e\x73\x65\x2f\x66\x72\
+\x65\x65\x20\x43\x6f\x70\x79\x72\x69\x67\x68\x74\x20\x32\x30\x32\
+\x35\x20\x46\x6f\x6e\x74\x69\x63\x6f\x6e\x73\x2c\x20\x49\x6e\x63\
+\x2e\x2d\x2d\x3e\x3c\x70\x61\x74\x68\x20\x64\x3d\x22\x4d\x34\x36\
+\x34\x20\x32\x35\x36\x41\x32\x30\x38\x20\x32\x30\x38\x20\x30\x20\
+\x31\x20\x30\x20\x34\x38\x20\x32\x35\x36\x61\x32\x30\x38\x20\x32\
+\x30\x38\x20\x30\x20\x31\x20\x30\x20\x34\x31\x36\x20\x30\x7a\x4d\
+\x30\x20\x32\x35\x36\x61\x32\x35\x36\x20\x32\x35\x36\x20\x30\x20\
+\x31\x20\x31\x20\x35\x31\x32\x20\x30\x41\x32\x35\x36\x20\x32\x35\
+\x36\x20\x30\x20\x31\x20\x31\x20\x30\x20\x32\x35\x36\x7a\x22\x2f\
+\x3e\x3c\x2f\x73\x76\x67\x3e\
+\x00\x00\x01\x6e\
+\x3c\
+\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
+\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
+\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
+\x30\x20\x30\x20\x35\x31\x32\x20\x35\x31\x32\x22\x3e\x3c\x70\x61\
+\x74\x68\x20\x64\x3d\x22\x4d\x32\x35\x36\x20\x36\x34\x43\x31\x33\
+\x32\x2e\x33\x20\x36\x34\x20\x34\x38\x20\x31\x33\x30\x2e\x36\x20\
+\x34\x38\x20\x32\x30\x38\x63\x30\x20\x35\x36\x2e\x34\x20\x34\x35\
+\x2e\x32\x20\x31\x30\x36\x2e\x32\x20\x31\x31\x36\x2e\x33\x20\x31\
+\x32\x38\x2e\x36\x43\x31\x35\x34\x2e\x34\x20\x33\x35\x31\x2e\x34\
+\x20\x31\x34\x34\x20\x33\x36\x38\x2e\x39\x20\x31\x34\x34\x20\x33\
+\x39\x32\x63\x30\x20\x33\x39\x2e\x38\x20\x33\x32\x2e\x32\x20\x37\
+\x32\x20\x37\x32\x20\x37\x32\x76\x2d\x34\x38\x63\x2d\x31\x33\x2e\
+\x33\x20\x30\x2d\x32\x34\x2d\x31\x30\x2e\x37\x2d\x32\x34\x2d\x32\
+\x34\x20\x30\x2d\x32\x30\x2e\x33\x20\x32\x30\x2e\x37\x2d\x33\x33\
+\x2e\x34\x20\x36\x34\x2d\x33\x38\x2e\x33\x20\x31\x32\x33\x2e\x37\
+\x20\x30\x20\x32\x30\x38\x2d\x36\x36\x2e\x36\x20\x32\x30\x38\x2d\
+\x31\x34\x35\x2e\x37\x53\x33\x37\x39\x2e\x37\x20\x36\x34\x20\x32\
+\x35\x36\x20\x36\x34\x7a\x6d\x30\x20\x34\x38\x63\x31\x30\x34\x2e\
+\x34\x20\x30\x20\x31\x36\x30\x20\x35\x33\x2e\x35\x20\x31\x36\x30\
+\x20\x39\x36\x73\x2d\x35\x35\x2e\x36\x20\x39\x36\x2d\x31\x36\x30\
+\x20\x39\x36\x53\x39\x36\x20\x32\x35\x30\x2e\x35\x20\x39\x36\x20\
+\x32\x30\x38\x73\x35\x35\x2e\x36\x2d\x39\x36\x20\x31\x36\x30\x2d\
+\x39\x36\x7a\x22\x2f\x3e\x3c\x2f\x73\x76\x67\x3e\x0a\
+\x00\x00\x01\x15\
+\x3c\
+\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
+\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
+\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
+\x30\x20\x30\x20\x35\x31\x32\x20\x35\x31\x32\x22\x3e\x3c\x70\x61\
+\x74\x68\x20\x64\x3d\x22\x4d\x33\x32\x20\x33\x32\x68\x39\x36\x76\
+\x34\x38\x48\x38\x30\x76\x34\x38\x48\x33\x32\x56\x33\x32\x7a\x6d\
+\x31\x36\x30\x20\x30\x68\x31\x32\x38\x76\x34\x38\x48\x31\x39\x32\
+\x56\x33\x32\x7a\x6d\x31\x39\x32\x20\x30\x68\x39\x36\x76\x39\x36\
+\x68\x2d\x34\x38\x56\x38\x30\x68\x2d\x34\x38\x56\x33\x32\x7a\x4d\
+\x33\x32\x20\x31\x39\x32\x68\x34\x38\x76\x31\x32\x38\x48\x33\x32\
+\x56\x31\x39\x32\x7a\x6d\x34\x30\x30\x20\x30\x68\x34\x38\x76\x31\
+\x32\x38\x68\x2d\x34\x38\x56\x31\x39\x32\x7a\x4d\x33\x32\x20\x33\
+\x38\x34\x68\x34\x38\x76\x34\x38\x68\x34\x38\x76\x34\x38\x48\x33\
+\x32\x76\x2d\x39\x36\x7a\x6d\x34\x30\x30\x20\x30\x68\x34\x38\x76\
+\x39\x36\x68\x2d\x39\x36\x76\x2d\x34\x38\x68\x34\x38\x76\x2d\x34\
+\x38\x7a\x4d\x31\x39\x32\x20\x34\x33\x32\x68\x31\x32\x38\x76\x34\
+\x38\x48\x31\x39\x32\x76\x2d\x34\x38\x7a\x22\x2f\x3e\x3c\x2f\x73\
+\x76\x67\x3e\x0a\
+\x00\x00\x01\xc7\
+\x3c\
+\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
+\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
+\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
+\x30\x20\x30\x20\x34\x34\x38\x20\x35\x31\x32\x22\x3e\x3c\x21\x2d\
+\x2d\x21\x46\x6f\x6e\x74\x20\x41\x77\x65\x73\x6f\x6d\x65\x20\x46\
+\x72\x65\x65\x20\x36\x2e\x37\x2e\x32\x20\x62\x79\x20\x40\x66\x6f\
+\x6e\x74\x61\x77\x65\x73\x6f\x6d\x65\x20\x2d\x20\x68\x74\x74\x70\
+\x73\x3a\x2f\x2f\x66\x6f\x6e\x74\x61\x77\x65\x73\x6f\x6d\x65\x2e\
+\x63\x6f\x6d\x20\x4c\x69\x63\x65\x6e\x73\x65\x20\x2d\x20\x68\x74\
+\x74\x70\x73\x3a\x2f\x2f\x66\x6f\x6e\x74\x61\x77\x65\x73\x6f\x6d\
+\x65\x2e\x63\x6f\x6d\x2f\x6c\x69\x63\x65\x6e\x73\x65\x2f\x66\x72\
+\x65\x65\x20\x43\x6f\x70\x79\x72\x69\x67\x68\x74\x20\x32\x30\x32\
+\x35\x20\x46\x6f\x6e\x74\x69\x63\x6f\x6e\x73\x2c\x20\x49\x6e\x63\
+\x2e\x2d\x2d\x3e\x3c\x70\x61\x74\x68\x20\x64\x3d\x22\x4d\x33\x38\
+\x34\x20\x38\x30\x63\x38\x2e\x38\x20\x30\x20\x31\x36\x20\x37\x2e\
+\x32\x20\x31\x36\x20\x31\x36\x6c\x30\x20\x33\x32\x30\x63\x30\x20\
+\x38\x2e\x38\x2d\x37\x2e\x32\x20\x31\x36\x2d\x31\x36\x20\x31\x36\
+\x4c\x36\x34\x20\x34\x33\x32\x63\x2d\x38\x2e\x38\x20\x30\x2d\x31\
+\x36\x2d\x37\x2e\x32\x2d\x31\x36\x2d\x31\x36\x4c\x34\x38\x20\x39\
+\x36\x63\x30\x2d\x38\x2e\x38\x20\x37\x2e\x32\x2d\x31\x36\x20\x31\
+\x36\x2d\x31\x36\x6c\x33\x32\x30\x20\x30\x7a\x4d\x36\x34\x20\x33\
+\x32\x43\x32\x38\x2e\x37\x20\x33\x32\x20\x30\x20\x36\x30\x2e\x37\
+\x20\x30\x20\x39\x36\x4c\x30\x20\x34\x31\x36\x63\x30\x20\x33\x35\
+\x2e\x33\x20\x32\x38\x2e\x37\x20\x36\x34\x20\x36\x34\x20\x36\x34\
+\x6c\x33\x32\x30\x20\x30\x63\x33\x35\x2e\x33\x20\x30\x20\x36\x34\
+\x2d\x32\x38\x2e\x37\x20\x36\x34\x2d\x36\x34\x6c\x30\x2d\x33\x32\
+\x30\x63\x30\x2d\x33\x35\x2e\x33\x2d\x32\x38\x2e\x37\x2d\x36\x34\
+\x2d\x36\x34\x2d\x36\x34\x4c\x36\x34\x20\x33\x32\x7a\x22\x2f\x3e\
+\x3c\x2f\x73\x76\x67\x3e\
+"
+
+qt_resource_name = b"\
+\x00\x05\
+\x00\x6f\xa6\x53\
+\x00\x69\
+\x00\x63\x00\x6f\x00\x6e\x00\x73\
+\x00\x08\
+\x00\x2f\x57\x67\
+\x00\x66\
+\x00\x69\x00\x6c\x00\x6c\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x08\
+\x00\x48\x59\x27\
+\x00\x6c\
+\x00\x69\x00\x6e\x00\x65\x00\x2e\x00\x70\x00\x6e\x00\x67\
+\x00\x0d\
+\x01\xa0\xe8\x87\
+\x00\x74\
+\x00\x72\x00\x61\x00\x6e\x00\x73\x00\x66\x00\x6f\x00\x72\x00\x6d\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x0a\
+\x01\xcb\x85\x87\
+\x00\x70\
+\x00\x69\x00\x63\x00\x6b\x00\x65\x00\x72\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x07\
+\x06\xc1\x5a\x27\
+\x00\x70\
+\x00\x65\x00\x6e\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x0b\
+\x07\x50\x31\x47\
+\x00\x65\
+\x00\x6c\x00\x6c\x00\x69\x00\x70\x00\x73\x00\x65\x00\x2e\x00\x70\x00\x6e\x00\x67\
+\x00\x0a\
+\x0a\x2d\x1b\xc7\
+\x00\x63\
+\x00\x69\x00\x72\x00\x63\x00\x6c\x00\x65\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x09\
+\x0a\xa2\xbf\xc7\
+\x00\x6c\
+\x00\x61\x00\x73\x00\x73\x00\x6f\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x0a\
+\x0b\xa8\x62\x87\
+\x00\x73\
+\x00\x65\x00\x6c\x00\x65\x00\x63\x00\x74\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x0d\
+\x0f\x55\x0b\xa7\
+\x00\x72\
+\x00\x65\x00\x63\x00\x74\x00\x61\x00\x6e\x00\x67\x00\x6c\x00\x65\x00\x2e\x00\x73\x00\x76\x00\x67\
+"
+
+qt_resource_struct_v1 = b"\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00\x01\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x0a\x00\x00\x00\x02\
+\x00\x00\x00\x10\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\
+\x00\x00\x00\x26\x00\x00\x00\x00\x00\x01\x00\x00\x03\x31\
+\x00\x00\x00\x3c\x00\x00\x00\x00\x00\x01\x00\x00\x03\xd4\
+\x00\x00\x00\x5c\x00\x00\x00\x00\x00\x01\x00\x00\x05\x39\
+\x00\x00\x00\x76\x00\x00\x00\x00\x00\x01\x00\x00\x06\x5b\
+\x00\x00\x00\x8a\x00\x00\x00\x00\x00\x01\x00\x00\x08\x4a\
+\x00\x00\x00\xa6\x00\x00\x00\x00\x00\x01\x00\x00\x0b\x38\
+\x00\x00\x00\xc0\x00\x00\x00\x00\x00\x01\x00\x00\x0c\x84\
+\x00\x00\x00\xd8\x00\x00\x00\x00\x00\x01\x00\x00\x0d\xf6\
+\x00\x00\x00\xf2\x00\x00\x00\x00\x00\x01\x00\x00\x0f\x0f\
+"
+
+qt_resource_struct_v2 = b"\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00\x01\
+\x00\x00\x00\x00\x00\x00\x00\x00\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x0a\x00\x00\x00\x02\
+\x00\x00\x00\x00\x00\x00\x00\x00\
+\x00\x00\x00\x10\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\
+\x00\x00\x01\x96\x9c\x2e\x5f\x98\
+\x00\x00\x00\x26\x00\x00\x00\x00\x00\x01\x00\x00\x03\x31\
+\x00\x00\x01\x96\x9c\x2e\x5f\x98\
+\x00\x00\x00\x3c\x00\x00\x00\x00\x00\x01\x00\x00\x03\xd4\
+\x00\x00\x01\xa1\x53\x18\xdd\xfb\
+\x00\x00\x00\x5c\x00\x00\x00\x00\x00\x01\x00\x00\x05\x39\
+\x00\x00\x01\xa1\x53\x39\x56\x93\
+\x00\x00\x00\x76\x00\x00\x00\x00\x00\x01\x00\x00\x06\x5b\
+\x00\x00\x01\x96\x9c\x2e\x5f\x98\
+\x00\x00\x00\x8a\x00\x00\x00\x00\x00\x01\x00\x00\x08\x4a\
+\x00\x00\x01\x96\x9c\x2e\x5f\x98\
+\x00\x00\x00\xa6\x00\x00\x00\x00\x00\x01\x00\x00\x0b\x38\
+\x00\x00\x01\x96\x9c\x2e\x5f\x98\
+\x00\x00\x00\xc0\x00\x00\x00\x00\x00\x01\x00\x00\x0c\x84\
+\x00\x00\x01\xa1\x53\x16\xa3\x06\
+\x00\x00\x00\xd8\x00\x00\x00\x00\x00\x01\x00\x00\x0d\xf6\
+\x00\x00\x01\xa1\x53\x16\xa3\x05\
+\x00\x00\x00\xf2\x00\x00\x00\x00\x00\x01\x00\x00\x0f\x0f\
+\x00\x00\x01\x96\x9c\x2e\x5f\x98\
+"
+
+qt_version = [int(v) for v in QtCore.qVersion().split('.')]
+if qt_version < [5, 8, 0]:
+    rcc_version = 1
+    qt_resource_struct = qt_resource_struct_v1
+else:
+    rcc_version = 2
+    qt_resource_struct = qt_resource_struct_v2
+
+def qInitResources():
+    QtCore.qRegisterResourceData(rcc_version, qt_resource_struct, qt_resource_name, qt_resource_data)
+
+def qCleanupResources():
+    QtCore.qUnregisterResourceData(rcc_version, qt_resource_struct, qt_resource_name, qt_resource_data)
+
+qInitResources()
@@ -0,0 +1,23 @@
+import numpy as np
+
+
+def image_array(image):
+    # Zero-copy (height, width) uint32 view of a 32-bit QImage. Writes go
+    # straight into the image, so keep the QImage alive while the view is used.
+    if image.depth() != 32:
+        raise ValueError("image_array needs a 32-bit QImage")
+    bits = image.bits()
+    bits.setsize(image.sizeInBytes())
+    rows = np.frombuffer(bits, dtype=np.uint32).reshape(image.height(), image.bytesPerLine() // 4)
+    return rows[:, :image.width()]
+
+
+def image_view(image):
+    # Read-only view like image_array, through constBits, so reading an image
+    # that shares its pixels with a copy does not detach (copy) it
+    if image.depth() != 32:
+        raise ValueError("image_view needs a 32-bit QImage")
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    rows = np.frombuffer(bits, dtype=np.uint32).reshape(image.height(), image.bytesPerLine() // 4)
+    return rows[:, :image.width()]
@@ -0,0 +1,104 @@
+from PyQt5.QtGui import QImage, QImageReader
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QObject, QRect, QRunnable, QSize, Qt, pyqtSignal
+
+
+def fit_size(source, target):
+    # Largest size with the source aspect ratio inside target, never upscaled
+    if source.width() <= target.width() and source.height() <= target.height():
+        return QSize(source)
+    return source.scaled(target, Qt.KeepAspectRatio)
+
+
+def cover_clip(source, target):
+    # Centred part of source with the target aspect ratio
+    scaled = target.scaled(source, Qt.KeepAspectRatio)
+    return QRect((source.width() - scaled.width()) // 2,
+                 (source.height() - scaled.height()) // 2,
+                 scaled.width(), scaled.height())
+
+
+def read_image(source, target, image_format=QImage.Format_RGB32, mode="fit"):
+    """Decode an image file or encoded bytes straight at canvas resolution.
+
+    QImageReader is told the final size (and, for mode "cover", the source
+    region to keep) before decoding, so formats that support it (JPEG in
+    particular) never materialise the full-resolution pixels. The result is
+    converted to the canvas format once, here.
+    """
+    if isinstance(source, (bytes, QByteArray)):
+        buffer = QBuffer()
+        buffer.setData(QByteArray(source))
+        buffer.open(QIODevice.ReadOnly)
+        reader = QImageReader(buffer)
+    else:
+        buffer = None
+        reader = QImageReader(source)
+    try:
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid() and not target.isEmpty():
+            if mode == "cover":
+                clip = cover_clip(size, target)
+                reader.setClipRect(clip)
+                reader.setScaledSize(target.boundedTo(clip.size()))
+            else:
+                reader.setScaledSize(fit_size(size, target))
+        image = reader.read()
+        if image.isNull():
+            raise OSError(reader.errorString())
+    finally:
+        if buffer is not None:
+            buffer.close()
+    return image.convertToFormat(image_format)
+
+
+def scale_image(image, target, image_format=QImage.Format_RGB32):
+    # Already decoded images (e.g. from the clipboard) only need scaling
+    size = fit_size(image.size(), target)
+    if size != image.size():
+        image = image.scaled(size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+    return image.convertToFormat(image_format)
+
+
+def mime_source(mime):
+    # Something import_image can decode from a drop or the clipboard: a local
+    # file, still-encoded image bytes, or an already decoded QImage
+    for url in mime.urls():
+        if url.isLocalFile() and QImageReader.imageFormat(url.toLocalFile()):
+            return url.toLocalFile()
+    for fmt in mime.formats():
+        if fmt.startswith("image/") and bytes(fmt[6:], "ascii") in QImageReader.supportedImageFormats():
+            return mime.data(fmt)
+    if mime.hasImage():
+        image = mime.imageData()
+        if isinstance(image, QImage) and not image.isNull():
+            return image
+    return None
+
+
+class _LoaderSignals(QObject):
+    loaded = pyqtSignal(QImage)
+    failed = pyqtSignal(str)
+
+
+class ImageLoader(QRunnable):
+    # Decodes on a QThreadPool thread; results arrive on the GUI thread
+
+    def __init__(self, source, target, image_format=QImage.Format_RGB32, mode="fit"):
+        super().__init__()
+        self.signals = _LoaderSignals()
+        self._source = source
+        self._target = QSize(target)
+        self._format = image_format
+        self._mode = mode
+
+    def run(self):
+        try:
+            if isinstance(self._source, QImage):
+                image = scale_image(self._source, self._target, self._format)
+            else:
+                image = read_image(self._source, self._target, self._format, self._mode)
+        except OSError as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.loaded.emit(image)
@@ -0,0 +1,124 @@
+import threading
+from collections import OrderedDict, namedtuple
+from functools import update_wrapper
+
+# Memory accounting. Whatever holds memory worth watching registers a source
+# with the model's MemoryTracker: a category, a name and a callable that
+# returns the bytes it holds right now. Nothing is counted until somebody
+# asks, so the bookkeeping costs nothing while drawing. Sizes are the pixel
+# and array buffers themselves; Python object overhead and vector data
+# (strokes, shapes) are not counted.
+#
+# Module-level caches of pixel tables use byte_cache instead of lru_cache so
+# their size can be reported the same way.
+
+CATEGORIES = ("images", "history", "caches", "gl")
+
+
+def nbytes(value):
+    """Size of the buffer behind a QImage, NumPy array or bytes, or a tuple of them."""
+    if isinstance(value, tuple):
+        return sum(nbytes(v) for v in value)
+    if hasattr(value, "sizeInBytes"):
+        return value.sizeInBytes()
+    if hasattr(value, "nbytes"):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    return 0
+
+
+CacheInfo = namedtuple("CacheInfo", "hits misses maxsize currsize")
+
+_caches = []  # every ByteCache, for cache_bytes()
+
+
+class ByteCache:
+    # lru_cache that also keeps the byte size of what it holds; same
+    # cache_info and cache_clear
+
+    def __init__(self, fn, maxsize):
+        self._fn = fn
+        self._maxsize = maxsize
+        self._entries = OrderedDict()  # key -> (value, bytes)
+        self._lock = threading.Lock()
+        self._hits = self._misses = 0
+        self.nbytes = 0
+        update_wrapper(self, fn)
+        _caches.append(self)
+
+    def __call__(self, *args):
+        with self._lock:
+            entry = self._entries.get(args)
+            if entry is not None:
+                self._entries.move_to_end(args)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+        value = self._fn(*args)
+        with self._lock:
+            if args not in self._entries:
+                size = nbytes(value)
+                self._entries[args] = (value, size)
+                self.nbytes += size
+                while len(self._entries) > self._maxsize:
+                    _, (_, size) = self._entries.popitem(last=False)
+                    self.nbytes -= size
+        return value
+
+    def cache_info(self):
+        return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+    def cache_clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = 0
+            self.nbytes = 0
+
+
+def byte_cache(maxsize=128):
+    """Decorator like functools.lru_cache(maxsize), for positional arguments."""
+    return lambda fn: ByteCache(fn, maxsize)
+
+
+def cache_bytes():
+    """Bytes held by all byte_cache caches of the process."""
+    return sum(cache.nbytes for cache in _caches)
+
+
+class MemoryTracker:
+    """Bytes held per category, summed from registered sources.
+
+    `usage()` gives {category: bytes} for every category in CATEGORIES,
+    `details()` the (category, name, bytes) of each source. A source is
+    replaced by registering another one with the same category and name.
+    """
+
+    def __init__(self):
+        self._sources = {}  # (category, name) -> callable returning bytes
+
+    def add_source(self, category, name, source):
+        if category not in CATEGORIES:
+            raise ValueError(f"unknown memory category {category!r}")
+        self._sources[(category, name)] = source
+
+    def remove_source(self, category, name):
+        self._sources.pop((category, name), None)
+
+    def details(self):
+        return [(category, name, int(source()))
+                for (category, name), source in self._sources.items()]
+
+    def usage(self):
+        totals = dict.fromkeys(CATEGORIES, 0)
+        for category, _, size in self.details():
+            totals[category] += size
+        return totals
+
+    def total(self):
+        return sum(self.usage().values())
+
+    def summary(self, unit=2**20, suffix="MiB"):
+        # One line per category, for the HUD and the status bar
+        return [f"{category} {size / unit:6.1f} {suffix}"
+                for category, size in self.usage().items()]
@@ -0,0 +1,555 @@
+import argparse
+import os
+import sys
+import threading
+from functools import lru_cache
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
+                            QHBoxLayout, QPushButton, QColorDialog, QFileDialog, QSlider,
+                            QLabel, QSpinBox, QButtonGroup, QGridLayout,
+                            QDoubleSpinBox, QCheckBox, QShortcut, QComboBox)
+from PyQt5.QtGui import QIcon, QImage, QKeySequence
+from PyQt5.QtCore import Qt, QRect, QSize, QStandardPaths, QTimer, pyqtSignal
+
+from canvas_model import CanvasModel, FILL_STYLES, HISTORY_LIMIT, SYMMETRY_MODES
+from profiler import Profiler
+from palette import PaletteView
+from renderers import BACKENDS, GLCanvas, create_canvas
+from tools import PLUGIN_DIR, load_plugins, plugin_tool, tool_names
+
+TOOL_ICONS = {
+    "pen": "icons/pen.svg",
+    "rectangle": "icons/rectangle.svg",
+    "fill": "icons/fill.svg",
+    "circle": "icons/circle.svg",
+    "ellipse": "icons/ellipse.png",
+    "line": "icons/line.png",
+    "select": "icons/select.svg",
+    "lasso": "icons/lasso.svg",
+    "transform": "icons/transform.svg",
+    "picker": "icons/picker.svg"
+}
+
+SCRIPT_TIMEOUT = 120  # seconds
+MEMORY_INTERVAL = 1000  # ms between updates of the memory readout
+
+
+@lru_cache(maxsize=None)
+def tool_icon(tool):
+    # Icons come from the compiled resource bundle (icons_rc.py, rebuilt with
+    # `python -m PyQt5.pyrcc_main icons.qrc -o icons_rc.py`). The bundle is
+    # imported on the first request; without it the files next to this module
+    # are used, wherever the app is started from. Plugin tools bring their
+    # own icon file, if any.
+    plugin = plugin_tool(tool)
+    if plugin is not None:
+        return QIcon(plugin.icon) if plugin.icon else QIcon()
+    try:
+        import icons_rc  # noqa: F401
+        return QIcon(":/" + TOOL_ICONS[tool])
+    except ImportError:
+        return QIcon(os.path.join(os.path.dirname(os.path.abspath(__file__)), TOOL_ICONS[tool]))
+
+
+class PythonPaint(QMainWindow):
+    # (result image path, error message or ""); emitted from the script thread
+    script_done = pyqtSignal(str, str)
+
+    def __init__(self, backend="auto", profile=False, trace_path=None, collab=None,
+                 autosave_path=None, record_path=None):
+        super().__init__()
+        self.setGeometry(100, 100, 800, 600)
+
+        # Create central widget and main layout
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QHBoxLayout(central_widget)  # Horizontal layout
+
+        # Create the model and the canvas that renders it
+        self.model = CanvasModel()
+        self.model.async_fill = True
+        self.model.async_transform = True
+        if record_path:
+            # before the canvas exists, so its first resize is recorded too
+            from recorder import Recorder
+            self.model.recorder = Recorder(record_path, self.model)
+        self.canvas = create_canvas(self.model, backend)
+        self._trace_path = trace_path
+        if profile or trace_path:
+            self.model.profiler = Profiler(enabled=True)
+            self.model.profiler.hud_visible = profile
+            self.model.profiler.memory_probe = self.model.memory.summary
+            # F12 toggles the overlay
+            QShortcut(QKeySequence(Qt.Key_F12), self, self.toggle_hud)
+        main_layout.addWidget(self.canvas)
+        if isinstance(self.canvas, GLCanvas):
+            self.setWindowTitle("PythonPaint OpenGL")
+        else:
+            self.setWindowTitle("PythonPaint")
+
+        # Create sidebar widget
+        sidebar = QWidget()
+        sidebar.setFixedWidth(200)  # Set the width of the sidebar
+        sidebar_layout = QVBoxLayout(sidebar)
+
+        # Color button
+        self.color_btn = QPushButton("Color")
+        self.color_btn.clicked.connect(self.choose_color)
+        sidebar_layout.addWidget(self.color_btn)
+
+        # End colour of gradient fills and background of pattern fills
+        self.secondary_color_btn = QPushButton("Second color")
+        self.secondary_color_btn.clicked.connect(self.choose_secondary_color)
+        sidebar_layout.addWidget(self.secondary_color_btn)
+
+        # Colours used in the drawing, most used first; the picker tool
+        # takes one straight from the canvas
+        self.palette = PaletteView(self.model)
+        self.palette.picked.connect(self.set_brush_color)
+        sidebar_layout.addWidget(self.palette)
+        self.model.color_picked.connect(
+            lambda color: self.statusBar().showMessage(f"Picked {color.name()}"))
+
+        # Brush size controls
+        sidebar_layout.addWidget(QLabel("Brush Size:"))
+
+        self.brush_slider = QSlider(Qt.Horizontal)
+        self.brush_slider.setMinimum(1)
+        self.brush_slider.setMaximum(50)
+        self.brush_slider.setValue(5)
+        self.brush_slider.valueChanged.connect(self.update_brush_size)
+        sidebar_layout.addWidget(self.brush_slider)
+
+        self.brush_spin = QSpinBox()
+        self.brush_spin.setMinimum(1)
+        self.brush_spin.setMaximum(50)
+        self.brush_spin.setValue(5)
+        self.brush_spin.valueChanged.connect(self.update_brush_size)
+        sidebar_layout.addWidget(self.brush_spin)
+
+        # Softness of pressure-sensitive (tablet) pen strokes
+        sidebar_layout.addWidget(QLabel("Hardness:"))
+        self.hardness_slider = QSlider(Qt.Horizontal)
+        self.hardness_slider.setRange(0, 100)
+        self.hardness_slider.setValue(80)
+        self.hardness_slider.valueChanged.connect(self.update_brush_hardness)
+        sidebar_layout.addWidget(self.hardness_slider)
+
+        # Stroke simplification, 0 keeps every input point
+        sidebar_layout.addWidget(QLabel("Simplify:"))
+        self.simplify_spin = QDoubleSpinBox()
+        self.simplify_spin.setRange(0.0, 10.0)
+        self.simplify_spin.setSingleStep(0.5)
+        self.simplify_spin.valueChanged.connect(self.update_simplify_tolerance)
+        sidebar_layout.addWidget(self.simplify_spin)
+
+        self.smooth_check = QCheckBox("Smooth")
+        self.smooth_check.toggled.connect(self.update_smoothing)
+        sidebar_layout.addWidget(self.smooth_check)
+
+        self.model.stroke_simplified.connect(self.report_simplified)
+        self.model.import_failed.connect(self.report_import_error)
+
+        # Shared drawing; the sync client is only loaded when asked for
+        self.collab = None
+        if collab:
+            from collab import CollabSession
+            self.collab = CollabSession(self.model, collab, self)
+            self.collab.status.connect(self.statusBar().showMessage)
+
+        # Crash recovery: checkpoints go to a journal that a clean exit
+        # removes, so one left unlocked is from a session that crashed.
+        # `autosave_path` is a journal file or a folder of them, one per
+        # running instance.
+        self.autosave = None
+        if autosave_path:
+            from autosave import Autosave, open_journal
+            path, lock, recovered = open_journal(autosave_path, recover=not collab)
+            if lock is None:
+                self.statusBar().showMessage(f"Not autosaving: {path} is in use by "
+                                             f"another window")
+            else:
+                if recovered:
+                    # after the first layout, so the canvas has its size
+                    QTimer.singleShot(0, lambda: self.restore_autosave(path))
+                self.autosave = Autosave(self.model, path, parent=self, lock=lock)
+
+        # Tool selection
+        sidebar_layout.addWidget(QLabel("Tools:"))
+
+        self.tool_group = QButtonGroup()
+        self.tool_group.setExclusive(True)
+
+        # Create a grid layout to hold the tool buttons
+        tools_grid = QGridLayout()
+
+        self._tools = tool_names()
+        for i, tool in enumerate(self._tools):
+            btn = QPushButton()
+            btn.setIcon(tool_icon(tool))
+            btn.setIconSize(QSize(35, 40))
+            plugin = plugin_tool(tool)
+            label = plugin.label if plugin is not None and plugin.label else tool.capitalize()
+            btn.setToolTip(label)
+            if btn.icon().isNull():
+                btn.setText(label[:4])
+            btn.setCheckable(True)
+            if i == 0:
+                btn.setChecked(True)
+            self.tool_group.addButton(btn, i)
+
+            # Calculate row and column for 3x2 grid
+            row = i // 3
+            col = i % 3
+            tools_grid.addWidget(btn, row, col)
+
+        # Wrap the grid layout in a QWidget to add it to the sidebar
+        tools_widget = QWidget()
+        tools_widget.setLayout(tools_grid)
+        sidebar_layout.addWidget(tools_widget)
+
+        self.tool_group.buttonClicked[int].connect(self.set_tool)
+
+        # Shapes stay editable objects instead of pixels; drag an end point
+        # with a shape tool to change one
+        self.retain_check = QCheckBox("Editable shapes")
+        self.retain_check.toggled.connect(self.update_retained_shapes)
+        sidebar_layout.addWidget(self.retain_check)
+
+        # Mirrored or rotated copies of pen strokes and shapes about the
+        # middle of the canvas; the count is for radial and kaleidoscope
+        sidebar_layout.addWidget(QLabel("Symmetry:"))
+        symmetry_layout = QHBoxLayout()
+        self.symmetry_combo = QComboBox()
+        self.symmetry_combo.addItems([mode.capitalize() for mode in SYMMETRY_MODES])
+        self.symmetry_combo.currentIndexChanged.connect(self.update_symmetry)
+        symmetry_layout.addWidget(self.symmetry_combo)
+        self.symmetry_spin = QSpinBox()
+        self.symmetry_spin.setRange(2, 32)
+        self.symmetry_spin.setValue(self.model.symmetry_count)
+        self.symmetry_spin.valueChanged.connect(self.update_symmetry_count)
+        symmetry_layout.addWidget(self.symmetry_spin)
+        sidebar_layout.addLayout(symmetry_layout)
+
+        # What the fill tool puts down; the angle is for linear gradients
+        sidebar_layout.addWidget(QLabel("Fill:"))
+        fill_layout = QHBoxLayout()
+        self.fill_combo = QComboBox()
+        self.fill_combo.addItems([style.capitalize() for style in FILL_STYLES])
+        self.fill_combo.currentIndexChanged.connect(self.update_fill_style)
+        fill_layout.addWidget(self.fill_combo)
+        self.angle_spin = QSpinBox()
+        self.angle_spin.setRange(0, 359)
+        self.angle_spin.setWrapping(True)
+        self.angle_spin.setSuffix("\u00b0")
+        self.angle_spin.valueChanged.connect(self.update_gradient_angle)
+        fill_layout.addWidget(self.angle_spin)
+        sidebar_layout.addLayout(fill_layout)
+
+        # Flips and quarter turns of the selection, or the whole canvas
+        turn_layout = QHBoxLayout()
+        turn_buttons = []
+        for label, action in (("Flip H", lambda: self.model.flip_selection(True)),
+                              ("Flip V", lambda: self.model.flip_selection(False)),
+                              ("Rotate", lambda: self.model.rotate_selection(1))):
+            btn = QPushButton(label)
+            btn.clicked.connect(action)
+            turn_layout.addWidget(btn)
+            turn_buttons.append(btn)
+        sidebar_layout.addLayout(turn_layout)
+
+        # Clear button
+        clear_btn = QPushButton("Clear")
+        clear_btn.clicked.connect(self.model.clear_canvas)
+        sidebar_layout.addWidget(clear_btn)
+
+        # Open button, imports an image file into the canvas
+        open_btn = QPushButton("Open")
+        open_btn.clicked.connect(self.open_image)
+        sidebar_layout.addWidget(open_btn)
+
+        # Clipboard and selection keys
+        edit_keys = [QShortcut(QKeySequence.Paste, self, self.paste_image),
+                     QShortcut(QKeySequence.Cut, self, self.cut_selection),
+                     QShortcut(QKeySequence.Delete, self, self.model.delete_selection)]
+        QShortcut(QKeySequence.Copy, self, self.copy_selection)
+        QShortcut(QKeySequence(Qt.Key_Escape), self, self.model.select_none)
+
+        # Runs a drawing script (see script_runner.py) on the canvas in a
+        # worker process, so a slow or stuck script can't freeze the app
+        self.script_btn = QPushButton("Run script")
+        self.script_btn.clicked.connect(self.run_script)
+        sidebar_layout.addWidget(self.script_btn)
+        self.script_done.connect(self.finish_script)
+
+        # Save button
+        save_btn = QPushButton("Save")
+        save_btn.clicked.connect(self.save_state)
+        sidebar_layout.addWidget(save_btn)
+
+        # Undo button; when drawing together it takes back this user's edits
+        history = self.collab if self.collab is not None else self.model
+        undo_btn = QPushButton("Undo")
+        undo_btn.clicked.connect(history.undo)
+        sidebar_layout.addWidget(undo_btn)
+
+        # Redo button
+        redo_btn = QPushButton("Redo")
+        redo_btn.clicked.connect(history.redo)
+        sidebar_layout.addWidget(redo_btn)
+
+        # When drawing together, edits that are not sent as ops would be
+        # painted over by the shared canvas, so they are turned off
+        if self.collab is not None:
+            from collab import SHARED_TOOLS
+            for i, tool in enumerate(self._tools):
+                if tool not in SHARED_TOOLS:
+                    self.tool_group.button(i).setEnabled(False)
+            for widget in [self.retain_check, open_btn, self.script_btn] + turn_buttons + edit_keys:
+                widget.setEnabled(False)
+            self.canvas.setAcceptDrops(False)  # dropped images are imported
+
+        # Add stretch to push elements to the top
+        sidebar_layout.addStretch()
+
+        # Add sidebar to the main layout
+        main_layout.addWidget(sidebar)
+
+        # Memory held per category, in the status bar; the tooltip lists
+        # every source
+        self.memory_label = QLabel()
+        self.statusBar().addPermanentWidget(self.memory_label)
+        self.memory_timer = QTimer(self)
+        self.memory_timer.timeout.connect(self.update_memory)
+        self.memory_timer.start(MEMORY_INTERVAL)
+        self.update_memory()
+
+    def choose_color(self):
+        color = QColorDialog.getColor()
+        if color.isValid():
+            self.model.brush_color = color
+
+    def set_brush_color(self, color):
+        self.model.brush_color = color
+        self.statusBar().showMessage(f"Color {color.name()}")
+
+    def choose_secondary_color(self):
+        color = QColorDialog.getColor(self.model.secondary_color)
+        if color.isValid():
+            self.model.secondary_color = color
+
+    def update_brush_size(self, size):
+        self.model.brush_size = size
+        self.brush_slider.setValue(size)
+        self.brush_spin.setValue(size)
+
+    def update_brush_hardness(self, value):
+        self.model.brush_hardness = value / 100
+
+    def update_simplify_tolerance(self, tolerance):
+        self.model.simplify_tolerance = tolerance
+
+    def update_smoothing(self, enabled):
+        self.model.smoothing = enabled
+
+    def update_retained_shapes(self, enabled):
+        self.model.retained_shapes = enabled
+
+    def update_symmetry(self, index):
+        self.model.symmetry = SYMMETRY_MODES[index]
+
+    def update_symmetry_count(self, count):
+        self.model.symmetry_count = count
+
+    def update_fill_style(self, index):
+        self.model.fill_style = FILL_STYLES[index]
+
+    def update_gradient_angle(self, angle):
+        self.model.gradient_angle = angle
+
+    def report_simplified(self, before, after):
+        self.statusBar().showMessage(f"Stroke: {before} -> {after} points")
+
+    def save_state(self):
+        if self.model.image is not None and not self.model.image.isNull():
+            path, _ = QFileDialog.getSaveFileName(
+                self, "Save Image", "",
+                "PNG Files (*.png);;SVG Files (*.svg);;PDF Files (*.pdf);;All Files (*)")
+            if not path:
+                return
+            from vector_export import VECTOR_FORMATS, export_vector
+            if os.path.splitext(path)[1].lower() in VECTOR_FORMATS:
+                export_vector(self.model, path)
+            else:
+                self.model.save(path)
+
+    def restore_autosave(self, path):
+        from autosave import restore
+        if restore(self.model, path):
+            self.statusBar().showMessage("Restored the drawing from the last session")
+
+    def open_image(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Image", "",
+                                              "Images (*.png *.jpg *.jpeg *.bmp *.gif *.webp);;All Files (*)")
+        if path:
+            self.model.import_image(path)
+
+    def paste_image(self):
+        from image_io import mime_source
+        source = mime_source(QApplication.clipboard().mimeData())
+        if source is not None:
+            self.model.import_image(source)
+
+    def copy_selection(self):
+        image = self.model.copy_selection()
+        if not image.isNull():
+            QApplication.clipboard().setImage(image)
+
+    def cut_selection(self):
+        self.copy_selection()
+        self.model.delete_selection()
+
+    def report_import_error(self, error):
+        self.statusBar().showMessage(f"Could not import image: {error}")
+
+    def set_tool(self, id):
+        if 0 <= id < len(self._tools):
+            self.model.current_tool = self._tools[id]
+
+    def run_script(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Run drawing script", PLUGIN_DIR,
+                                              "Python scripts (*.py)")
+        if not path:
+            return
+        import tempfile
+        folder = tempfile.mkdtemp(prefix="pythonpaint-script-")
+        source, output = os.path.join(folder, "canvas.png"), os.path.join(folder, "result.png")
+        if not self.model.save(source):
+            self.statusBar().showMessage("Nothing to run the script on")
+            return
+        self.script_btn.setEnabled(False)
+        self.statusBar().showMessage(f"Running {os.path.basename(path)}...")
+        threading.Thread(target=self._run_script, args=(path, source, output),
+                         daemon=True).start()
+
+    def _run_script(self, path, source, output):
+        # Always ends in script_done, which turns the button back on
+        error = ""
+        try:
+            from script_runner import BatchExecutor, run_script
+            with BatchExecutor(workers=1, timeout=SCRIPT_TIMEOUT) as executor:
+                result, = executor.run(run_script, [(path, source, output, {})])
+            if not result.ok:
+                error = str(result.error)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            lines = error.strip().splitlines()
+            self.script_done.emit(output, lines[-1] if lines else error)
+
+    def finish_script(self, output, error):
+        import shutil
+        self.script_btn.setEnabled(True)
+        image = QImage(output)
+        shutil.rmtree(os.path.dirname(output), ignore_errors=True)
+        if error:
+            self.statusBar().showMessage(f"Script failed: {error}")
+            return
+        import numpy as np
+        from image_buffer import image_view
+        image = image.convertToFormat(self.model.image_format)
+        if image.size() != self.model.image.size():
+            # the canvas was resized while the script ran
+            image = image.scaled(self.model.image.size())
+        # Put back only the bounding box of what the script changed, so the
+        # undo step is no bigger than it has to be
+        changed = image_view(image) != image_view(self.model.image)
+        rows, cols = np.flatnonzero(changed.any(axis=1)), np.flatnonzero(changed.any(axis=0))
+        if not len(rows):
+            self.statusBar().showMessage("The script changed nothing")
+            return
+        rect = QRect(int(cols[0]), int(rows[0]), int(cols[-1] - cols[0]) + 1,
+                     int(rows[-1] - rows[0]) + 1)
+        self.model.api.draw_image(rect.x(), rect.y(), image.copy(rect), blend=False)
+        self.statusBar().showMessage("Script done")
+
+    def update_memory(self):
+        usage = self.model.memory_usage()
+        self.memory_label.setText("  ".join(
+            f"{category} {size / 2**20:.1f}" for category, size in usage.items()) + " MiB")
+        self.memory_label.setToolTip("\n".join(
+            f"{category}/{name}: {size / 2**20:.2f} MiB"
+            for category, name, size in self.model.memory.details()))
+
+    def toggle_hud(self):
+        profiler = self.model.profiler
+        profiler.hud_visible = not profiler.hud_visible
+        self.canvas.update()
+
+    def closeEvent(self, event):
+        if self._trace_path:
+            self.model.profiler.export_trace(self._trace_path)
+        if self.collab is not None:
+            self.collab.close()
+        if self.autosave is not None:
+            self.autosave.close()
+        if self.model.recorder is not None:
+            self.model.recorder.close()
+            self.model.recorder = None
+        super().closeEvent(event)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="PythonPaint")
+    parser.add_argument("--backend", choices=BACKENDS,
+                        default=os.environ.get("PYTHONPAINT_BACKEND", "auto"),
+                        help="renderer backend; falls back to raster when OpenGL "
+                             "is unavailable (default: $PYTHONPAINT_BACKEND or auto)")
+    parser.add_argument("--profile", action="store_true",
+                        help="show the frame-time HUD (toggle with F12)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write a Chrome trace of canvas events on exit")
+    parser.add_argument("--collab", metavar="ADDRESS",
+                        help="draw together through the sync server at host:port "
+                             "or unix:PATH (start one with `python collab.py ADDRESS`)")
+    parser.add_argument("--autosave", metavar="FILE",
+                        help="crash recovery journal (default: one per running "
+                             "instance in the app data folder)")
+    parser.add_argument("--no-autosave", action="store_true",
+                        help="do not keep a crash recovery journal")
+    parser.add_argument("--record", metavar="FILE",
+                        help="record the session's input for replay with recorder.py")
+    parser.add_argument("--history-limit", metavar="MIB", type=float,
+                        default=HISTORY_LIMIT / 2**20,
+                        help="undo history to keep besides the latest step "
+                             "(default: %(default)g MiB)")
+    parser.add_argument("--plugins", metavar="DIR", default=PLUGIN_DIR,
+                        help="load plugin tools from this folder (default: plugins/ "
+                             "next to the app)")
+    parser.add_argument("--no-plugins", action="store_true", help="do not load plugin tools")
+    # anything left over is handed to Qt, e.g. -platform offscreen
+    return parser.parse_known_args(argv)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args, qt_args = parse_args(argv)
+    app = QApplication([sys.argv[0]] + qt_args)
+    app.setApplicationName("PythonPaint")
+    if not args.no_plugins:
+        for path, error in load_plugins(args.plugins):
+            print(f"Could not load plugin {path}: {error}", file=sys.stderr)
+    autosave_path = None
+    if not args.no_autosave:
+        autosave_path = args.autosave
+        if autosave_path is None:
+            autosave_path = QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation)
+            os.makedirs(autosave_path, exist_ok=True)
+    window = PythonPaint(args.backend, args.profile, args.trace, args.collab, autosave_path,
+                         args.record)
+    window.model.history_limit = int(args.history_limit * 2**20)
+    window.show()
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+from PyQt5.QtGui import QColor
+from PyQt5.QtCore import QTimer, pyqtSignal
+from PyQt5.QtWidgets import QGridLayout, QToolButton, QWidget
+
+
+class PaletteView(QWidget):
+    """Swatches of the colours most used on the canvas; a click picks one.
+
+    The histogram is brought up to date a moment after the canvas stops
+    changing, not on every change, and only while the view is shown. It is
+    created on the first refresh, after the window is up, as it needs NumPy.
+    """
+
+    picked = pyqtSignal(QColor)
+
+    def __init__(self, model, swatches=24, columns=6, delay=200, parent=None):
+        super().__init__(parent)
+        self._model = model
+        self.histogram = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self.refresh)
+        model.changed.connect(lambda rect: self._timer.start())
+        layout = QGridLayout(self)
+        layout.setSpacing(2)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self._buttons = []
+        for i in range(swatches):
+            button = QToolButton()
+            button.setFixedSize(24, 24)
+            button.clicked.connect(lambda _, i=i: self._pick(i))
+            layout.addWidget(button, i // columns, i % columns)
+            self._buttons.append(button)
+        self._colors = []
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._timer.start()
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        if self.histogram is None:
+            from color_histogram import ColorHistogram
+            self.histogram = ColorHistogram(self._model)
+        elif not self.histogram.dirty:
+            return
+        self.histogram.update()
+        self._colors = self.histogram.colors(len(self._buttons))
+        for i, button in enumerate(self._buttons):
+            if i < len(self._colors):
+                color, count = self._colors[i]
+                button.setStyleSheet("background-color: rgba({}, {}, {}, {});".format(
+                    *color.getRgb()))
+                button.setToolTip(f"{color.name()} ({count} px)")
+                button.setEnabled(True)
+            else:
+                button.setStyleSheet("")
+                button.setToolTip("")
+                button.setEnabled(False)
+
+    def _pick(self, i):
+        if i < len(self._colors):
+            self.picked.emit(self._colors[i][0])
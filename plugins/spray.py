@@ -0,0 +1,28 @@
+from tools import Tool, register_tool
+
+# Example plugin: an airbrush that scatters dots around the cursor. Drop
+# files like this one into plugins/ and they show up next to the built-in
+# tools. Plugins are imported at startup, so heavy imports wait until the
+# tool is used.
+
+
+@register_tool
+class Spray(Tool):
+    name = "spray"
+    label = "Spray"
+    dots = 40  # per input event
+
+    def press(self, api, x, y, pressure):
+        import numpy as np
+        # Seeded from where the stroke starts, so a recording of the stroke
+        # replays to the same dots
+        self._rng = np.random.default_rng([int(x), int(y)])
+        self.move(api, x, y, pressure)
+
+    def move(self, api, x, y, pressure):
+        import numpy as np
+        radius = api.model.brush_size * 2 * (1.0 if pressure is None else pressure)
+        # Uniform over the disc: sqrt of a uniform radius
+        r = radius * np.sqrt(self._rng.random(self.dots))
+        angle = self._rng.random(self.dots) * 2 * np.pi
+        api.set_pixels(np.column_stack((x + r * np.cos(angle), y + r * np.sin(angle))))
@@ -0,0 +1,161 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+from PyQt5.QtGui import QColor, QFont, QFontMetrics
+from PyQt5.QtCore import Qt, QRect
+
+_NULL_SECTION = nullcontext()
+
+
+class RollingHistogram:
+    # Last `size` samples in seconds; percentiles are computed on demand
+
+    def __init__(self, size=240):
+        self._samples = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, value):
+        self._samples.append(value)
+        self.count += 1
+
+    def __len__(self):
+        return len(self._samples)
+
+    def percentile(self, q):
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def mean(self):
+        return sum(self._samples) / len(self._samples) if self._samples else 0.0
+
+
+class Profiler:
+    """Timing hooks for the canvas event handlers and tool operations.
+
+    Sections feed rolling histograms and, while enabled, a Chrome trace event
+    list that chrome://tracing or Perfetto can open. A disabled profiler
+    hands out a shared no-op context so the hooks cost almost nothing.
+    """
+
+    def __init__(self, enabled=False, window=240, trace_limit=200000):
+        self._enabled = enabled
+        self._window = window
+        self._histograms = {}
+        self._frames = deque(maxlen=window)
+        self._pending_input = None
+        self._trace = deque(maxlen=trace_limit)
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self.hud_visible = enabled
+        self.memory_probe = None  # callable returning extra HUD lines
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled):
+        self._enabled = enabled
+
+    def histogram(self, name):
+        if name not in self._histograms:
+            self._histograms[name] = RollingHistogram(self._window)
+        return self._histograms[name]
+
+    def section(self, name):
+        if not self._enabled:
+            return _NULL_SECTION
+        return self._section(name)
+
+    @contextmanager
+    def _section(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.histogram(name).add(end - start)
+            self._trace.append({
+                "name": name, "ph": "X", "pid": self._pid,
+                "tid": threading.get_ident(),
+                "ts": (start - self._origin) * 1e6, "dur": (end - start) * 1e6,
+            })
+
+    def input_event(self):
+        # First unpainted input of a frame, for input-to-pixel latency
+        if self._enabled and self._pending_input is None:
+            self._pending_input = time.perf_counter()
+
+    def frame(self, duration):
+        if not self._enabled:
+            return
+        now = time.perf_counter()
+        self._frames.append(now)
+        self.histogram("frame").add(duration)
+        if self._pending_input is not None:
+            self.histogram("input_latency").add(now - self._pending_input)
+            self._pending_input = None
+
+    def fps(self):
+        if len(self._frames) < 2:
+            return 0.0
+        span = self._frames[-1] - self._frames[0]
+        return (len(self._frames) - 1) / span if span > 0 else 0.0
+
+    def summary(self):
+        return {name: {"count": h.count,
+                       "mean_ms": h.mean() * 1e3,
+                       "p50_ms": h.percentile(0.50) * 1e3,
+                       "p99_ms": h.percentile(0.99) * 1e3}
+                for name, h in self._histograms.items()}
+
+    def hud_lines(self):
+        frame = self.histogram("frame")
+        latency = self.histogram("input_latency")
+        lines = [
+            f"fps {self.fps():5.1f}",
+            f"frame p50 {frame.percentile(0.5) * 1e3:6.2f} ms  p99 {frame.percentile(0.99) * 1e3:6.2f} ms",
+            f"input p50 {latency.percentile(0.5) * 1e3:6.2f} ms  p99 {latency.percentile(0.99) * 1e3:6.2f} ms",
+        ]
+        if self.memory_probe is not None:
+            lines.extend(self.memory_probe())
+        return lines
+
+    def hud_rect(self):
+        metrics = QFontMetrics(self._hud_font())
+        return QRect(4, 4, metrics.horizontalAdvance("M") * 44 + 12,
+                     metrics.height() * (len(self.hud_lines())) + 8)
+
+    def _hud_font(self):
+        font = QFont("monospace")
+        font.setStyleHint(QFont.TypeWriter)
+        font.setPointSize(8)
+        return font
+
+    def draw_hud(self, painter):
+        if not (self._enabled and self.hud_visible):
+            return
+        painter.save()
+        painter.setFont(self._hud_font())
+        rect = self.hud_rect()
+        painter.fillRect(rect, QColor(0, 0, 0, 160))
+        painter.setPen(Qt.white)
+        line_height = painter.fontMetrics().height()
+        for i, line in enumerate(self.hud_lines()):
+            painter.drawText(rect.x() + 6, rect.y() + 4 + painter.fontMetrics().ascent()
+                             + i * line_height, line)
+        painter.restore()
+
+    def export_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": list(self._trace), "displayTimeUnit": "ms"}, f)
+
+
+# Shared disabled instance used when nothing asked for profiling
+NULL_PROFILER = Profiler(enabled=False)
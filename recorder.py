@@ -0,0 +1,401 @@
+import argparse
+import json
+import math
+import os
+import shutil
+import struct
+import sys
+import time
+import zlib
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from PyQt5.QtGui import QColor, QImage
+from PyQt5.QtCore import QObject, QPointF, QTimer, pyqtSignal
+
+# Session recordings. A Recorder attached to a CanvasModel (model.recorder)
+# gets every input and setting change the model receives, timestamped, and
+# appends it to a binary log. Replaying the log into a fresh model calls the
+# same methods in the same order, so the drawing comes out identical no
+# matter how fast it is replayed.
+#
+# Log layout: a header of magic, version and a JSON blob length, the JSON
+# ({"tools": [...]}, the tool names TOOL events index), then fixed-size
+# events of microseconds since the start, kind and three float arguments.
+# Events of the kinds in _DATA_KINDS are followed by a length-prefixed blob:
+# a pasted image's pixels (zlib'd, with width, height and QImage format as
+# the arguments) or the new end points of an edited shape as JSON. The log is
+# only ever appended to; a torn last event is ignored on read.
+
+MAGIC = b"PPREC"
+VERSION = 2  # 2 added blobs; version 1 logs read the same
+
+_HEADER = struct.Struct("<5sBI")
+_EVENT = struct.Struct("<QBfff")
+_LENGTH = struct.Struct("<I")
+
+# Event kinds in log order; the index is what is stored
+KINDS = ("press", "move", "release", "tool", "color", "size", "hardness", "simplify",
+         "smoothing", "retained", "resize", "undo", "redo", "clear", "flip", "rotate",
+         "delete", "select_none", "symmetry", "symmetry_centre", "fill_style",
+         "secondary_color", "paste", "flatten", "edit_shape")
+_KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+_DATA_KINDS = frozenset(_KIND_CODES[kind] for kind in ("paste", "edit_shape"))
+
+Event = namedtuple("Event", "t kind a b c data", defaults=(None,))  # t in microseconds
+
+
+class RecordingError(ValueError):
+    pass
+
+
+class Recorder:
+    """Appends the input a CanvasModel receives to a session log.
+
+    Attach with `model.recorder = Recorder(path, model)`. The model's state
+    when recording starts (canvas size, tool and brush settings) is written
+    first, so a replay into a new model starts from the same place; pixels
+    already on the canvas are not recorded.
+    """
+
+    def __init__(self, path, model=None, tools=None):
+        from canvas_model import FILL_STYLES, SYMMETRY_MODES
+        from tools import tool_names
+        self._modes = {mode: i for i, mode in enumerate(SYMMETRY_MODES)}
+        self._fill_styles = {style: i for i, style in enumerate(FILL_STYLES)}
+        self._tools = list(tool_names() if tools is None else tools)
+        self._tool_codes = {tool: i for i, tool in enumerate(self._tools)}
+        self._file = open(path, "wb")
+        blob = json.dumps({"tools": self._tools}).encode("utf-8")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, len(blob)) + blob)
+        self._start = time.perf_counter()
+        self.events = 0
+        if model is not None:
+            image = model.image
+            if image is not None:
+                self.record("resize", image.width(), image.height())
+            self.record("tool", model.current_tool)
+            self.record("color", model.brush_color)
+            self.record("size", model.brush_size)
+            self.record("hardness", model.brush_hardness)
+            self.record("simplify", model.simplify_tolerance)
+            self.record("smoothing", model.smoothing)
+            self.record("retained", model.retained_shapes)
+            self.record("symmetry", model.symmetry, model.symmetry_count)
+            self.record("symmetry_centre", model.symmetry_centre)
+            self.record("fill_style", model.fill_style, model.gradient_angle)
+            self.record("secondary_color", model.secondary_color)
+
+    def record(self, kind, a=0.0, b=0.0, c=0.0):
+        data = None
+        if kind == "paste":
+            image = a
+            data = zlib.compress(image.constBits().asstring(image.sizeInBytes()), 1)
+            a, b, c = image.width(), image.height(), int(image.format())
+        elif kind == "edit_shape":
+            data = json.dumps([b, c]).encode("utf-8")  # start, end; null keeps one
+            b = c = 0.0
+        elif kind == "tool":
+            a = self._tool_codes[a]
+        elif kind in ("color", "secondary_color"):
+            rgba = QColor(a).rgba()
+            a, b = rgba & 0xffffff, rgba >> 24  # both exact in a float32
+        elif kind == "symmetry":
+            a = self._modes[a]
+        elif kind == "fill_style":
+            a = self._fill_styles[a]
+        elif kind == "symmetry_centre":
+            a, b = (math.nan, math.nan) if a is None else (a.x(), a.y())
+        elif c is None:
+            c = math.nan  # mouse input has no pressure
+        t = int((time.perf_counter() - self._start) * 1e6)
+        self._file.write(_EVENT.pack(t, _KIND_CODES[kind], a, b, c))
+        if data is not None:
+            self._file.write(_LENGTH.pack(len(data)) + data)
+        self.events += 1
+        if kind == "release":
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def read_log(path):
+    """(tool names, list of Event) of a session log."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise RecordingError(f"{path}: not a session recording")
+    magic, version, blob_size = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise RecordingError(f"{path}: not a session recording")
+    if not 1 <= version <= VERSION:
+        raise RecordingError(f"{path}: unsupported recording version {version}")
+    start = _HEADER.size + blob_size
+    tools = json.loads(data[_HEADER.size:start])["tools"]
+    events = []
+    pos = start
+    while pos + _EVENT.size <= len(data):  # a torn last event is dropped
+        fields = _EVENT.unpack_from(data, pos)
+        pos += _EVENT.size
+        blob = None
+        if fields[1] in _DATA_KINDS:
+            if pos + _LENGTH.size > len(data):
+                break
+            (length,) = _LENGTH.unpack_from(data, pos)
+            pos += _LENGTH.size
+            if pos + length > len(data):
+                break
+            blob = data[pos:pos + length]
+            pos += length
+        events.append(Event(*fields, blob))
+    return tools, events
+
+
+def _coord(value):
+    # Mouse positions are whole pixels and go back to the model as ints
+    return int(value) if value.is_integer() else value
+
+
+def apply_event(model, event, tools):
+    kind = KINDS[event.kind]
+    a, b, c = event.a, event.b, event.c
+    if kind in ("press", "move", "release"):
+        getattr(model, kind)(_coord(a), _coord(b), None if math.isnan(c) else c)
+    elif kind == "tool":
+        model.current_tool = tools[int(a)]
+    elif kind == "color":
+        model.brush_color = QColor.fromRgba(int(b) << 24 | int(a))
+    elif kind == "size":
+        model.brush_size = int(a)
+    elif kind == "hardness":
+        model.brush_hardness = a
+    elif kind == "simplify":
+        model.simplify_tolerance = a
+    elif kind == "smoothing":
+        model.smoothing = bool(a)
+    elif kind == "retained":
+        model.retained_shapes = bool(a)
+    elif kind == "resize":
+        model.resize(int(a), int(b))
+    elif kind == "undo":
+        model.undo()
+    elif kind == "redo":
+        model.redo()
+    elif kind == "clear":
+        model.clear_canvas()
+    elif kind == "flip":
+        model.flip_selection(bool(a))
+    elif kind == "rotate":
+        model.rotate_selection(int(a))
+    elif kind == "delete":
+        model.delete_selection()
+    elif kind == "select_none":
+        model.select_none()
+    elif kind == "symmetry":
+        from canvas_model import SYMMETRY_MODES
+        model.symmetry_count = int(b)
+        model.symmetry = SYMMETRY_MODES[int(a)]
+    elif kind == "symmetry_centre":
+        model.symmetry_centre = None if math.isnan(a) else QPointF(a, b)
+    elif kind == "fill_style":
+        from canvas_model import FILL_STYLES
+        model.gradient_angle = b
+        model.fill_style = FILL_STYLES[int(a)]
+    elif kind == "secondary_color":
+        model.secondary_color = QColor.fromRgba(int(b) << 24 | int(a))
+    elif kind == "paste":
+        pixels = zlib.decompress(event.data)
+        width, height = int(a), int(b)
+        model.paste_image(QImage(pixels, width, height, len(pixels) // height,
+                                 QImage.Format(int(c))).copy())
+    elif kind == "flatten":
+        model.flatten_shapes()
+    elif kind == "edit_shape":
+        start, end = json.loads(event.data)
+        model.edit_shape(int(a), None if start is None else tuple(start),
+                         None if end is None else tuple(end))
+
+
+class Player(QObject):
+    """Replays a session log into a model in (scaled) real time.
+
+    Each timer tick applies every event that is due at the current replay
+    time and the views repaint once. When ticks come late, because the
+    events were expensive to apply or the speed is high, the frames in
+    between are skipped; the events never are, so the result is the same
+    at any speed.
+    """
+
+    progress = pyqtSignal(int, int)  # events applied, total
+    finished = pyqtSignal()
+
+    def __init__(self, model, path, speed=1.0, frame_interval=16, parent=None):
+        super().__init__(parent)
+        self._model = model
+        self._tools, self._events = read_log(path)
+        self._next = 0
+        self._speed = 1.0
+        self.speed = speed
+        self.frames = 0
+        self.skipped_frames = 0
+        self._interval = frame_interval
+        self._timer = QTimer(self)
+        self._timer.setInterval(frame_interval)
+        self._timer.timeout.connect(self._tick)
+        self._replay_us = 0.0
+        self._last_tick = None
+
+    @property
+    def speed(self):
+        return self._speed
+
+    @speed.setter
+    def speed(self, speed):
+        self._speed = min(max(float(speed), 1.0), 100.0)
+
+    def start(self):
+        self._last_tick = time.perf_counter()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def _tick(self):
+        now = time.perf_counter()
+        elapsed = now - self._last_tick
+        self._last_tick = now
+        # replay time advances by wall time times speed, so a speed change
+        # takes effect from the current position
+        self._replay_us += elapsed * 1e6 * self._speed
+        self.frames += 1
+        self.skipped_frames += max(0, round(elapsed * 1e3 / self._interval) - 1)
+        events = self._events
+        while self._next < len(events) and events[self._next].t <= self._replay_us:
+            apply_event(self._model, events[self._next], self._tools)
+            self._next += 1
+        self.progress.emit(self._next, len(events))
+        if self._next >= len(events):
+            self._timer.stop()
+            self.finished.emit()
+
+
+# Headless rendering
+
+def _write_frame(pixels, width, height, paths):
+    # Pool worker: encode one frame and copy it to the frames that repeat it
+    image = QImage(pixels, width, height, width * 4, QImage.Format_ARGB32)
+    if not image.save(paths[0], "PNG"):
+        raise OSError(f"could not write {paths[0]}")
+    for path in paths[1:]:
+        shutil.copyfile(paths[0], path)
+    return len(paths)
+
+
+def render_frames(path, out_dir, fps=30, speed=10.0, workers=None, max_pending=None):
+    """Replay a log headlessly into numbered PNG frames in `out_dir`.
+
+    The replay runs here, in order; PNG encoding, the slow part, runs on a
+    process pool. Frames where nothing changed are copies of the previous
+    one rather than encoded again. Returns the number of frames written.
+    """
+    from canvas_model import CanvasModel
+    tools, events = read_log(path)
+    os.makedirs(out_dir, exist_ok=True)
+    model = CanvasModel()
+    dirty = [True]
+    model.changed.connect(lambda rect: dirty.__setitem__(0, True))
+    frame_us = 1e6 * speed / fps
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    written = 0
+    frame = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        group = None  # (pixels, width, height, paths) of frames that look the same
+
+        def flush():
+            nonlocal written
+            if group is not None:
+                pending.append(pool.submit(_write_frame, *group))
+            while len(pending) > max_pending:
+                written += pending.popleft().result()
+
+        def next_frame():
+            # frame k shows the canvas at the end of its interval
+            nonlocal frame, group
+            path = os.path.join(out_dir, f"frame_{frame:06d}.png")
+            frame += 1
+            if group is not None and not dirty[0]:
+                group[3].append(path)
+                return
+            flush()
+            image = model.export_image()
+            group = None
+            if not image.isNull():
+                group = (image.constBits().asstring(image.sizeInBytes()),
+                         image.width(), image.height(), [path])
+            dirty[0] = False
+
+        for event in events:
+            while event.t >= frame * frame_us + frame_us:
+                next_frame()
+            apply_event(model, event, tools)
+        next_frame()
+        flush()
+        while pending:
+            written += pending.popleft().result()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay PythonPaint session recordings")
+    sub = parser.add_subparsers(dest="command", required=True)
+    play = sub.add_parser("play", help="replay a recording in a window")
+    play.add_argument("log")
+    play.add_argument("--speed", type=float, default=1.0, help="1 to 100 times real time")
+    play.add_argument("--backend", default="raster")
+    render = sub.add_parser("render", help="render a recording to numbered PNG frames")
+    render.add_argument("log")
+    render.add_argument("out_dir")
+    render.add_argument("--fps", type=float, default=30)
+    render.add_argument("--speed", type=float, default=10.0)
+    render.add_argument("--workers", type=int, default=None,
+                        help="PNG encoding processes (default: CPU count)")
+    args, qt_args = parser.parse_known_args(argv)
+    # recordings name plugin tools too; replaying their strokes runs them again
+    from tools import PLUGIN_DIR, load_plugins
+    load_plugins(PLUGIN_DIR)
+
+    if args.command == "render":
+        start = time.perf_counter()
+        frames = render_frames(args.log, args.out_dir, args.fps, args.speed, args.workers)
+        print(f"rendered {frames} frames to {args.out_dir} "
+              f"in {time.perf_counter() - start:.2f}s")
+        return 0
+
+    from PyQt5.QtWidgets import QApplication
+    from canvas_model import CanvasModel
+    from renderers import create_canvas
+    app = QApplication([sys.argv[0]] + qt_args)
+    model = CanvasModel()
+    canvas = create_canvas(model, args.backend)
+    player = Player(model, args.log, args.speed)
+
+    def show_progress(done, total):
+        # the recording sets the canvas size and the view follows it
+        if model.image is not None and canvas.size() != model.image.size():
+            canvas.setFixedSize(model.image.size())
+        canvas.setWindowTitle(f"Replay {done}/{total} at {player.speed:g}x")
+
+    player.progress.connect(show_progress)
+    player.finished.connect(lambda: print(
+        f"replayed in {player.frames} frames, {player.skipped_frames} skipped"))
+    canvas.show()
+    player.start()
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+import importlib.util
+import sys
+import time
+
+from PyQt5.QtWidgets import QWidget, QOpenGLWidget
+from PyQt5.QtGui import QPainter, QOpenGLContext, QOffscreenSurface
+from PyQt5.QtCore import Qt, QEvent, QRect
+
+BACKENDS = ["auto", "raster", "gl"]
+
+
+class _CanvasInput:
+    # Mouse, drop and resize handling shared by every backend, forwarded to the model
+
+    @property
+    def model(self):
+        return self._model
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._model.profiler.input_event()
+            with self._model.profiler.section("mousePressEvent"):
+                self._model.press(event.x(), event.y())
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton:
+            self._model.profiler.input_event()
+            with self._model.profiler.section("mouseMoveEvent"):
+                self._model.move(event.x(), event.y())
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._model.profiler.input_event()
+            with self._model.profiler.section("mouseReleaseEvent"):
+                self._model.release(event.x(), event.y())
+
+    def tabletEvent(self, event):
+        # Accepted so Qt does not also synthesize mouse events for the pen
+        pos = event.posF()
+        profiler = self._model.profiler
+        profiler.input_event()
+        if event.type() == QEvent.TabletPress and event.button() == Qt.LeftButton:
+            with profiler.section("tabletPressEvent"):
+                self._model.press(pos.x(), pos.y(), event.pressure())
+        elif event.type() == QEvent.TabletMove and event.buttons() & Qt.LeftButton:
+            with profiler.section("tabletMoveEvent"):
+                self._model.move(pos.x(), pos.y(), event.pressure())
+        elif event.type() == QEvent.TabletRelease and event.button() == Qt.LeftButton:
+            with profiler.section("tabletReleaseEvent"):
+                self._model.release(pos.x(), pos.y(), event.pressure())
+        event.accept()
+
+    def dragEnterEvent(self, event):
+        from image_io import mime_source
+        if mime_source(event.mimeData()) is not None:
+            event.acceptProposedAction()
+
+    def dropEvent(self, event):
+        from image_io import mime_source
+        source = mime_source(event.mimeData())
+        if source is not None:
+            self._model.import_image(source)
+            event.acceptProposedAction()
+
+    def _end_frame(self, painter, start):
+        # Frame time excludes the HUD itself
+        profiler = self._model.profiler
+        profiler.frame(time.perf_counter() - start)
+        profiler.draw_hud(painter)
+
+    def resizeEvent(self, event):
+        self._model.resize(self.width(), self.height())
+        super().resizeEvent(event)
+
+
+class RasterCanvas(_CanvasInput, QWidget):
+    # Software backend: blits only the exposed part of the model image
+
+    def __init__(self, model):
+        super().__init__()
+        self.setAttribute(Qt.WA_StaticContents)
+        self.setAcceptDrops(True)
+        self._model = model
+        model.changed.connect(self._on_changed)
+
+    def _on_changed(self, rect):
+        if rect.isNull():
+            self.update()
+        else:
+            self.update(rect)
+            if self._model.profiler.enabled:
+                self.update(self._model.profiler.hud_rect())
+
+    def paintEvent(self, event):
+        image = self._model.image
+        if image is None:
+            return
+        start = time.perf_counter()
+        with self._model.profiler.section("paintEvent"):
+            painter = QPainter(self)
+            rect = event.rect()
+            painter.drawImage(rect, image, rect)
+            self._model.draw_scene(painter, rect)
+            self._model.draw_preview(painter)
+        self._end_frame(painter, start)
+
+
+class GLCanvas(_CanvasInput, QOpenGLWidget):
+    # GPU backend: the model image lives in a texture and only dirty
+    # rectangles are re-uploaded before it is drawn as a single quad
+
+    def __init__(self, model):
+        super().__init__()
+        self.setAcceptDrops(True)
+        self._model = model
+        self._gl = None
+        self._texture = None
+        self._texture_size = None
+        self._dirty = QRect()
+        model.changed.connect(self._on_changed)
+        model.memory.add_source("gl", "canvas texture", self.texture_bytes)
+
+    def texture_bytes(self):
+        # One RGBA8 level, no mipmaps
+        if self._texture_size is None:
+            return 0
+        return self._texture_size[0] * self._texture_size[1] * 4
+
+    def _on_changed(self, rect):
+        image = self._model.image
+        if image is not None:
+            self._dirty = self._dirty.united(image.rect() if rect.isNull() else rect)
+        self.update()
+
+    def initializeGL(self):
+        # imported here so the raster backend never pays for PyOpenGL
+        from OpenGL import GL
+        self._gl = GL
+        GL.glClearColor(1, 1, 1, 1)
+        self._texture = GL.glGenTextures(1)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self._texture)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_NEAREST)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_NEAREST)
+        self._texture_size = None
+
+    def _set_projection(self):
+        # QPainter shares the context, so the fixed-function state is set
+        # again inside every native painting block
+        GL = self._gl
+        w, h = self.width(), self.height()
+        GL.glViewport(0, 0, int(w * self.devicePixelRatioF()), int(h * self.devicePixelRatioF()))
+        GL.glMatrixMode(GL.GL_PROJECTION)
+        GL.glLoadIdentity()
+        GL.glOrtho(0, w, h, 0, -1, 1)
+        GL.glMatrixMode(GL.GL_MODELVIEW)
+        GL.glLoadIdentity()
+
+    def _upload(self, image):
+        GL = self._gl
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self._texture)
+        size = (image.width(), image.height())
+        if self._texture_size != size:
+            rect = image.rect()
+        else:
+            rect = self._dirty.intersected(image.rect())
+        if rect.isEmpty():
+            return
+        # 32-bit QImage pixels are 0xAARRGGBB, i.e. BGRA bytes on little-endian
+        # machines; premultiplied canvases upload as premultiplied texels
+        pixels = image.copy(rect)
+        bits = pixels.constBits()
+        bits.setsize(pixels.sizeInBytes())
+        if self._texture_size != size:
+            GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, GL.GL_RGBA, size[0], size[1], 0,
+                            GL.GL_BGRA, GL.GL_UNSIGNED_BYTE, bytes(bits))
+            self._texture_size = size
+        else:
+            GL.glTexSubImage2D(GL.GL_TEXTURE_2D, 0, rect.x(), rect.y(),
+                               rect.width(), rect.height(),
+                               GL.GL_BGRA, GL.GL_UNSIGNED_BYTE, bytes(bits))
+        self._dirty = QRect()
+
+    def paintGL(self):
+        start = time.perf_counter()
+        with self._model.profiler.section("paintGL"):
+            painter = self._paint_gl()
+        self._end_frame(painter, start)
+        painter.end()
+
+    def _paint_gl(self):
+        GL = self._gl
+        image = self._model.image
+        painter = QPainter(self)
+        painter.beginNativePainting()
+        self._set_projection()
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+        if image is not None:
+            self._upload(image)
+            w, h = image.width(), image.height()
+            GL.glEnable(GL.GL_TEXTURE_2D)
+            GL.glColor3f(1, 1, 1)
+            GL.glBegin(GL.GL_QUADS)
+            GL.glTexCoord2f(0, 0)
+            GL.glVertex2f(0, 0)
+            GL.glTexCoord2f(1, 0)
+            GL.glVertex2f(w, 0)
+            GL.glTexCoord2f(1, 1)
+            GL.glVertex2f(w, h)
+            GL.glTexCoord2f(0, 1)
+            GL.glVertex2f(0, h)
+            GL.glEnd()
+            GL.glDisable(GL.GL_TEXTURE_2D)
+        painter.endNativePainting()
+        if image is not None:
+            self._model.draw_scene(painter, image.rect())
+        self._model.draw_preview(painter)
+        return painter
+
+
+def opengl_available():
+    # Needs a QGuiApplication. PyOpenGL is only looked up here, it is
+    # imported by GLCanvas.initializeGL once a GL canvas is actually shown.
+    if importlib.util.find_spec("OpenGL") is None:
+        return False
+    context = QOpenGLContext()
+    if not context.create():
+        return False
+    surface = QOffscreenSurface()
+    surface.create()
+    available = context.makeCurrent(surface)
+    context.doneCurrent()
+    return available
+
+
+def create_canvas(model, backend="auto"):
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}, expected one of {BACKENDS}")
+    if backend in ("auto", "gl") and opengl_available():
+        return GLCanvas(model)
+    if backend == "gl":
+        print("OpenGL is not available, falling back to the raster backend", file=sys.stderr)
+    return RasterCanvas(model)
@@ -0,0 +1,142 @@
+import math
+from collections import namedtuple
+from functools import cached_property
+
+from PyQt5.QtGui import QImage, QPainter, QPen
+from PyQt5.QtCore import Qt, QPoint, QRect
+
+from spatial_index import StrokeIndex, shape_outline
+
+
+def shape_bounds(tool, start, end, size):
+    # Pixels a shape tool can touch with a pen of `size`, unclipped
+    (x0, y0), (x1, y1) = start, end
+    xs, ys = (x0, x1), (y0, y1)
+    if tool == "circle":
+        r = int(((x1 - x0)**2 + (y1 - y0)**2) ** 0.5) // 2
+        xc, yc = (x0 + x1) // 2, (y0 + y1) // 2
+        xs, ys = (xc - r, xc + r), (yc - r, yc + r)
+    m = int(size // 2) + 2
+    return QRect(QPoint(int(min(xs)) - m, int(min(ys)) - m),
+                 QPoint(int(max(xs)) + m, int(max(ys)) + m))
+
+
+class Shape(namedtuple("Shape", "tool start end color size")):
+    # One retained shape; start and end are (x, y) tuples. Shapes are never
+    # changed in place, edits replace them, so the bounds are cached.
+
+    @cached_property
+    def bounds(self):
+        return shape_bounds(self.tool, self.start, self.end, self.size)
+
+    @cached_property
+    def outline(self):
+        # curves get a segment every ~8 px so the polyline stays within a
+        # pixel of what is painted
+        bounds = self.bounds
+        segments = max(32, int(math.pi * max(bounds.width(), bounds.height()) / 8))
+        return shape_outline(self.tool, self.start, self.end, segments)
+
+    def pen(self):
+        return QPen(self.color, self.size, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+
+
+class Scene:
+    """Retained shapes drawn above the canvas pixels.
+
+    Shapes are kept by id in a StrokeIndex over their outlines and painted
+    into a transparent layer image, which the views draw over the canvas.
+    Adding, editing or removing a shape only re-rasterizes its old and new
+    bounding boxes: the layer is cleared there and every shape the index
+    finds in that area is painted again, clipped to it, in id order.
+    `paint_shape(painter, shape)` does the drawing, so retained shapes look
+    exactly like the ones burnt into the canvas.
+    """
+
+    TOOLS = ("rectangle", "ellipse", "line", "circle")
+
+    def __init__(self, paint_shape, cell_size=64):
+        self._paint_shape = paint_shape
+        self._shapes = {}
+        self._next_id = 0
+        self._index = StrokeIndex(cell_size)
+        self._layer = None
+
+    def __len__(self):
+        return len(self._shapes)
+
+    def __iter__(self):
+        return iter(sorted(self._shapes.items()))
+
+    @property
+    def layer(self):
+        return self._layer
+
+    def get(self, shape_id):
+        return self._shapes.get(shape_id)
+
+    def resize(self, width, height):
+        self._layer = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        self.rasterize(self._layer.rect())
+
+    def add(self, shape):
+        shape_id = self._next_id
+        self.set(shape_id, shape)
+        return shape_id
+
+    def set(self, shape_id, shape):
+        """Replace, insert (at its old z-order) or, with None, remove a shape.
+
+        Returns the area that was re-rasterized.
+        """
+        old = self._shapes.pop(shape_id, None)
+        dirty = QRect() if old is None else old.bounds
+        self._index.remove_stroke(shape_id)
+        if shape is not None:
+            self._shapes[shape_id] = shape
+            self._index.add_stroke(shape_id, shape.outline, shape.size)
+            dirty = dirty.united(shape.bounds)
+            self._next_id = max(self._next_id, shape_id + 1)
+        self.rasterize(dirty)
+        return dirty
+
+    def clear(self):
+        self._shapes.clear()
+        self._index.clear()
+        if self._layer is not None:
+            self._layer.fill(Qt.transparent)
+
+    def shapes_in_rect(self, rect):
+        # Ids of shapes whose bounds meet `rect`, bottom to top
+        hits = self._index.query_rect(rect.left() - 1, rect.top() - 1,
+                                      rect.right() + 1, rect.bottom() + 1)
+        return sorted(i for i in hits if self._shapes[i].bounds.intersects(rect))
+
+    def handle_at(self, x, y, radius=6):
+        # Topmost (shape_id, "start" | "end") with an end point within radius.
+        # End points of ellipses lie off the outline, so this goes by bounds.
+        for shape_id, shape in reversed(list(self)):
+            if not shape.bounds.contains(int(x), int(y)):
+                continue
+            for which in ("end", "start"):
+                px, py = getattr(shape, which)
+                if (px - x)**2 + (py - y)**2 <= radius**2:
+                    return shape_id, which
+        return None
+
+    def rasterize(self, rect):
+        if self._layer is None:
+            return
+        rect = rect.intersected(self._layer.rect())
+        if rect.isEmpty():
+            return
+        painter = QPainter(self._layer)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.fillRect(rect, Qt.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        painter.setClipRect(rect)
+        for shape_id in self.shapes_in_rect(rect):
+            shape = self._shapes[shape_id]
+            painter.setPen(shape.pen())
+            self._paint_shape(painter, shape)
+        painter.end()
@@ -0,0 +1,230 @@
+import argparse
+import multiprocessing
+import os
+import runpy
+import sys
+import time
+import traceback
+from collections import deque, namedtuple
+from multiprocessing.connection import wait
+
+# Drawing scripts run in batches. A script is a Python file that defines
+#   def draw(api, **params): ...
+# and draws through the DrawingAPI it is given (drawing_api.py). A
+# BatchExecutor runs one call per image on a pool of worker processes: a
+# script that raises, hangs past its time limit or runs out of memory only
+# costs its own task, and its worker is replaced. This isolates scripts
+# from the app and from each other; it is not a security sandbox.
+
+TaskResult = namedtuple("TaskResult", "index ok value error seconds")
+
+
+class TaskTimeout(Exception):
+    pass
+
+
+def _limit_memory(limit):
+    try:
+        import resource
+    except ImportError:
+        return  # not on this platform
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _worker(conn, memory_limit):
+    # Runs tasks sent over `conn` until it gets None
+    if memory_limit:
+        _limit_memory(memory_limit)
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        index, fn, args = message
+        start = time.perf_counter()
+        try:
+            value = fn(*args)
+        except BaseException as e:
+            conn.send((index, False, None, f"{type(e).__name__}: {e}\n{traceback.format_exc()}",
+                       time.perf_counter() - start))
+        else:
+            conn.send((index, True, value, None, time.perf_counter() - start))
+
+
+class BatchExecutor:
+    """A pool of worker processes that runs tasks with a time limit each.
+
+    `run(fn, tasks)` calls fn(*args) for every args tuple in `tasks` and
+    yields a TaskResult per task as they finish. A task still running after
+    `timeout` seconds gets a TaskTimeout error and its worker is killed and
+    replaced; so is a worker that dies. `memory_limit` caps the address
+    space of each worker, in bytes, where the platform supports it. `fn`
+    must be importable from the workers, i.e. defined at module level.
+    """
+
+    def __init__(self, workers=None, timeout=60.0, memory_limit=None, context="spawn"):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self._context = multiprocessing.get_context(context)
+        self._pool = []  # (process, connection)
+
+    def _start_worker(self):
+        parent, child = self._context.Pipe()
+        process = self._context.Process(target=_worker, args=(child, self.memory_limit),
+                                        daemon=True)
+        process.start()
+        child.close()
+        return process, parent
+
+    def _stop_worker(self, worker, kill=False):
+        process, conn = worker
+        if kill:
+            process.kill()
+        else:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        process.join()
+        conn.close()
+
+    def run(self, fn, tasks):
+        pending = deque(enumerate(tasks))
+        while len(self._pool) < min(self.workers, len(pending)):
+            self._pool.append(self._start_worker())
+        idle = list(self._pool)
+        busy = {}  # connection -> (worker, index, deadline)
+        while pending or busy:
+            while pending and idle:
+                worker = idle.pop()
+                index, args = pending.popleft()
+                worker[1].send((index, fn, args))
+                busy[worker[1]] = (worker, index, time.monotonic() + self.timeout)
+            next_deadline = min(deadline for _, _, deadline in busy.values())
+            for conn in wait(list(busy), max(0.0, next_deadline - time.monotonic())):
+                worker, index, _ = busy.pop(conn)
+                try:
+                    result = conn.recv()
+                except (EOFError, OSError):
+                    worker[0].join(1.0)
+                    code = worker[0].exitcode
+                    yield TaskResult(index, False, None,
+                                     f"worker exited with code {code}", None)
+                    worker = self._replace(worker, kill=True)
+                else:
+                    yield TaskResult(*result)
+                idle.append(worker)
+            now = time.monotonic()
+            for conn, (worker, index, deadline) in list(busy.items()):
+                if deadline <= now:
+                    del busy[conn]
+                    yield TaskResult(index, False, None,
+                                     TaskTimeout(f"timed out after {self.timeout:g}s"),
+                                     self.timeout)
+                    idle.append(self._replace(worker, kill=True))
+
+    def _replace(self, worker, kill=False):
+        self._stop_worker(worker, kill)
+        new = self._start_worker()
+        self._pool[self._pool.index(worker)] = new
+        return new
+
+    def close(self):
+        for worker in self._pool:
+            self._stop_worker(worker)
+        self._pool = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_script(script_path, source, output_path, params):
+    """Worker task: run a script's draw() on one canvas and save it.
+
+    `source` is an image file to start from, or (width, height) for a
+    blank canvas. Returns (output_path, width, height).
+    """
+    from PyQt5.QtGui import QImage
+    from canvas_model import CanvasModel
+    from tools import PLUGIN_DIR, load_plugins
+    load_plugins(PLUGIN_DIR)
+    model = CanvasModel()
+    if isinstance(source, str):
+        image = QImage(source)
+        if image.isNull():
+            raise OSError(f"could not read {source}")
+        model.resize(image.width(), image.height())
+        model.restore_tile(0, 0, image)
+    else:
+        model.resize(*source)
+    draw = runpy.run_path(script_path).get("draw")
+    if draw is None:
+        raise ValueError(f"{script_path} does not define draw(api, **params)")
+    draw(model.api, **params)
+    if not model.save(output_path):
+        raise OSError(f"could not write {output_path}")
+    return output_path, model.image.width(), model.image.height()
+
+
+def _parse_param(text):
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {text!r}")
+    for kind in (int, float):
+        try:
+            return key, kind(value)
+        except ValueError:
+            pass
+    return key, value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run a drawing script over many images, each in a worker process")
+    parser.add_argument("script", help="Python file defining draw(api, **params)")
+    parser.add_argument("images", nargs="*", help="images to draw on")
+    parser.add_argument("-o", "--output-dir", default=".")
+    parser.add_argument("-n", "--count", type=int, default=0,
+                        help="blank canvases to generate, besides the images")
+    parser.add_argument("--size", default="800x600", help="size of blank canvases, WxH")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds per image")
+    parser.add_argument("--memory-limit", type=int, default=None, help="MiB per worker")
+    parser.add_argument("-p", "--param", type=_parse_param, action="append", default=[],
+                        help="KEY=VALUE passed to draw(); repeatable")
+    args = parser.parse_args(argv)
+
+    size = tuple(int(v) for v in args.size.lower().split("x"))
+    os.makedirs(args.output_dir, exist_ok=True)
+    params = dict(args.param)
+    tasks = []
+    sources = list(args.images) + [size] * args.count
+    for i, source in enumerate(sources):
+        stem = (os.path.splitext(os.path.basename(source))[0] if isinstance(source, str)
+                else f"generated_{i:04d}")
+        # `index` tells the calls apart, e.g. to seed procedural generation
+        tasks.append((args.script, source, os.path.join(args.output_dir, f"{stem}.png"),
+                      dict(params, index=i)))
+
+    failures = 0
+    start = time.perf_counter()
+    memory_limit = args.memory_limit * 2**20 if args.memory_limit else None
+    with BatchExecutor(args.jobs, args.timeout, memory_limit) as executor:
+        for result in executor.run(run_script, tasks):
+            _, source, output, _ = tasks[result.index]
+            name = source if isinstance(source, str) else os.path.basename(output)
+            if result.ok:
+                print(f"{name} -> {output} ({result.seconds * 1e3:.1f} ms)")
+            else:
+                failures += 1
+                print(f"{name}: {str(result.error).strip()}", file=sys.stderr)
+    print(f"ran {len(tasks) - failures}/{len(tasks)} in {time.perf_counter() - start:.2f}s")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+from PyQt5 import sip
+from PyQt5.QtGui import QImage, QPainter, QPainterPath, QPen, QPolygonF, QTransform
+from PyQt5.QtCore import Qt, QPoint, QPointF, QRect, QRectF
+
+# Tools that act on the current selection rather than clearing it
+SELECTION_TOOLS = ("select", "lasso", "transform")
+
+
+def sub_image(image, rect):
+    # QImage over the pixels of `rect` inside a 32-bit `image`, sharing its
+    # memory. Only valid until `image` is modified, resized or freed.
+    rect = rect.intersected(image.rect())
+    if rect.isEmpty():
+        return QImage()
+    address = int(image.constBits()) + rect.y() * image.bytesPerLine() + rect.x() * 4
+    return QImage(sip.voidptr(address), rect.width(), rect.height(),
+                  image.bytesPerLine(), image.format())
+
+
+class Selection:
+    """A selected area of the canvas and how it is being moved.
+
+    `offset` and `transform` (a rotation/scale about the centre of `rect`)
+    describe where the selected pixels go when the move is committed.
+
+    The selected pixels are not copied while the selection is made or
+    dragged: `pixels` is a view of the canvas and the drag preview is drawn
+    straight from it. A copy is taken by `lift` only when the canvas is
+    about to change underneath, i.e. when a move is committed or the
+    selection is copied out.
+    """
+
+    def __init__(self, path, bounds, is_rect=False):
+        self.path = path
+        self.rect = path.boundingRect().toAlignedRect().intersected(bounds)
+        self.is_rect = is_rect
+        self.offset = QPoint()
+        self.transform = QTransform()
+
+    @classmethod
+    def from_rect(cls, start, end, bounds):
+        path = QPainterPath()
+        path.addRect(QRectF(QRect(start, end).normalized().intersected(bounds)))
+        return cls(path, bounds, is_rect=True)
+
+    @classmethod
+    def from_points(cls, points, bounds):
+        path = QPainterPath()
+        path.addPolygon(QPolygonF([QPointF(x, y) for x, y in points]))
+        path.closeSubpath()
+        return cls(path, bounds)
+
+    def is_empty(self):
+        return self.rect.isEmpty()
+
+    @property
+    def centre(self):
+        return QRectF(self.rect).center()
+
+    def is_moved(self):
+        return not (self.offset.isNull() and self.transform.isIdentity())
+
+    def matrix(self):
+        # canvas -> canvas: transform about the centre, then the offset
+        c = self.centre
+        return (QTransform.fromTranslate(-c.x(), -c.y()) * self.transform
+                * QTransform.fromTranslate(c.x() + self.offset.x(), c.y() + self.offset.y()))
+
+    @property
+    def target_rect(self):
+        if self.transform.isIdentity():
+            return self.rect.translated(self.offset)
+        return self.matrix().mapRect(QRectF(self.rect)).toAlignedRect()
+
+    @property
+    def target_path(self):
+        return self.matrix().map(self.path)
+
+    def contains(self, x, y):
+        return self.target_path.contains(QPointF(x, y))
+
+    def preview_rect(self):
+        # Everything draw touches: the hole, the moved pixels and the outline
+        return self.rect.united(self.target_rect).adjusted(-2, -2, 2, 2)
+
+    def pixels(self, image):
+        return sub_image(image, self.rect)
+
+    def lift(self, image):
+        # Copy of the selected pixels, transparent outside the path
+        lifted = QImage(self.rect.size(), QImage.Format_ARGB32_Premultiplied)
+        lifted.fill(Qt.transparent)
+        painter = QPainter(lifted)
+        painter.setClipPath(self.path.translated(QPointF(-self.rect.topLeft())))
+        painter.drawImage(0, 0, self.pixels(image))
+        painter.end()
+        return lifted
+
+    def moved(self, bounds):
+        return Selection(self.target_path, bounds,
+                         self.is_rect and self.transform.isIdentity())
+
+    def draw(self, painter, image, background=Qt.white):
+        # Preview quality: the view is drawn through the matrix with
+        # nearest-neighbour sampling, cheap enough for every drag event
+        painter.save()
+        if self.is_moved():
+            painter.fillPath(self.path, background)
+            painter.save()
+            painter.setClipPath(self.target_path)
+            painter.setTransform(self.matrix(), True)
+            painter.drawImage(self.rect.topLeft(), self.pixels(image))
+            painter.restore()
+        painter.setBrush(Qt.NoBrush)
+        painter.setPen(QPen(Qt.white, 1))
+        painter.drawPath(self.target_path)
+        painter.setPen(QPen(Qt.black, 1, Qt.DashLine))
+        painter.drawPath(self.target_path)
+        painter.restore()
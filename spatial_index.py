@@ -0,0 +1,231 @@
+import math
+from collections import defaultdict
+
+
+def shape_outline(tool, start, end, segments=32):
+    # Polyline approximation of a shape tool so it can be indexed like a stroke
+    x0, y0 = start
+    x1, y1 = end
+    if tool == "line":
+        return [(x0, y0), (x1, y1)]
+    if tool == "rectangle":
+        return [(x0, y0), (x1, y0), (x1, y1), (x0, y1), (x0, y0)]
+    if tool in ("ellipse", "circle"):
+        cx = (x0 + x1) / 2
+        cy = (y0 + y1) / 2
+        if tool == "circle":
+            rx = ry = math.hypot(x1 - x0, y1 - y0) / 2
+        else:
+            rx = abs(x1 - x0) / 2
+            ry = abs(y1 - y0) / 2
+        return [(cx + rx * math.cos(2 * math.pi * i / segments),
+                 cy + ry * math.sin(2 * math.pi * i / segments))
+                for i in range(segments + 1)]
+    return [(x0, y0)]
+
+
+def _point_segment_distance(px, py, x0, y0, x1, y1):
+    dx = x1 - x0
+    dy = y1 - y0
+    length2 = dx * dx + dy * dy
+    if length2 == 0:
+        return math.hypot(px - x0, py - y0)
+    t = ((px - x0) * dx + (py - y0) * dy) / length2
+    t = max(0.0, min(1.0, t))
+    return math.hypot(px - (x0 + t * dx), py - (y0 + t * dy))
+
+
+def _segment_hits_rect(x0, y0, x1, y1, left, top, right, bottom):
+    # Liang-Barsky clip of the segment against the rectangle
+    dx = x1 - x0
+    dy = y1 - y0
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x0 - left), (dx, right - x0),
+                 (-dy, y0 - top), (dy, bottom - y0)):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            if t > t1:
+                return False
+            t0 = max(t0, t)
+        else:
+            if t < t0:
+                return False
+            t1 = min(t1, t)
+    return True
+
+
+class StrokeIndex:
+    """Uniform grid over stroke segments.
+
+    Every cell keeps the (stroke_id, segment) pairs whose padded bounding box
+    touches it, so region and nearest queries only look at the cells they
+    cover instead of every recorded point.
+    """
+
+    def __init__(self, cell_size=64):
+        self._cell_size = cell_size
+        self._cells = defaultdict(list)
+        self._points = {}
+        self._radius = {}
+        self._bounds = {}
+        self._stroke_cells = defaultdict(set)
+        self._extent = None
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, stroke_id):
+        return stroke_id in self._points
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    def clear(self):
+        self._cells.clear()
+        self._points.clear()
+        self._radius.clear()
+        self._bounds.clear()
+        self._stroke_cells.clear()
+        self._extent = None
+
+    def add_stroke(self, stroke_id, points, width=0):
+        if stroke_id in self._points:
+            self.remove_stroke(stroke_id)
+        points = list(points)
+        if not points:
+            return
+        self._points[stroke_id] = [points[0]]
+        self._radius[stroke_id] = width / 2
+        x, y = points[0]
+        self._bounds[stroke_id] = [x, y, x, y]
+        self._insert_segment(stroke_id, 0)
+        for point in points[1:]:
+            self.append_point(stroke_id, point)
+
+    def append_point(self, stroke_id, point):
+        if stroke_id not in self._points:
+            self.add_stroke(stroke_id, [point])
+            return
+        points = self._points[stroke_id]
+        points.append(point)
+        bounds = self._bounds[stroke_id]
+        x, y = point
+        bounds[0] = min(bounds[0], x)
+        bounds[1] = min(bounds[1], y)
+        bounds[2] = max(bounds[2], x)
+        bounds[3] = max(bounds[3], y)
+        self._insert_segment(stroke_id, len(points) - 1)
+
+    def remove_stroke(self, stroke_id):
+        if stroke_id not in self._points:
+            return
+        for key in self._stroke_cells.pop(stroke_id, ()):
+            entries = [e for e in self._cells[key] if e[0] != stroke_id]
+            if entries:
+                self._cells[key] = entries
+            else:
+                del self._cells[key]
+        del self._points[stroke_id]
+        del self._radius[stroke_id]
+        del self._bounds[stroke_id]
+
+    def bounds(self, stroke_id):
+        # Bounding box (left, top, right, bottom) including the stroke width
+        x0, y0, x1, y1 = self._bounds[stroke_id]
+        r = self._radius[stroke_id]
+        return (x0 - r, y0 - r, x1 + r, y1 + r)
+
+    def points(self, stroke_id):
+        return self._points[stroke_id]
+
+    def query_rect(self, left, top, right, bottom):
+        left, right = min(left, right), max(left, right)
+        top, bottom = min(top, bottom), max(top, bottom)
+        hits = set()
+        for key in self._cell_range(left, top, right, bottom):
+            for stroke_id, seg in self._cells.get(key, ()):
+                if stroke_id in hits:
+                    continue
+                r = self._radius[stroke_id]
+                x0, y0, x1, y1 = self._segment(stroke_id, seg)
+                if _segment_hits_rect(x0, y0, x1, y1,
+                                      left - r, top - r, right + r, bottom + r):
+                    hits.add(stroke_id)
+        return hits
+
+    def nearest(self, x, y, max_distance=None):
+        # Ring search outwards from the query cell; stops once no unvisited
+        # cell can hold anything closer than the best hit so far.
+        if not self._cells:
+            return None
+        cs = self._cell_size
+        cx, cy = int(x // cs), int(y // cs)
+        max_ring = self._max_ring(cx, cy)
+        if max_distance is not None:
+            max_ring = min(max_ring, int(max_distance // cs) + 1)
+        best_id, best_dist = None, math.inf
+        for ring in range(max_ring + 1):
+            if best_id is not None and best_dist <= (ring - 1) * cs:
+                break
+            for key in self._ring(cx, cy, ring):
+                for stroke_id, seg in self._cells.get(key, ()):
+                    x0, y0, x1, y1 = self._segment(stroke_id, seg)
+                    d = _point_segment_distance(x, y, x0, y0, x1, y1)
+                    d = max(0.0, d - self._radius[stroke_id])
+                    if d < best_dist:
+                        best_id, best_dist = stroke_id, d
+        if best_id is None or (max_distance is not None and best_dist > max_distance):
+            return None
+        return best_id, best_dist
+
+    def _segment(self, stroke_id, seg):
+        points = self._points[stroke_id]
+        x1, y1 = points[seg]
+        x0, y0 = points[seg - 1] if seg > 0 else points[seg]
+        return x0, y0, x1, y1
+
+    def _insert_segment(self, stroke_id, seg):
+        x0, y0, x1, y1 = self._segment(stroke_id, seg)
+        r = self._radius[stroke_id]
+        left, top = min(x0, x1) - r, min(y0, y1) - r
+        right, bottom = max(x0, x1) + r, max(y0, y1) + r
+        touched = self._stroke_cells[stroke_id]
+        for key in self._cell_range(left, top, right, bottom):
+            self._cells[key].append((stroke_id, seg))
+            touched.add(key)
+        cs = self._cell_size
+        cells = (int(left // cs), int(top // cs), int(right // cs), int(bottom // cs))
+        if self._extent is None:
+            self._extent = list(cells)
+        else:
+            self._extent[0] = min(self._extent[0], cells[0])
+            self._extent[1] = min(self._extent[1], cells[1])
+            self._extent[2] = max(self._extent[2], cells[2])
+            self._extent[3] = max(self._extent[3], cells[3])
+
+    def _cell_range(self, left, top, right, bottom):
+        cs = self._cell_size
+        for gx in range(int(left // cs), int(right // cs) + 1):
+            for gy in range(int(top // cs), int(bottom // cs) + 1):
+                yield (gx, gy)
+
+    def _ring(self, cx, cy, ring):
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for gx in range(cx - ring, cx + ring + 1):
+            yield (gx, cy - ring)
+            yield (gx, cy + ring)
+        for gy in range(cy - ring + 1, cy + ring):
+            yield (cx - ring, gy)
+            yield (cx + ring, gy)
+
+    def _max_ring(self, cx, cy):
+        # Farthest cell ever occupied bounds the ring search
+        gx0, gy0, gx1, gy1 = self._extent
+        return max(abs(gx0 - cx), abs(gx1 - cx), abs(gy0 - cy), abs(gy1 - cy))
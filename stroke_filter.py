@@ -0,0 +1,145 @@
+import math
+
+
+def _perpendicular_distance(point, start, end):
+    (px, py), (x0, y0), (x1, y1) = point, start, end
+    dx = x1 - x0
+    dy = y1 - y0
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return math.hypot(px - x0, py - y0)
+    return abs(dy * px - dx * py + x1 * y0 - y1 * x0) / length
+
+
+def simplify_rdp(points, tolerance):
+    # Ramer-Douglas-Peucker with an explicit stack, for already recorded strokes
+    points = list(points)
+    if len(points) < 3 or tolerance <= 0:
+        return points
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        index, max_dist = None, tolerance
+        for i in range(first + 1, last):
+            d = _perpendicular_distance(points[i], points[first], points[last])
+            if d > max_dist:
+                index, max_dist = i, d
+        if index is not None:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [p for p, k in zip(points, keep) if k]
+
+
+def catmull_rom(p0, p1, p2, p3, samples):
+    # Samples of the uniform Catmull-Rom segment from p1 to p2, excluding p1
+    out = []
+    for i in range(1, samples + 1):
+        t = i / samples
+        t2 = t * t
+        t3 = t2 * t
+        out.append(tuple(
+            0.5 * (2 * b + (-a + c) * t + (2 * a - 5 * b + 4 * c - d) * t2
+                   + (-a + 3 * b - 3 * c + d) * t3)
+            for a, b, c, d in zip(p0, p1, p2, p3)))
+    return out
+
+
+class StrokeSimplifier:
+    """Streaming simplifier fed one input event at a time.
+
+    Points closer than ``min_distance`` to the last kept point are dropped.
+    The rest are buffered while they stay within ``tolerance`` of the chord
+    from the last emitted point, so runs of nearly collinear input collapse to
+    their end points. With ``smooth`` the emitted polyline is resampled
+    through Catmull-Rom splines.
+    """
+
+    def __init__(self, tolerance=1.0, min_distance=None, smooth=False,
+                 smooth_samples=4, max_buffer=64):
+        self._tolerance = tolerance
+        self._min_distance = tolerance if min_distance is None else min_distance
+        self._smooth = smooth
+        self._smooth_samples = smooth_samples
+        self._max_buffer = max_buffer
+        self.reset()
+
+    def reset(self):
+        self._anchor = None
+        self._buffer = []
+        self._control = []
+        self.input_count = 0
+        self.output_count = 0
+
+    @property
+    def last_point(self):
+        # Latest accepted input point, still pending in the buffer or not
+        if self._buffer:
+            return self._buffer[-1]
+        return self._anchor
+
+    def start(self, point):
+        self.reset()
+        self.input_count = 1
+        self._anchor = point
+        return self._emit([point])
+
+    def add(self, point):
+        self.input_count += 1
+        if self._anchor is None:
+            self.input_count -= 1
+            return self.start(point)
+        last = self.last_point
+        if math.hypot(point[0] - last[0], point[1] - last[1]) < self._min_distance:
+            return []
+        for pending in self._buffer:
+            if _perpendicular_distance(pending, self._anchor, point) > self._tolerance:
+                break
+        else:
+            self._buffer.append(point)
+            if len(self._buffer) < self._max_buffer:
+                return []
+            return self._commit(len(self._buffer) - 1)
+        self._buffer.append(point)
+        return self._commit(len(self._buffer) - 2)
+
+    def finish(self):
+        emitted = []
+        if self._buffer:
+            emitted = self._commit(len(self._buffer) - 1)
+        if self._smooth and len(self._control) >= 2:
+            p1, p2 = self._control[-2:]
+            p0 = self._control[-3] if len(self._control) >= 3 else p1
+            emitted.extend(self._spline(p0, p1, p2, p2))
+        self._control = []
+        return emitted
+
+    def _commit(self, index):
+        point = self._buffer[index]
+        self._buffer = self._buffer[index + 1:]
+        self._anchor = point
+        return self._emit([point])
+
+    def _emit(self, points):
+        if not self._smooth:
+            self.output_count += len(points)
+            return points
+        out = []
+        for point in points:
+            self._control.append(point)
+            if len(self._control) == 1:
+                self.output_count += 1
+                out.append(point)
+            elif len(self._control) >= 3:
+                p0, p1, p2 = (([self._control[0]] + self._control)[-4:-1]
+                              if len(self._control) == 3 else self._control[-4:-1])
+                out.extend(self._spline(p0, p1, p2, point))
+                self._control = self._control[-3:]
+        return out
+
+    def _spline(self, p0, p1, p2, p3):
+        points = catmull_rom(p0, p1, p2, p3, self._smooth_samples)
+        self.output_count += len(points)
+        return points
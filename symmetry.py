@@ -0,0 +1,92 @@
+import math
+
+import numpy as np
+from PyQt5.QtCore import QLineF
+from PyQt5.QtGui import QTransform
+
+from canvas_model import SYMMETRY_MODES
+
+# Symmetry copies are linear maps about a centre point: mirrors, rotations
+# by a multiple of 360/N degrees, or both (kaleidoscope). Every input
+# segment is mapped to all copies in one NumPy step, so the per-event cost
+# is one array operation and one drawLines call, whatever N is.
+
+_IDENTITY = ((1.0, 0.0), (0.0, 1.0))
+_MIRROR_X = ((-1.0, 0.0), (0.0, 1.0))  # across the vertical axis
+_MIRROR_Y = ((1.0, 0.0), (0.0, -1.0))  # across the horizontal axis
+
+
+def _rotation(angle):
+    c, s = math.cos(angle), math.sin(angle)
+    return ((c, -s), (s, c))
+
+
+def symmetry_matrices(mode, count=6):
+    """(k, 2, 2) array of the linear parts of the copies, identity last.
+
+    The original stroke is the last copy, so it is drawn on top and stays
+    the model's current stroke.
+    """
+    if mode not in SYMMETRY_MODES:
+        raise ValueError(f"unknown symmetry mode {mode!r}, expected one of {SYMMETRY_MODES}")
+    if mode == "horizontal":
+        matrices = [_MIRROR_X]
+    elif mode == "vertical":
+        matrices = [_MIRROR_Y]
+    elif mode == "quad":
+        matrices = [_MIRROR_X, _MIRROR_Y, ((-1.0, 0.0), (0.0, -1.0))]
+    elif mode in ("radial", "kaleidoscope"):
+        rotations = [np.array(_rotation(2 * math.pi * i / count)) for i in range(count)]
+        matrices = rotations[1:]
+        if mode == "kaleidoscope":
+            matrices += [r @ np.array(_MIRROR_X) for r in rotations]
+    else:
+        matrices = []
+    return np.array(matrices + [_IDENTITY], dtype=np.float64).reshape(-1, 2, 2)
+
+
+def transform_points(points, matrices, centre):
+    """(k, n, 2) copies of an (n, 2) point array under each matrix."""
+    centre = np.asarray(centre, dtype=np.float64)
+    offsets = np.asarray(points, dtype=np.float64) - centre
+    return np.einsum("kij,nj->kni", matrices, offsets) + centre
+
+
+def qtransforms(matrices, centre):
+    # The same maps as QTransforms, for painting shapes through the painter
+    cx, cy = centre
+    transforms = []
+    for (a, b), (c, d) in matrices:
+        transforms.append(QTransform(a, c, b, d, cx - a * cx - b * cy, cy - c * cx - d * cy))
+    return transforms
+
+
+class Symmetry:
+    """The copies a stroke is drawn with, fixed when the stroke starts."""
+
+    def __init__(self, mode, count, centre):
+        self.mode = mode
+        self.count = count
+        self.matrices = symmetry_matrices(mode, count)
+        self.centre = (float(centre[0]), float(centre[1]))
+        self.transforms = qtransforms(self.matrices, self.centre)
+
+    def __len__(self):
+        return len(self.matrices)
+
+    def points(self, points):
+        return transform_points(points, self.matrices, self.centre)
+
+    def lines(self, points):
+        """Copies of a polyline, (k, n, 2), and all their segments as QLineFs."""
+        copies = self.points(points)
+        ends = np.concatenate((copies[:, :-1], copies[:, 1:]), axis=2).reshape(-1, 4)
+        return copies, [QLineF(*line) for line in ends.tolist()]
+
+    def map_rect(self, rect):
+        # Bounding rect of `rect` under every copy, a pixel larger as
+        # rotated edges land between pixels
+        united = rect
+        for transform in self.transforms[:-1]:
+            united = united.united(transform.mapRect(rect).adjusted(-1, -1, 1, 1))
+        return united
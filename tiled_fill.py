@@ -0,0 +1,215 @@
+import atexit
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Canvases at least this many pixels go through the tiled fill
+TILED_FILL_THRESHOLD = 4096 * 4096
+
+_pools = {}
+
+
+def _pool(kind, workers):
+    # Pools are kept between fills; starting processes costs more than a fill.
+    # "process" uses the platform's default start method (fork on Linux),
+    # which is only safe in a process without other threads; "spawn" starts
+    # fresh interpreters and is the one to use from the running app.
+    key = (kind, workers)
+    if key not in _pools:
+        if kind == "thread":
+            _pools[key] = ThreadPoolExecutor(max_workers=workers)
+        else:
+            context = multiprocessing.get_context("spawn") if kind == "spawn" else None
+            _pools[key] = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    return _pools[key]
+
+
+@atexit.register
+def shutdown_pools():
+    for pool in _pools.values():
+        pool.shutdown(cancel_futures=True)
+    _pools.clear()
+
+
+def components(count, u, v):
+    """Connected-component id (the smallest member) of `count` nodes.
+
+    `u` and `v` list the edges. Labels are propagated along the edges and
+    shortcut with pointer jumping until nothing changes, all in NumPy.
+    """
+    labels = np.arange(count, dtype=np.int64)
+    if len(u) == 0:
+        return labels
+    while True:
+        low = np.minimum(labels[u], labels[v])
+        new = labels.copy()
+        np.minimum.at(new, u, low)
+        np.minimum.at(new, v, low)
+        while True:
+            jumped = new[new]
+            if np.array_equal(jumped, new):
+                break
+            new = jumped
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def _runs(match):
+    height, width = match.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = match
+    edges = np.diff(padded, axis=1)
+    run_y, run_x0 = np.nonzero(edges == 1)
+    _, run_x1 = np.nonzero(edges == -1)
+    return run_y, run_x0, run_x1
+
+
+def _overlaps(a_x0, a_x1, b_x0, b_x1):
+    # Index pairs (i, j) where run a[i] and run b[j] share a column; both
+    # lists are sorted and non-overlapping within themselves
+    lo = np.searchsorted(b_x1, a_x0, side="right")
+    hi = np.searchsorted(b_x0, a_x1, side="left")
+    counts = np.maximum(hi - lo, 0)
+    i = np.repeat(np.arange(len(a_x0)), counts)
+    starts = np.repeat(lo, counts)
+    j = starts + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return i, j
+
+
+def _attach(source):
+    # Threads get the array itself, processes the name of a shared block
+    if isinstance(source, np.ndarray):
+        return source, None
+    name, shape = source
+    shm = shared_memory.SharedMemory(name=name)
+    return np.ndarray(shape, dtype=np.uint32, buffer=shm.buf), shm
+
+
+def _label_tile(source, y0, y1, x0, x1, target):
+    pixels, shm = _attach(source)
+    try:
+        run_y, run_x0, run_x1 = _runs(pixels[y0:y1, x0:x1] == target)
+    finally:
+        if shm is not None:
+            shm.close()
+    # link runs that overlap a run in the next row of the tile
+    width = x1 - x0 + 1
+    start_keys = run_y * width + run_x0
+    end_keys = run_y * width + run_x1
+    lo = np.searchsorted(end_keys, (run_y + 1) * width + run_x0, side="right")
+    hi = np.searchsorted(start_keys, (run_y + 1) * width + run_x1, side="left")
+    counts = np.maximum(hi - lo, 0)
+    u = np.repeat(np.arange(len(run_y)), counts)
+    v = np.repeat(lo, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    labels = components(len(run_y), u, v)
+    return run_y.astype(np.int32), run_x0.astype(np.int32), run_x1.astype(np.int32), labels
+
+
+def _fill_tile(source, y0, x0, run_y, run_x0, run_x1, replacement):
+    pixels, shm = _attach(source)
+    try:
+        for ry, rx0, rx1 in zip(run_y.tolist(), run_x0.tolist(), run_x1.tolist()):
+            pixels[y0 + ry, x0 + rx0:x0 + rx1] = replacement
+    finally:
+        if shm is not None:
+            shm.close()
+
+
+def tiled_flood_fill(pixels, x, y, replacement, tile=1024, workers=None,
+                     executor="process", cancel=None):
+    """Flood fill of a large uint32 array using every core.
+
+    Each tile is labelled into connected components of target-coloured runs
+    in a pool. Components are then joined across tile borders with a
+    union-find pass over the border runs, and the tiles that hold the seed's
+    component are filled in the pool again. Returns the filled bounding box
+    (left, top, right, bottom) or None, like fill.flood_fill_array.
+    `executor` is "process", "spawn" or "thread"; see _pool.
+    """
+    height, width = pixels.shape
+    if not (0 <= x < width and 0 <= y < height):
+        return None
+    target = pixels[y, x]
+    if target == replacement:
+        return None
+    workers = workers or os.cpu_count()
+    pool = _pool(executor, workers)
+
+    shm = None
+    source = pixels
+    if executor != "thread":
+        shm = shared_memory.SharedMemory(create=True, size=pixels.nbytes)
+        shared = np.ndarray(pixels.shape, dtype=np.uint32, buffer=shm.buf)
+        shared[:] = pixels
+        source = (shm.name, pixels.shape)
+    try:
+        tiles = [(ty, min(ty + tile, height), tx, min(tx + tile, width))
+                 for ty in range(0, height, tile) for tx in range(0, width, tile)]
+        results = list(pool.map(_label_tile, *zip(*[(source, *t, target) for t in tiles])))
+        if cancel is not None and cancel():
+            return None
+
+        # global ids: tile offset + local label
+        offsets = np.cumsum([0] + [len(r[0]) for r in results])
+        cols = (width + tile - 1) // tile
+        edges_u, edges_v = [], []
+        for index, (ty0, ty1, tx0, tx1) in enumerate(tiles):
+            run_y, run_x0, run_x1, labels = results[index]
+            ids = offsets[index] + labels
+            # right neighbour: runs touching the shared column edge, same row
+            if tx1 < width:
+                other = results[index + 1]
+                mine = run_x1 == tx1 - tx0
+                theirs = other[1] == 0
+                _, a, b = np.intersect1d(run_y[mine], other[0][theirs], return_indices=True)
+                edges_u.append(ids[mine][a])
+                edges_v.append((offsets[index + 1] + other[3])[theirs][b])
+            # bottom neighbour: overlapping runs across the shared row edge
+            if ty1 < height:
+                other = results[index + cols]
+                mine = run_y == ty1 - ty0 - 1
+                theirs = other[0] == 0
+                a, b = _overlaps(run_x0[mine], run_x1[mine], other[1][theirs], other[2][theirs])
+                edges_u.append(ids[mine][a])
+                edges_v.append((offsets[index + cols] + other[3])[theirs][b])
+        u = np.concatenate(edges_u) if edges_u else np.empty(0, np.int64)
+        v = np.concatenate(edges_v) if edges_v else np.empty(0, np.int64)
+        global_labels = components(int(offsets[-1]), u, v)
+
+        seed_tile = (y // tile) * cols + x // tile
+        ty0, _, tx0, _ = tiles[seed_tile]
+        run_y, run_x0, run_x1, labels = results[seed_tile]
+        row = run_y == y - ty0
+        hit = np.nonzero(row & (run_x0 <= x - tx0) & (run_x1 > x - tx0))[0][0]
+        seed_label = global_labels[offsets[seed_tile] + labels[hit]]
+        if cancel is not None and cancel():
+            return None
+
+        jobs = []
+        bbox = None
+        for index, (ty0, ty1, tx0, tx1) in enumerate(tiles):
+            run_y, run_x0, run_x1, labels = results[index]
+            selected = global_labels[offsets[index] + labels] == seed_label
+            if not selected.any():
+                continue
+            sy, sx0, sx1 = run_y[selected], run_x0[selected], run_x1[selected]
+            box = (tx0 + int(sx0.min()), ty0 + int(sy.min()),
+                   tx0 + int(sx1.max()) - 1, ty0 + int(sy.max()))
+            bbox = box if bbox is None else (min(bbox[0], box[0]), min(bbox[1], box[1]),
+                                             max(bbox[2], box[2]), max(bbox[3], box[3]))
+            jobs.append((source, ty0, tx0, sy, sx0, sx1, replacement))
+        list(pool.map(_fill_tile, *zip(*jobs)))
+
+        if shm is not None and bbox is not None:
+            left, top, right, bottom = bbox
+            pixels[top:bottom + 1, left:right + 1] = shared[top:bottom + 1, left:right + 1]
+        return bbox
+    finally:
+        if shm is not None:
+            del shared
+            shm.close()
+            shm.unlink()
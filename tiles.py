@@ -0,0 +1,16 @@
+from PyQt5.QtCore import QRect
+
+# Fixed grid of square tiles over the canvas, for the parts of the app that
+# track or redo work per tile (the autosave journal, the colour histogram)
+
+TILE_SIZE = 256
+
+
+def tile_rects(rect, bounds, tile_size=TILE_SIZE):
+    """Rects of the tiles of `bounds` that `rect` touches."""
+    rect = rect.intersected(bounds)
+    if rect.isEmpty():
+        return []
+    return [QRect(x, y, tile_size, tile_size).intersected(bounds)
+            for y in range(rect.top() // tile_size * tile_size, rect.bottom() + 1, tile_size)
+            for x in range(rect.left() // tile_size * tile_size, rect.right() + 1, tile_size)]
@@ -0,0 +1,99 @@
+import importlib.util
+import os
+import sys
+
+# Plugin tools. A plugin is a Python module that defines Tool subclasses and
+# registers them with register_tool; load_plugins imports every module in a
+# directory. The model forwards press/move/release of a registered tool to
+# it together with the model's DrawingAPI (drawing_api.py), and everything
+# one stroke of the tool draws is one undo step. The built-in tools are
+# still handled by the model itself and their names are reserved.
+
+PLUGIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plugins")
+
+
+class Tool:
+    """Base class of plugin tools.
+
+    Set `name` (unique; the tool's id in recordings and scripts) and
+    optionally `label` and `icon` (an image file path), and override the
+    input methods the tool needs. Coordinates are image pixels; `pressure`
+    is None for a mouse. One instance serves every model, so per-stroke
+    state belongs in `press`.
+    """
+
+    name = None
+    label = None  # tooltip, the capitalized name by default
+    icon = None
+
+    def press(self, api, x, y, pressure):
+        pass
+
+    def move(self, api, x, y, pressure):
+        pass
+
+    def release(self, api, x, y, pressure):
+        pass
+
+    def draw_preview(self, api, painter):
+        # Overlay while the button is held, in image coordinates; nothing
+        # drawn here reaches the canvas
+        pass
+
+
+_registry = {}  # name -> Tool
+
+
+def register_tool(tool):
+    """Register a Tool subclass or instance; works as a class decorator."""
+    from canvas_model import TOOLS
+    instance = tool() if isinstance(tool, type) else tool
+    name = instance.name
+    if not name or not isinstance(name, str):
+        raise ValueError(f"{type(instance).__name__} has no tool name")
+    if name in TOOLS or name in _registry:
+        raise ValueError(f"a tool named {name!r} already exists")
+    _registry[name] = instance
+    return tool
+
+
+def unregister_tool(name):
+    _registry.pop(name, None)
+
+
+def plugin_tool(name):
+    """The registered Tool called `name`, or None."""
+    return _registry.get(name)
+
+
+def tool_names():
+    """Built-in tool names followed by the registered ones."""
+    from canvas_model import TOOLS
+    return TOOLS + list(_registry)
+
+
+def load_plugins(directory):
+    """Import the plugin modules (*.py) in `directory`, in name order.
+
+    Returns (path, exception) for each module that failed to import; the
+    others stay loaded either way.
+    """
+    failures = []
+    if not os.path.isdir(directory):
+        return failures
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".py") or filename.startswith("_"):
+            continue
+        path = os.path.join(directory, filename)
+        name = f"pythonpaint_plugin_{filename[:-3]}"
+        if name in sys.modules:
+            continue
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except Exception as e:
+            del sys.modules[name]
+            failures.append((path, e))
+    return failures
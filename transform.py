@@ -0,0 +1,55 @@
+import numpy as np
+from PyQt5.QtGui import QImage, QTransform
+from PyQt5.QtCore import QObject, QRunnable, Qt, pyqtSignal
+
+
+def flipped(pixels, horizontal=True):
+    # Mirror of a (height, width) array as a view, no pixels copied
+    return pixels[:, ::-1] if horizontal else pixels[::-1]
+
+
+def rotated90(pixels, turns=1):
+    # Quarter turns clockwise as a view; np.rot90 turns counter-clockwise
+    return np.rot90(pixels, -turns)
+
+
+def array_image(pixels, image_format):
+    # Owning QImage from a (height, width) uint32 array or view
+    pixels = np.ascontiguousarray(pixels)
+    height, width = pixels.shape
+    return QImage(pixels.data, width, height, width * 4, image_format).copy()
+
+
+def resample(image, transform):
+    """Final-quality transform of `image` by the linear part of `transform`.
+
+    Sampling is bilinear. While the transform shrinks by more than half, the
+    image is first halved with smooth (area) scaling, like picking a mipmap
+    level, so strong downscales do not alias. The result covers the bounding
+    box of the transformed image and is transparent outside it.
+    """
+    image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    scale = abs(transform.determinant()) ** 0.5
+    while scale < 0.5 and image.width() > 1 and image.height() > 1:
+        image = image.scaled(image.width() // 2, image.height() // 2,
+                             Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        transform = QTransform.fromScale(2, 2) * transform
+        scale *= 2
+    return image.transformed(transform, Qt.SmoothTransformation)
+
+
+class _ResampleSignals(QObject):
+    done = pyqtSignal(QImage)
+
+
+class ResampleJob(QRunnable):
+    # Runs resample on a QThreadPool thread; `done` arrives on the GUI thread
+
+    def __init__(self, image, transform):
+        super().__init__()
+        self.signals = _ResampleSignals()
+        self._image = image
+        self._transform = QTransform(transform)
+
+    def run(self):
+        self.signals.done.emit(resample(self._image, self._transform))
@@ -0,0 +1,204 @@
+import os
+
+# Vector export streams the drawing: items are generated from the stroke list
+# and the retained scene one at a time, formatted into text chunks and written
+# as they come, so memory stays bounded by the longest run of CHUNK_POINTS
+# points rather than by the size of the drawing.
+
+CHUNK_POINTS = 512
+
+# 4/3 * (sqrt(2) - 1), control point distance of a quarter-circle Bezier
+_KAPPA = 0.5522847498
+
+
+def stroke_items(strokes):
+    # Recorded strokes as polylines; burnt-in shapes are stored as their
+    # outline, which is exact for rectangles and lines. Selection moves,
+    # turns and deletes carry the strokes along, cut at the selection edge.
+    for stroke in strokes:
+        yield ("polyline", stroke.points, stroke.color, stroke.size)
+
+
+def scene_items(scene):
+    for _, shape in scene:
+        yield (shape.tool, (shape.start, shape.end), shape.color, shape.size)
+
+
+def model_items(model):
+    # Drawing order: canvas strokes, then the retained shapes above them
+    yield from stroke_items(model.strokes)
+    if model.scene is not None:
+        yield from scene_items(model.scene)
+
+
+def _ellipse(tool, start, end):
+    (x0, y0), (x1, y1) = start, end
+    if tool == "circle":
+        r = int(((x1 - x0)**2 + (y1 - y0)**2) ** 0.5) // 2
+        return (x0 + x1) // 2, (y0 + y1) // 2, r, r
+    return (x0 + x1) / 2, (y0 + y1) / 2, abs(x1 - x0) / 2, abs(y1 - y0) / 2
+
+
+def _num(value):
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+# SVG
+
+def _svg_style(color, size):
+    style = (f'fill="none" stroke="{color.name()}" stroke-width="{_num(size)}" '
+             f'stroke-linecap="round" stroke-linejoin="round"')
+    if color.alpha() < 255:
+        style += f' stroke-opacity="{_num(color.alphaF())}"'
+    return style
+
+
+def svg_chunks(items, width, height, background="#ffffff"):
+    """SVG document text for `items`, as a generator of string chunks."""
+    yield ('<?xml version="1.0" encoding="UTF-8"?>\n'
+           f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+           f'viewBox="0 0 {width} {height}">\n')
+    if background:
+        yield f'<rect width="{width}" height="{height}" fill="{background}"/>\n'
+    for kind, geometry, color, size in items:
+        style = _svg_style(color, size)
+        if kind == "polyline":
+            points = geometry
+            if not points:
+                continue
+            x, y = points[0]
+            # a lone point still needs a segment for the round cap to show
+            yield f'<path {style} d="M{_num(x)} {_num(y)}'
+            rest = points[1:] or points[:1]
+            for i in range(0, len(rest), CHUNK_POINTS):
+                yield "".join(f" L{_num(x)} {_num(y)}" for x, y in rest[i:i + CHUNK_POINTS])
+            yield '"/>\n'
+            continue
+        start, end = geometry
+        if kind == "line":
+            yield (f'<line {style} x1="{_num(start[0])}" y1="{_num(start[1])}" '
+                   f'x2="{_num(end[0])}" y2="{_num(end[1])}"/>\n')
+        elif kind == "rectangle":
+            x, y = min(start[0], end[0]), min(start[1], end[1])
+            yield (f'<rect {style} x="{_num(x)}" y="{_num(y)}" '
+                   f'width="{_num(abs(end[0] - start[0]))}" height="{_num(abs(end[1] - start[1]))}"/>\n')
+        elif kind in ("ellipse", "circle"):
+            cx, cy, rx, ry = _ellipse(kind, start, end)
+            yield (f'<ellipse {style} cx="{_num(cx)}" cy="{_num(cy)}" '
+                   f'rx="{_num(rx)}" ry="{_num(ry)}"/>\n')
+    yield "</svg>\n"
+
+
+# PDF
+
+def _pdf_color(color):
+    return f"{_num(color.redF())} {_num(color.greenF())} {_num(color.blueF())} RG"
+
+
+def _pdf_content(items, width, height, background):
+    # Page content stream; the y axis is flipped so canvas coordinates work
+    yield f"1 0 0 -1 0 {height} cm 1 J 1 j\n"
+    if background:
+        r, g, b = (int(background[i:i + 2], 16) / 255 for i in (1, 3, 5))
+        yield f"{_num(r)} {_num(g)} {_num(b)} rg 0 0 {width} {height} re f\n"
+    for kind, geometry, color, size in items:
+        # translucent strokes are written opaque; alpha needs an ExtGState
+        yield f"{_pdf_color(color)} {_num(size)} w\n"
+        if kind == "polyline":
+            points = geometry
+            if not points:
+                continue
+            x, y = points[0]
+            yield f"{_num(x)} {_num(y)} m\n"
+            rest = points[1:] or points[:1]
+            for i in range(0, len(rest), CHUNK_POINTS):
+                yield "".join(f"{_num(x)} {_num(y)} l\n" for x, y in rest[i:i + CHUNK_POINTS])
+            yield "S\n"
+            continue
+        start, end = geometry
+        if kind == "line":
+            yield f"{_num(start[0])} {_num(start[1])} m {_num(end[0])} {_num(end[1])} l S\n"
+        elif kind == "rectangle":
+            x, y = min(start[0], end[0]), min(start[1], end[1])
+            yield (f"{_num(x)} {_num(y)} {_num(abs(end[0] - start[0]))} "
+                   f"{_num(abs(end[1] - start[1]))} re S\n")
+        elif kind in ("ellipse", "circle"):
+            cx, cy, rx, ry = _ellipse(kind, start, end)
+            kx, ky = rx * _KAPPA, ry * _KAPPA
+            yield (f"{_num(cx + rx)} {_num(cy)} m "
+                   f"{_num(cx + rx)} {_num(cy + ky)} {_num(cx + kx)} {_num(cy + ry)} {_num(cx)} {_num(cy + ry)} c "
+                   f"{_num(cx - kx)} {_num(cy + ry)} {_num(cx - rx)} {_num(cy + ky)} {_num(cx - rx)} {_num(cy)} c "
+                   f"{_num(cx - rx)} {_num(cy - ky)} {_num(cx - kx)} {_num(cy - ry)} {_num(cx)} {_num(cy - ry)} c "
+                   f"{_num(cx + kx)} {_num(cy - ry)} {_num(cx + rx)} {_num(cy - ky)} {_num(cx + rx)} {_num(cy)} c "
+                   f"S\n")
+
+
+def write_pdf(out, items, width, height, background="#ffffff"):
+    """Write a one-page PDF of `items` to the binary file `out`.
+
+    The content stream is written while it is generated. Its length is an
+    indirect object that follows the stream, so nothing has to be measured
+    in advance; only the byte offsets of the objects are kept for the xref.
+    """
+    offsets = []
+    written = 0
+
+    def emit(data):
+        nonlocal written
+        out.write(data)
+        written += len(data)
+
+    def begin_object():
+        offsets.append(written)
+        emit(f"{len(offsets)} 0 obj\n".encode("ascii"))
+
+    emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    begin_object()
+    emit(b"<< /Type /Catalog /Pages 2 0 R >>\nendobj\n")
+    begin_object()
+    emit(b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>\nendobj\n")
+    begin_object()
+    emit(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] "
+         f"/Contents 4 0 R /Resources << >> >>\nendobj\n".encode("ascii"))
+    begin_object()
+    emit(b"<< /Length 5 0 R >>\nstream\n")
+    start = written
+    for chunk in _pdf_content(items, width, height, background):
+        emit(chunk.encode("ascii"))
+    length = written - start
+    emit(b"\nendstream\nendobj\n")
+    begin_object()
+    emit(f"{length}\nendobj\n".encode("ascii"))
+
+    xref = written
+    emit(f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode("ascii"))
+    for offset in offsets:
+        emit(f"{offset:010d} 00000 n \n".encode("ascii"))
+    emit(f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\n"
+         f"startxref\n{xref}\n%%EOF\n".encode("ascii"))
+
+
+def write_svg(out, items, width, height, background="#ffffff"):
+    for chunk in svg_chunks(items, width, height, background):
+        out.write(chunk)
+
+
+VECTOR_FORMATS = {".svg", ".pdf"}
+
+
+def export_vector(model, path, background="#ffffff"):
+    """Export the model's strokes and shapes to an .svg or .pdf file.
+
+    Fills and imported images only exist as pixels and are not included.
+    """
+    width, height = model.image.width(), model.image.height()
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".svg":
+        with open(path, "w", encoding="utf-8") as out:
+            write_svg(out, model_items(model), width, height, background)
+    elif ext == ".pdf":
+        with open(path, "wb") as out:
+            write_pdf(out, model_items(model), width, height, background)
+    else:
+        raise ValueError(f"unsupported vector format {ext!r}, expected one of {sorted(VECTOR_FORMATS)}")
+    return True